@@ -1,20 +1,29 @@
 import json
 import boto3
+import gzip
 import os
+import zlib
 from datetime import datetime
 import base64
+import binascii
 from typing import Dict, Any, List, Optional
 from decimal import Decimal
 
-import undercity_db
-import queue_db
-import push_db
+from botocore.exceptions import ClientError
+
+import ddb_json
+import request_log as log
+
+# The Undercity, queue and push modules are imported inside the routes that use
+# them: a cold start for /comments or /ratings never compiles the game engine.
 
 # Initialize DynamoDB client
 dynamodb = boto3.resource('dynamodb')
 table_name = os.environ.get('TABLE_NAME')
-user_index_name = os.environ.get('USER_INDEX_NAME')
+user_index_name = os.environ.get('USER_INDEX_NAME', 'user-index')
+type_index_name = os.environ.get('TYPE_INDEX_NAME', 'type-index')
 table = dynamodb.Table(table_name) if table_name else None
+log.track(dynamodb.meta.client)
 
 # CORS headers for all responses
 CORS_HEADERS = {
@@ -30,11 +39,18 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     🎯 MAIN HANDLER - Routes all requests
     """
-    print(f'Event received: {json.dumps(event, default=str, indent=2)}')
+    log.begin(event)
+    log.debug('event', event=lambda: log.loggable_event(event))
+    response = compress_response(route_request(event), event.get('headers') or {})
+    log.finish(response['statusCode'])
+    return response
 
+def route_request(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Dispatch one event to its handler and return the response."""
     # Scheduled EventBridge heartbeat (no requestContext/rawPath) — route to the
     # background task before any HTTP parsing.
     if event.get('task') == 'roll-refill-sweep':
+        import undercity_db
         undercity_db.sweep_roll_refills(table)
         return create_response(200, {'ok': True})
 
@@ -50,8 +66,6 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         
         query_params = event.get('queryStringParameters') or {}
         
-        print(f'Parsed values: method={http_method}, path={raw_path}, body_length={len(body) if body else 0}')
-        
         # Parse path parts
         path_parts = [p for p in raw_path.split('/') if p]
         
@@ -72,20 +86,25 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         elif endpoint == 'likes':
             return handle_likes(http_method, path_parts, body, query_params)
         elif endpoint == 'all-comments':
-            return handle_all_comments(http_method)
+            return handle_all_comments(http_method, query_params)
         elif endpoint == 'all-ratings':
-            return handle_all_ratings(http_method)
+            return handle_all_ratings(http_method, query_params)
         elif endpoint == 'all-likes':
             return handle_all_likes(http_method, query_params)
+        elif endpoint == 'all-aggregates':
+            return handle_all_aggregates(http_method, query_params)
+        elif endpoint == 'catalog-summary':
+            return handle_catalog_summary(http_method, query_params)
         elif endpoint == 'game':
-            return handle_game(http_method, path_parts, body, query_params)
+            return handle_game(http_method, path_parts, body, query_params,
+                               event.get('headers') or {})
         elif endpoint == 'queue':
             return handle_queue(http_method, path_parts, body, query_params)
         else:
             return create_response(404, {'error': 'Endpoint not found'})
             
     except Exception as error:
-        print(f'Error: {str(error)}')
+        log.error('unhandled', error=repr(error))
         return create_response(500, {
             'error': 'Internal server error',
             'message': str(error)
@@ -98,7 +117,7 @@ def create_response(status_code: int, body: Any, headers: Optional[Dict[str, str
         response_headers.update(headers)
     
     if isinstance(body, (dict, list)):
-        body = json.dumps(body, default=decimal_default)
+        body = ddb_json.dumps(body)
     
     return {
         'statusCode': status_code,
@@ -106,11 +125,67 @@ def create_response(status_code: int, body: Any, headers: Optional[Dict[str, str
         'body': body
     }
 
-def decimal_default(obj):
-    """JSON serializer for objects not serializable by default json code"""
-    if isinstance(obj, Decimal):
-        return float(obj)
-    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+# Bodies under this many bytes go out as plain JSON: below it the gzip framing
+# and base64 overhead eat the saving. The state and map payloads (tens of KB)
+# are what this is for; see scripts/bench_compression.py.
+COMPRESS_MIN_BYTES = 1024
+# Level 5: on the state and map payloads it costs a third to a fifth of level
+# 9's CPU for 2-6% more bytes (under 1ms for a 15-player state).
+COMPRESS_LEVEL = 5
+
+def header_value(headers: Optional[Dict[str, str]], name: str) -> str:
+    """A request header by case-insensitive name ('' when absent). Function
+    URLs lower-case header names; API Gateway REST events keep the client's."""
+    return next((v for k, v in (headers or {}).items() if k.lower() == name), '')
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Does an If-None-Match header cover `etag`? Weak validators (W/) match too."""
+    tags = [t.strip() for t in if_none_match.split(',')]
+    return '*' in tags or any(t.removeprefix('W/') == etag for t in tags)
+
+def accepted_encoding(headers: Dict[str, str]) -> Optional[str]:
+    """'gzip' or 'deflate' if the client's Accept-Encoding allows it (gzip
+    preferred), else None. A q=0 entry refuses that coding."""
+    accept = header_value(headers, 'accept-encoding')
+    allowed = set()
+    for part in accept.split(','):
+        coding, _, params = part.strip().partition(';')
+        q = params.strip()
+        if q.startswith('q='):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        allowed.add(coding.strip().lower())
+    for coding in ('gzip', 'deflate'):
+        if coding in allowed or '*' in allowed:
+            return coding
+    return None
+
+def compress_response(response: Dict[str, Any], request_headers: Dict[str, str]) -> Dict[str, Any]:
+    """Gzip/deflate a large JSON body for a client that accepts it. Lambda
+    responses are text, so the compressed bytes go out base64 with
+    isBase64Encoded set; the Function URL decodes them on the way out."""
+    body = response.get('body')
+    if not isinstance(body, str) or response.get('isBase64Encoded'):
+        return response
+    raw = body.encode('utf-8')
+    if len(raw) < COMPRESS_MIN_BYTES:
+        return response
+    coding = accepted_encoding(request_headers)
+    if coding is None:
+        return response
+    if coding == 'gzip':
+        packed = gzip.compress(raw, compresslevel=COMPRESS_LEVEL, mtime=0)
+    else:
+        packed = zlib.compress(raw, COMPRESS_LEVEL)
+    return {
+        **response,
+        'headers': {**response['headers'], 'Content-Encoding': coding, 'Vary': 'Accept-Encoding'},
+        'body': base64.b64encode(packed).decode('ascii'),
+        'isBase64Encoded': True,
+    }
 
 # 💬 COMMENTS HANDLER
 def handle_comments(method: str, path_parts: List[str], body: str, query_params: Dict[str, Any]) -> Dict[str, Any]:
@@ -160,7 +235,7 @@ def handle_ratings(method: str, path_parts: List[str], body: str, query_params:
     game_id = path_parts[1]
     
     if method == 'GET':
-        return get_ratings(game_id)
+        return get_ratings(game_id, wants_details(query_params))
     elif method == 'POST':
         if not body:
             return create_response(400, {'error': 'Request body is required'})
@@ -182,7 +257,7 @@ def handle_likes(method: str, path_parts: List[str], body: str, query_params: Di
     
     if method == 'GET':
         user_id = query_params.get('userId')
-        return get_likes(game_id, user_id)
+        return get_likes(game_id, user_id, wants_details(query_params))
     elif method == 'POST':
         if not body:
             return create_response(400, {'error': 'Request body is required'})
@@ -195,35 +270,68 @@ def handle_likes(method: str, path_parts: List[str], body: str, query_params: Di
         return create_response(405, {'error': 'Method not allowed'})
 
 # 📊 BULK DATA HANDLERS
-def handle_all_comments(method: str) -> Dict[str, Any]:
+def handle_all_comments(method: str, query_params: Dict[str, Any]) -> Dict[str, Any]:
     """Handle bulk comments endpoint"""
     if method != 'GET':
         return create_response(405, {'error': 'Method not allowed'})
-    return get_all_comments()
+    return get_all_comments(**page_params(query_params))
 
-def handle_all_ratings(method: str) -> Dict[str, Any]:
+def handle_all_ratings(method: str, query_params: Dict[str, Any]) -> Dict[str, Any]:
     """Handle bulk ratings endpoint"""
     if method != 'GET':
         return create_response(405, {'error': 'Method not allowed'})
-    return get_all_ratings()
+    return get_all_ratings(**page_params(query_params))
 
 def handle_all_likes(method: str, query_params: Dict[str, Any]) -> Dict[str, Any]:
     """Handle bulk likes endpoint"""
     if method != 'GET':
         return create_response(405, {'error': 'Method not allowed'})
     user_id = query_params.get('userId')
-    return get_all_likes(user_id)
+    return get_all_likes(user_id, **page_params(query_params))
+
+def handle_all_aggregates(method: str, query_params: Dict[str, Any]) -> Dict[str, Any]:
+    """Handle bulk per-game aggregates endpoint"""
+    if method != 'GET':
+        return create_response(405, {'error': 'Method not allowed'})
+    return get_all_aggregates(**page_params(query_params))
+
+def handle_catalog_summary(method: str, query_params: Dict[str, Any]) -> Dict[str, Any]:
+    """Handle the one-call games page summary endpoint"""
+    if method != 'GET':
+        return create_response(405, {'error': 'Method not allowed'})
+    return get_catalog_summary(query_params.get('userId'))
+
+def wants_details(query_params: Dict[str, Any]) -> bool:
+    """?details=true: list every rating/like row, not just the totals"""
+    return str(query_params.get('details', '')).lower() in ('1', 'true')
+
+def page_params(query_params: Dict[str, Any]) -> Dict[str, Any]:
+    """Optional ?limit=&cursor= paging for the bulk endpoints (default: everything)"""
+    try:
+        limit = int(query_params.get('limit') or 0) or None
+    except ValueError:
+        limit = None
+    return {'limit': limit, 'cursor': query_params.get('cursor') or None}
 
 # 🍄 THE UNDERCITY SUB-GAME
-def handle_game(method: str, path_parts: List[str], body: str, query_params: Dict[str, Any]) -> Dict[str, Any]:
+def handle_game(method: str, path_parts: List[str], body: str, query_params: Dict[str, Any],
+                headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
     """Route /game/state and /game/action to the Undercity module."""
+    import undercity_db
     sub = path_parts[1] if len(path_parts) > 1 else ''
     if sub == 'state' and method == 'GET':
         status, payload = undercity_db.handle_state(table, query_params)
         return create_response(status, payload)
     if sub == 'map' and method == 'GET':
-        status, payload = undercity_db.handle_map(table, query_params)
-        return create_response(status, payload)
+        if query_params.get('sample') or query_params.get('samples'):
+            status, payload = undercity_db.handle_map(table, query_params)
+            return create_response(status, payload)
+        # The night's board never changes mid-night: serve the cached body and
+        # let a client holding its ETag revalidate for free.
+        etag, map_body = undercity_db.map_body(table)
+        if etag_matches(header_value(headers, 'if-none-match'), etag):
+            return create_response(304, '', {'ETag': etag})
+        return create_response(200, map_body, {'ETag': etag})
     if sub == 'action' and method == 'POST':
         status, payload = undercity_db.handle_action(table, body)
         return create_response(status, payload)
@@ -232,6 +340,8 @@ def handle_game(method: str, path_parts: List[str], body: str, query_params: Dic
 # 🎲 THE GAME NIGHT QUEUE
 def handle_queue(method: str, path_parts: List[str], body: str, query_params: Dict[str, Any]) -> Dict[str, Any]:
     """Route /queue/state, /queue/action, and /queue/push/* to the queue module."""
+    import push_db
+    import queue_db
     sub = path_parts[1] if len(path_parts) > 1 else ''
     if sub == 'state' and method == 'GET':
         status, payload = queue_db.handle_state(table, query_params)
@@ -277,7 +387,7 @@ def get_comments(game_id: str) -> Dict[str, Any]:
         return create_response(200, {'comments': comments})
         
     except Exception as e:
-        print(f'Error getting comments: {str(e)}')
+        log.error('Error getting comments', error=str(e))
         return create_response(500, {'error': 'Failed to get comments', 'message': str(e)})
 
 def add_comment(game_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -311,6 +421,7 @@ def add_comment(game_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
                 'type': 'comment'
             }
         )
+        refresh_catalog_comments(game_id)
         
         return create_response(201, {
             'message': 'Comment added successfully',
@@ -318,7 +429,7 @@ def add_comment(game_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         })
         
     except Exception as e:
-        print(f'Error adding comment: {str(e)}')
+        log.error('Error adding comment', error=str(e))
         return create_response(500, {'error': 'Failed to add comment', 'message': str(e)})
 
 def update_comment(game_id: str, comment_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -339,11 +450,12 @@ def update_comment(game_id: str, comment_id: str, data: Dict[str, Any]) -> Dict[
                 ':rating': data.get('rating')
             }
         )
+        refresh_catalog_comments(game_id)
         
         return create_response(200, {'message': 'Comment updated successfully'})
         
     except Exception as e:
-        print(f'Error updating comment: {str(e)}')
+        log.error('Error updating comment', error=str(e))
         return create_response(500, {'error': 'Failed to update comment', 'message': str(e)})
 
 def delete_comment(game_id: str, comment_id: str) -> Dict[str, Any]:
@@ -355,45 +467,37 @@ def delete_comment(game_id: str, comment_id: str) -> Dict[str, Any]:
                 'sk': f'COMMENT#{comment_id}'
             }
         )
+        refresh_catalog_comments(game_id)
         
         return create_response(200, {'message': 'Comment deleted successfully'})
         
     except Exception as e:
-        print(f'Error deleting comment: {str(e)}')
+        log.error('Error deleting comment', error=str(e))
         return create_response(500, {'error': 'Failed to delete comment', 'message': str(e)})
 
 # ⭐ RATING OPERATIONS
-def get_ratings(game_id: str) -> Dict[str, Any]:
-    """Get all ratings for a game"""
+def get_ratings(game_id: str, details: bool = False) -> Dict[str, Any]:
+    """A game's rating average and count off its aggregate, plus every rating
+    when `details` is asked for"""
     try:
-        response = table.query(
-            KeyConditionExpression='pk = :pk AND begins_with(sk, :sk)',
-            ExpressionAttributeValues={
-                ':pk': f'GAME#{game_id}',
-                ':sk': 'RATING#'
-            }
-        )
-        
-        ratings = [float(item['rating']) for item in response['Items']]
-        average_rating = sum(ratings) / len(ratings) if ratings else None
-        
-        rating_details = []
-        for item in response['Items']:
-            rating_details.append({
+        agg = table.get_item(Key=aggregate_key(game_id)).get('Item')
+        rows = query_partition(f'GAME#{game_id}', 'RATING#') if details or not agg else None
+        summary = public_aggregate(agg or aggregate_from_rows(game_id, rows, []))
+        body = {
+            'averageRating': summary['averageRating'],
+            'totalRatings': summary['totalRatings'],
+        }
+        if details:
+            body['ratings'] = [{
                 'userId': item['userId'],
                 'username': item['username'],
                 'rating': float(item['rating']),
                 'timestamp': item['timestamp']
-            })
-        
-        return create_response(200, {
-            'averageRating': round(average_rating, 1) if average_rating else None,
-            'totalRatings': len(ratings),
-            'ratings': rating_details
-        })
+            } for item in rows]
+        return create_response(200, body)
         
     except Exception as e:
-        print(f'Error getting ratings: {str(e)}')
+        log.error('Error getting ratings', error=str(e))
         return create_response(500, {'error': 'Failed to get ratings', 'message': str(e)})
 
 def add_rating(game_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -413,57 +517,62 @@ def add_rating(game_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
     
     try:
         timestamp = datetime.now().isoformat()
+        rating = Decimal(str(data['rating']))
+        ensure_aggregate(game_id)
         
-        table.put_item(
+        response = table.put_item(
             Item={
                 'pk': f'GAME#{game_id}',
                 'sk': f'RATING#{data["userId"]}',
                 'userId': data['userId'],
                 'username': data['username'],
-                'rating': Decimal(str(data['rating'])),
+                'rating': rating,
                 'timestamp': timestamp,
                 'type': 'rating'
-            }
+            },
+            ReturnValues='ALL_OLD'
         )
+        # A re-rate by the same user replaces their rating in the aggregate.
+        old = response.get('Attributes', {}).get('rating')
+        bump_aggregate(game_id, rating=rating, old_rating=old)
         
         return create_response(201, {'message': 'Rating added successfully'})
         
     except Exception as e:
-        print(f'Error adding rating: {str(e)}')
+        log.error('Error adding rating', error=str(e))
         return create_response(500, {'error': 'Failed to add rating', 'message': str(e)})
 
 # ❤️ LIKE OPERATIONS
-def get_likes(game_id: str, current_user_id: Optional[str] = None) -> Dict[str, Any]:
-    """Get all likes for a game"""
+def get_likes(game_id: str, current_user_id: Optional[str] = None,
+              details: bool = False) -> Dict[str, Any]:
+    """A game's like count off its aggregate and the caller's like flag off
+    their own LIKE# row, plus every like when `details` is asked for"""
     try:
-        response = table.query(
-            KeyConditionExpression='pk = :pk AND begins_with(sk, :sk)',
-            ExpressionAttributeValues={
-                ':pk': f'GAME#{game_id}',
-                ':sk': 'LIKE#'
-            }
-        )
-        
-        likes = []
-        for item in response['Items']:
-            likes.append({
-                'userId': item['userId'],
-                'username': item['username'],
-                'timestamp': item['timestamp']
-            })
+        agg = table.get_item(Key=aggregate_key(game_id)).get('Item')
+        rows = query_partition(f'GAME#{game_id}', 'LIKE#') if details or not agg else None
+        total = int(agg.get('likeCount', 0)) if agg else len(rows)
         
         is_liked_by_current_user = False
-        if current_user_id:
-            is_liked_by_current_user = any(like['userId'] == current_user_id for like in likes)
+        if current_user_id and rows is not None:
+            is_liked_by_current_user = any(row['userId'] == current_user_id for row in rows)
+        elif current_user_id:
+            is_liked_by_current_user = 'Item' in table.get_item(
+                Key={'pk': f'GAME#{game_id}', 'sk': f'LIKE#{current_user_id}'})
         
-        return create_response(200, {
-            'totalLikes': len(likes),
+        body = {
+            'totalLikes': total,
             'isLikedByCurrentUser': is_liked_by_current_user,
-            'likes': likes
-        })
+        }
+        if details:
+            body['likes'] = [{
+                'userId': item['userId'],
+                'username': item['username'],
+                'timestamp': item['timestamp']
+            } for item in rows]
+        return create_response(200, body)
         
     except Exception as e:
-        print(f'Error getting likes: {str(e)}')
+        log.error('Error getting likes', error=str(e))
         return create_response(500, {'error': 'Failed to get likes', 'message': str(e)})
 
 def toggle_like(game_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -480,16 +589,13 @@ def toggle_like(game_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
             'sk': f'LIKE#{data["userId"]}'
         }
         
-        # Check if like already exists
-        try:
-            response = table.get_item(Key=like_key)
-            like_exists = 'Item' in response
-        except Exception:
-            like_exists = False
-        
-        if like_exists:
-            # Remove like (unlike)
-            table.delete_item(Key=like_key)
+        ensure_aggregate(game_id)
+        
+        # Remove like (unlike) if there was one — the delete itself tells us, so
+        # a double-tap can never count twice.
+        removed = table.delete_item(Key=like_key, ReturnValues='ALL_OLD').get('Attributes')
+        if removed:
+            bump_aggregate(game_id, likes=-1)
             return create_response(200, {
                 'message': 'Like removed successfully',
                 'isLiked': False
@@ -497,36 +603,357 @@ def toggle_like(game_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         else:
             # Add like
             timestamp = datetime.now().isoformat()
-            table.put_item(
-                Item={
-                    **like_key,
-                    'userId': data['userId'],
-                    'username': data['username'],
-                    'timestamp': timestamp,
-                    'type': 'like'
-                }
-            )
+            try:
+                table.put_item(
+                    Item={
+                        **like_key,
+                        'userId': data['userId'],
+                        'username': data['username'],
+                        'timestamp': timestamp,
+                        'type': 'like'
+                    },
+                    ConditionExpression='attribute_not_exists(pk)'
+                )
+                bump_aggregate(game_id, likes=1)
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
             return create_response(200, {
                 'message': 'Like added successfully',
                 'isLiked': True
             })
             
     except Exception as e:
-        print(f'Error toggling like: {str(e)}')
+        log.error('Error toggling like', error=str(e))
         return create_response(500, {'error': 'Failed to toggle like', 'message': str(e)})
 
+# 📈 PER-GAME AGGREGATES
+# GAME#{id}/AGG holds the running rating sum/count, a 1-10 histogram (h1..h10,
+# by whole star) and the like count, bumped with ADD on every rating/like write
+# so nothing ever recounts the rows: /ratings/{id} and /likes/{id} read their
+# totals off it. It carries type='aggregate' + timestamp, so the type index
+# serves /all-aggregates too.
+def aggregate_key(game_id: str) -> Dict[str, str]:
+    return {'pk': f'GAME#{game_id}', 'sk': 'AGG'}
+
+def rating_bucket(rating: Any) -> str:
+    return f'h{min(10, max(1, int(rating)))}'
+
+def aggregate_from_rows(game_id: str, ratings: List[Dict[str, Any]],
+                        likes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """An aggregate counted from a game's RATING#/LIKE# rows."""
+    item = {**aggregate_key(game_id), 'gameId': game_id, 'type': 'aggregate',
+            'timestamp': datetime.now().isoformat(),
+            'ratingSum': Decimal(0), 'ratingCount': 0, 'likeCount': len(likes)}
+    for row in ratings:
+        item['ratingSum'] += row['rating']
+        item['ratingCount'] += 1
+        bucket = rating_bucket(row['rating'])
+        item[bucket] = item.get(bucket, 0) + 1
+    return item
+
+# gameId -> the table whose AGG row for it this container knows exists (AGG
+# rows are never deleted), so only a game's first write here tries to seed one.
+_aggregated: Dict[str, Any] = {}
+
+def ensure_aggregate(game_id: str) -> None:
+    """Seed a game's aggregate from its rows the first time it is written to
+    (a game rated or liked before aggregates existed). One conditional put: a
+    concurrent first write that seeded it already wins, and this one's rows
+    are counted once, by the ADD that follows. Runs before the write lands."""
+    if _aggregated.get(game_id) is table:
+        return
+    pk = aggregate_key(game_id)['pk']
+    item = aggregate_from_rows(game_id, query_partition(pk, 'RATING#'),
+                               query_partition(pk, 'LIKE#'))
+    try:
+        table.put_item(Item=item, ConditionExpression='attribute_not_exists(pk)')
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+    _aggregated[game_id] = table
+
+def bump_aggregate(game_id: str, rating: Optional[Decimal] = None,
+                   old_rating: Optional[Decimal] = None, likes: int = 0) -> None:
+    """One atomic ADD onto the aggregate: a new rating (replacing `old_rating`
+    on a re-rate) and/or a like delta."""
+    adds, names, values = [], {'#type': 'type', '#ts': 'timestamp'}, {
+        ':type': 'aggregate', ':now': datetime.now().isoformat(), ':g': game_id}
+    if rating is not None:
+        values[':sum'] = rating - (old_rating or 0)
+        adds.append('ratingSum :sum')
+        if old_rating is None:
+            values[':one'] = 1
+            adds.append('ratingCount :one')
+        new_bucket = rating_bucket(rating)
+        old_bucket = rating_bucket(old_rating) if old_rating is not None else None
+        if new_bucket != old_bucket:
+            names['#hn'] = new_bucket
+            values[':up'] = 1
+            adds.append('#hn :up')
+            if old_bucket:
+                names['#ho'] = old_bucket
+                values[':down'] = -1
+                adds.append('#ho :down')
+    if likes:
+        values[':likes'] = likes
+        adds.append('likeCount :likes')
+    item = table.update_item(
+        Key=aggregate_key(game_id),
+        UpdateExpression='SET #type = :type, #ts = :now, gameId = :g ADD ' + ', '.join(adds),
+        ExpressionAttributeNames=names,
+        ExpressionAttributeValues=values,
+        ReturnValues='ALL_NEW'
+    )['Attributes']
+    set_catalog_entry(game_id, agg=aggregate_counts(item))
+
+def aggregate_counts(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Just the counters of an aggregate (what the catalog summary stores)."""
+    return {k: v for k, v in item.items()
+            if k in ('ratingSum', 'ratingCount', 'likeCount') or k in HISTOGRAM_BUCKETS}
+
+HISTOGRAM_BUCKETS = {f'h{n}' for n in range(1, 11)}
+
+def public_aggregate(item: Dict[str, Any]) -> Dict[str, Any]:
+    count = int(item.get('ratingCount', 0))
+    average = float(item.get('ratingSum', 0)) / count if count else None
+    return {
+        'gameId': item['gameId'],
+        'averageRating': round(average, 1) if average else None,
+        'totalRatings': count,
+        'ratingHistogram': {str(n): int(item.get(f'h{n}', 0)) for n in range(1, 11)},
+        'totalLikes': int(item.get('likeCount', 0)),
+    }
+
+def get_all_aggregates(limit: Optional[int] = None, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """Rating and like aggregates for every game, one index query"""
+    try:
+        items, next_cursor = query_by_type('aggregate', limit, cursor)
+        aggregates = [public_aggregate(item) for item in items]
+        return create_response(200, {
+            'aggregates': aggregates,
+            'totalGames': len(aggregates),
+            'nextCursor': next_cursor,
+            'lastUpdated': datetime.now().isoformat()
+        })
+        
+    except InvalidCursor as e:
+        return create_response(400, {'error': str(e)})
+    except Exception as e:
+        log.error('Error getting all aggregates', error=str(e))
+        return create_response(500, {'error': 'Failed to fetch aggregates', 'message': str(e)})
+
+# 🗂️ CATALOG SUMMARY
+# Everything the games page shows per game — the rating aggregate, the like
+# count, the comment count and the newest CATALOG_COMMENTS comments —
+# precomputed into one small CATALOG/GAME#{gameId} row per game, so the landing
+# page is one query of the CATALOG partition plus the caller's own likes off the
+# user index. Each rating/like/comment write refreshes just its game's row, so
+# no item grows with the catalog and a write pays only for that game's row.
+# The refresh is best-effort: the rating, like or comment is already saved, and
+# the next write to that game recomputes the row from scratch. The rows are
+# built from the type index the first time the summary is read (CATALOG/BUILT
+# marks it done); until then the per-game writes just accumulate, and the build
+# never overwrites a row they wrote.
+CATALOG_PK = 'CATALOG'
+CATALOG_BUILT = {'pk': CATALOG_PK, 'sk': 'BUILT'}
+CATALOG_COMMENTS = 3
+
+def catalog_key(game_id: str) -> Dict[str, str]:
+    return {'pk': CATALOG_PK, 'sk': f'GAME#{game_id}'}
+
+def public_comment(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'commentId': item['sk'].replace('COMMENT#', ''),
+        'gameId': item['pk'].replace('GAME#', ''),
+        'userId': item['userId'],
+        'username': item['username'],
+        'comment': item['comment'],
+        'rating': item.get('rating'),
+        'timestamp': item['timestamp']
+    }
+
+def newest_comments(items) -> List[Dict[str, Any]]:
+    return sorted((public_comment(i) for i in items),
+                  key=lambda c: c['timestamp'], reverse=True)[:CATALOG_COMMENTS]
+
+def set_catalog_entry(game_id: str, **fields: Any) -> None:
+    """Overwrite some of one game's summary fields; a failure is only logged."""
+    names = {f'#f{i}': name for i, name in enumerate(fields)}
+    values = {f':f{i}': value for i, value in enumerate(fields.values())}
+    try:
+        table.update_item(
+            Key=catalog_key(game_id),
+            UpdateExpression='SET gameId = :g, ' + ', '.join(
+                f'#f{i} = :f{i}' for i in range(len(fields))),
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues={':g': game_id, **values}
+        )
+    except Exception as e:
+        log.error('Error refreshing catalog summary', gameId=game_id, error=str(e))
+
+def refresh_catalog_comments(game_id: str) -> None:
+    """Recompute one game's comment count and newest comments (its own
+    partition, never the table)."""
+    try:
+        rows = query_partition(f'GAME#{game_id}', 'COMMENT#')
+    except Exception as e:
+        log.error('Error refreshing catalog summary', gameId=game_id, error=str(e))
+        return
+    set_catalog_entry(game_id, comments=newest_comments(rows), commentCount=len(rows))
+
+def build_catalog_summary() -> None:
+    """Every game's row from the type index — once, for a catalog that predates
+    the summary. Only fields no live write has set yet are filled in."""
+    aggs = {row['gameId']: row for row in query_by_type('aggregate')[0]}
+    rolled_up = set(aggs)   # games whose rows their AGG item already counts
+    for kind in ('rating', 'like'):
+        for row in query_by_type(kind)[0]:
+            game_id = row['pk'].replace('GAME#', '')
+            if game_id in rolled_up:
+                continue
+            agg = aggs.setdefault(game_id, {'ratingSum': Decimal(0), 'ratingCount': 0,
+                                            'likeCount': 0})
+            if kind == 'like':
+                agg['likeCount'] += 1
+            else:
+                agg['ratingSum'] += row['rating']
+                agg['ratingCount'] += 1
+                bucket = rating_bucket(row['rating'])
+                agg[bucket] = agg.get(bucket, 0) + 1
+    by_game: Dict[str, List[Dict[str, Any]]] = {}
+    for row in query_by_type('comment')[0]:
+        by_game.setdefault(row['pk'].replace('GAME#', ''), []).append(row)
+    for game_id in set(aggs) | set(by_game):
+        fields = {}
+        if game_id in aggs:
+            fields['agg'] = aggregate_counts(aggs[game_id])
+        if game_id in by_game:
+            fields['comments'] = newest_comments(by_game[game_id])
+            fields['commentCount'] = len(by_game[game_id])
+        names = {f'#f{i}': name for i, name in enumerate(fields)}
+        values = {f':f{i}': value for i, value in enumerate(fields.values())}
+        table.update_item(
+            Key=catalog_key(game_id),
+            UpdateExpression='SET gameId = :g, ' + ', '.join(
+                f'#f{i} = if_not_exists(#f{i}, :f{i})' for i in range(len(fields))),
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues={':g': game_id, **values}
+        )
+    table.put_item(Item=dict(CATALOG_BUILT))
+
+def get_catalog_summary(current_user_id: Optional[str] = None) -> Dict[str, Any]:
+    """Per-game rating aggregate, like count, the caller's like flag, the
+    comment count and the newest comments for the whole catalog"""
+    try:
+        rows = query_partition(CATALOG_PK)
+        if not any(row['sk'] == CATALOG_BUILT['sk'] for row in rows):
+            build_catalog_summary()
+            rows = query_partition(CATALOG_PK)
+        # The caller's own rows (a handful) off the user index, for the like flags.
+        liked = set()
+        if current_user_id:
+            for row in query_index(user_index_name, 'userId', current_user_id)[0]:
+                if row.get('type') == 'like':
+                    liked.add(row['pk'].replace('GAME#', ''))
+        summary = []
+        for row in sorted((r for r in rows if 'gameId' in r), key=lambda r: r['gameId']):
+            game_id = row['gameId']
+            summary.append({
+                **public_aggregate({'gameId': game_id, **row.get('agg', {})}),
+                'isLikedByCurrentUser': game_id in liked,
+                'totalComments': int(row.get('commentCount', 0)),
+                'comments': row.get('comments', []),
+            })
+        return create_response(200, {
+            'games': summary,
+            'totalGames': len(summary),
+            'lastUpdated': datetime.now().isoformat()
+        })
+        
+    except Exception as e:
+        log.error('Error getting catalog summary', error=str(e))
+        return create_response(500, {'error': 'Failed to fetch catalog summary', 'message': str(e)})
+
 # 📊 BULK DATA OPERATIONS
-def get_all_comments() -> Dict[str, Any]:
+def query_by_type(item_type: str, limit: Optional[int] = None,
+                  cursor: Optional[str] = None):
+    """Newest-first rows of one `type` ('comment', 'rating', 'like',
+    'aggregate') off the type index (type / timestamp). Only those rows are
+    read — never the Undercity partitions sharing the table."""
+    return query_index(type_index_name, 'type', item_type, limit, cursor)
+
+def query_index(index_name: str, key: str, value: str, limit: Optional[int] = None,
+                cursor: Optional[str] = None):
+    """Newest-first rows of one GSI partition (`key` = `value`), following
+    pagination. Returns (items, next_cursor); next_cursor is None once
+    everything has been read."""
+    kwargs = {
+        'IndexName': index_name,
+        'KeyConditionExpression': '#key = :value',
+        'ExpressionAttributeNames': {'#key': key},
+        'ExpressionAttributeValues': {':value': value},
+        'ScanIndexForward': False,
+    }
+    if cursor:
+        kwargs['ExclusiveStartKey'] = decode_cursor(cursor, key, value)
+    items = []
+    while True:
+        if limit:
+            kwargs['Limit'] = limit - len(items)
+        response = table.query(**kwargs)
+        items.extend(response['Items'])
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key or (limit and len(items) >= limit):
+            break
+        kwargs['ExclusiveStartKey'] = last_key
+    next_cursor = (base64.urlsafe_b64encode(json.dumps(last_key).encode()).decode()
+                   if last_key else None)
+    return items, next_cursor
+
+class InvalidCursor(ValueError):
+    """A client-supplied paging cursor that query_index did not hand out."""
+
+def decode_cursor(cursor: str, key: str, value: str) -> Dict[str, Any]:
+    """The ExclusiveStartKey a query_index cursor encodes. It must decode to the
+    index's key attributes (table pk/sk plus `key` = `value` and timestamp), all
+    strings; anything else raises InvalidCursor rather than reaching DynamoDB."""
+    try:
+        start = json.loads(base64.urlsafe_b64decode(cursor))
+    except (ValueError, binascii.Error, TypeError):
+        raise InvalidCursor('Invalid cursor')
+    attrs = {'pk', 'sk', key, 'timestamp'}
+    if (not isinstance(start, dict) or set(start) != attrs
+            or not all(isinstance(v, str) for v in start.values())
+            or start[key] != value):
+        raise InvalidCursor('Invalid cursor')
+    return start
+
+def query_partition(pk: str, prefix: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Every row of one partition (whose sk starts with `prefix`, if given),
+    following pagination."""
+    kwargs = {
+        'KeyConditionExpression': 'pk = :pk',
+        'ExpressionAttributeValues': {':pk': pk},
+    }
+    if prefix is not None:
+        kwargs['KeyConditionExpression'] += ' AND begins_with(sk, :sk)'
+        kwargs['ExpressionAttributeValues'][':sk'] = prefix
+    items = []
+    while True:
+        response = table.query(**kwargs)
+        items.extend(response['Items'])
+        if 'LastEvaluatedKey' not in response:
+            return items
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def get_all_comments(limit: Optional[int] = None, cursor: Optional[str] = None) -> Dict[str, Any]:
     """Get all comments from all games"""
     try:
-        response = table.scan(
-            FilterExpression='#type = :type',
-            ExpressionAttributeNames={'#type': 'type'},
-            ExpressionAttributeValues={':type': 'comment'}
-        )
+        items, next_cursor = query_by_type('comment', limit, cursor)
         
         comments = []
-        for item in response['Items']:
+        for item in items:
             comments.append({
                 'commentId': item['sk'].replace('COMMENT#', ''),
                 'gameId': item['pk'].replace('GAME#', ''),
@@ -537,30 +964,26 @@ def get_all_comments() -> Dict[str, Any]:
                 'timestamp': item['timestamp']
             })
         
-        # Sort by timestamp, most recent first
-        comments.sort(key=lambda x: x['timestamp'], reverse=True)
-        
         return create_response(200, {
             'comments': comments,
             'totalComments': len(comments),
+            'nextCursor': next_cursor,
             'lastUpdated': datetime.now().isoformat()
         })
         
+    except InvalidCursor as e:
+        return create_response(400, {'error': str(e)})
     except Exception as e:
-        print(f'Error getting all comments: {str(e)}')
+        log.error('Error getting all comments', error=str(e))
         return create_response(500, {'error': 'Failed to fetch comments', 'message': str(e)})
 
-def get_all_ratings() -> Dict[str, Any]:
+def get_all_ratings(limit: Optional[int] = None, cursor: Optional[str] = None) -> Dict[str, Any]:
     """Get all ratings from all games"""
     try:
-        response = table.scan(
-            FilterExpression='#type = :type',
-            ExpressionAttributeNames={'#type': 'type'},
-            ExpressionAttributeValues={':type': 'rating'}
-        )
+        items, next_cursor = query_by_type('rating', limit, cursor)
         
         ratings = []
-        for item in response['Items']:
+        for item in items:
             ratings.append({
                 'gameId': item['pk'].replace('GAME#', ''),
                 'userId': item['userId'],
@@ -569,30 +992,27 @@ def get_all_ratings() -> Dict[str, Any]:
                 'timestamp': item['timestamp']
             })
         
-        # Sort by timestamp, most recent first
-        ratings.sort(key=lambda x: x['timestamp'], reverse=True)
-        
         return create_response(200, {
             'ratings': ratings,
             'totalRatings': len(ratings),
+            'nextCursor': next_cursor,
             'lastUpdated': datetime.now().isoformat()
         })
         
+    except InvalidCursor as e:
+        return create_response(400, {'error': str(e)})
     except Exception as e:
-        print(f'Error getting all ratings: {str(e)}')
+        log.error('Error getting all ratings', error=str(e))
         return create_response(500, {'error': 'Failed to fetch ratings', 'message': str(e)})
 
-def get_all_likes(current_user_id: Optional[str] = None) -> Dict[str, Any]:
+def get_all_likes(current_user_id: Optional[str] = None, limit: Optional[int] = None,
+                  cursor: Optional[str] = None) -> Dict[str, Any]:
     """Get all likes from all games"""
     try:
-        response = table.scan(
-            FilterExpression='#type = :type',
-            ExpressionAttributeNames={'#type': 'type'},
-            ExpressionAttributeValues={':type': 'like'}
-        )
+        items, next_cursor = query_by_type('like', limit, cursor)
         
         likes = []
-        for item in response['Items']:
+        for item in items:
             likes.append({
                 'gameId': item['pk'].replace('GAME#', ''),
                 'userId': item['userId'],
@@ -601,15 +1021,15 @@ def get_all_likes(current_user_id: Optional[str] = None) -> Dict[str, Any]:
                 'isCurrentUser': current_user_id == item['userId'] if current_user_id else False
             })
         
-        # Sort by timestamp, most recent first
-        likes.sort(key=lambda x: x['timestamp'], reverse=True)
-        
         return create_response(200, {
             'likes': likes,
             'totalLikes': len(likes),
+            'nextCursor': next_cursor,
             'lastUpdated': datetime.now().isoformat()
         })
         
+    except InvalidCursor as e:
+        return create_response(400, {'error': str(e)})
     except Exception as e:
-        print(f'Error getting all likes: {str(e)}')
+        log.error('Error getting all likes', error=str(e))
         return create_response(500, {'error': 'Failed to fetch likes', 'message': str(e)})
\ No newline at end of file
@@ -67,11 +67,9 @@ def handle_state(table, query_params):
     sid, config = undercity_db.get_active_season(table)
     if not sid or not config or config.get('status') != 'active':
         return 200, {'seasonId': None, 'entries': []}
-    resp = table.query(
-        KeyConditionExpression='pk = :pk AND begins_with(sk, :sk)',
-        ExpressionAttributeValues={':pk': _queue_pk(sid), ':sk': 'GAME#'},
-    )
-    entries = [_public_entry(item) for item in resp.get('Items', [])
+    entries = [_public_entry(item)
+               for item in undercity_db.query_items(table, _queue_pk(sid), 'GAME#',
+                                                    clean=False)
                if item.get('status', 'lobby') != 'closed']
     return 200, {'seasonId': sid, 'entries': entries}
 
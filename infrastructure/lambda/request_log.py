@@ -0,0 +1,178 @@
+"""
+Structured, sampled request logging for the Lambda.
+
+Every line is one compact JSON object on stdout (CloudWatch picks it up as-is),
+and a line is only built — fields evaluated, JSON serialized — once it is known
+to be emitted. Three knobs, all env vars:
+
+  LOG_LEVEL     debug | info | warning | error (default info). The full event
+                is logged at debug only.
+  LOG_SAMPLE    per-route sampling of info/debug lines, 'GET /game/state=0.05,
+                ...'. Routes not listed are always logged; the polling routes
+                default to DEFAULT_SAMPLE. Warnings, errors and 5xx summaries
+                are never sampled away.
+  LOG_BODY_MAX  request bodies are truncated to this many characters
+                (default 512) after secrets are redacted.
+
+Per request, `begin` picks the route and rolls the sampling dice once, and
+`finish` writes the summary line: route, status, duration and how many
+DynamoDB calls the request made (counted off the boto3 client by `track`).
+No AWS imports, so the module is unit-testable.
+"""
+import base64
+import json
+import os
+import random
+import time
+from typing import Any, Dict, Optional
+
+LEVELS = {'debug': 10, 'info': 20, 'warning': 30, 'error': 40}
+
+# The game-night polls: a few per second per open tab, all alike.
+DEFAULT_SAMPLE = {
+    'GET /game/state': 0.05,
+    'GET /queue/state': 0.05,
+}
+
+# Body/header keys whose values never reach the logs.
+REDACT_KEYS = frozenset({'hostKey', 'authorization', 'cookie', 'keys', 'p256dh', 'auth'})
+
+
+def _parse_sample(spec: str) -> Dict[str, float]:
+    rates = dict(DEFAULT_SAMPLE)
+    for part in filter(None, (p.strip() for p in spec.split(','))):
+        route, _, rate = part.rpartition('=')
+        try:
+            rates[route.strip()] = float(rate)
+        except ValueError:
+            pass
+    return rates
+
+
+LOG_LEVEL = LEVELS.get(os.environ.get('LOG_LEVEL', 'info').lower(), LEVELS['info'])
+LOG_SAMPLE = _parse_sample(os.environ.get('LOG_SAMPLE', ''))
+LOG_BODY_MAX = int(os.environ.get('LOG_BODY_MAX', '512'))
+
+# Request-scoped state: set by begin(), read by log()/finish(). One request at
+# a time per container, so a module global is enough.
+_request: Optional[Dict[str, Any]] = None
+
+
+def route_of(event: Dict[str, Any]) -> str:
+    """The route a request is logged and sampled under: method plus the first
+    path segment (two for /game and /queue), so ids never split a route."""
+    if event.get('task'):
+        return f"TASK {event['task']}"
+    http = event.get('requestContext', {}).get('http', {})
+    method = http.get('method') or event.get('httpMethod', '')
+    parts = [p for p in (http.get('path') or event.get('rawPath', '')).split('/') if p]
+    keep = 2 if parts[:1] in (['game'], ['queue']) else 1
+    return f"{method} /{'/'.join(parts[:keep])}"
+
+
+def begin(event: Dict[str, Any]) -> None:
+    global _request
+    route = route_of(event)
+    rate = LOG_SAMPLE.get(route, 1.0)
+    _request = {'route': route, 'start': time.perf_counter(), 'ddb': 0,
+                'sampled': rate >= 1.0 or random.random() < rate}
+
+
+def enabled(level: str) -> bool:
+    """Would a line at `level` be written for the current request?"""
+    n = LEVELS[level]
+    if n < LOG_LEVEL:
+        return False
+    return n >= LEVELS['warning'] or _request is None or _request['sampled']
+
+
+def log(level: str, msg: str, **fields: Any) -> None:
+    """Write one structured line. Callable field values are evaluated only if
+    the line is emitted, so expensive context costs nothing when filtered."""
+    if not enabled(level):
+        return
+    line = {'level': level, 'msg': msg}
+    if _request is not None:
+        line['route'] = _request['route']
+    for key, value in fields.items():
+        line[key] = value() if callable(value) else value
+    print(json.dumps(line, default=str, separators=(',', ':')))
+
+
+def debug(msg: str, **fields: Any) -> None:
+    log('debug', msg, **fields)
+
+
+def info(msg: str, **fields: Any) -> None:
+    log('info', msg, **fields)
+
+
+def warning(msg: str, **fields: Any) -> None:
+    log('warning', msg, **fields)
+
+
+def error(msg: str, **fields: Any) -> None:
+    log('error', msg, **fields)
+
+
+def finish(status: int) -> None:
+    """The per-request summary line. 5xx responses are logged as errors, so
+    they survive sampling."""
+    global _request
+    if _request is None:
+        return
+    level = 'error' if status >= 500 else 'info'
+    if enabled(level):
+        log(level, 'request', status=status, ddb=_request['ddb'],
+            ms=round((time.perf_counter() - _request['start']) * 1000, 1))
+    _request = None
+
+
+def track(client: Any) -> None:
+    """Count every DynamoDB API call made through a boto3 client (the table
+    resource's `meta.client`) against the current request."""
+    client.meta.events.register('before-call.dynamodb', _count_call)
+
+
+def _count_call(**_kw: Any) -> None:
+    count_calls(1)
+
+
+def count_calls(n: int) -> None:
+    """Count `n` DynamoDB calls made through a client `track` never saw (a
+    fan-out worker's own resource) against the current request."""
+    if _request is not None:
+        _request['ddb'] += n
+
+
+def redact(value: Any) -> Any:
+    """A copy of `value` with REDACT_KEYS masked at any depth."""
+    if isinstance(value, dict):
+        return {k: '***' if k in REDACT_KEYS else redact(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [redact(v) for v in value]
+    return value
+
+
+def redact_body(body: Optional[str]) -> Optional[str]:
+    """The request body as it may be logged: secrets masked, then truncated."""
+    if not body:
+        return body
+    try:
+        body = json.dumps(redact(json.loads(body)), separators=(',', ':'))
+    except ValueError:
+        pass
+    if len(body) > LOG_BODY_MAX:
+        return f'{body[:LOG_BODY_MAX]}…(+{len(body) - LOG_BODY_MAX})'
+    return body
+
+
+def loggable_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """The event for a debug line: headers redacted, body redacted/truncated."""
+    out = {k: v for k, v in event.items() if k not in ('body', 'headers', 'multiValueHeaders')}
+    out['headers'] = redact({k.lower(): v for k, v in (event.get('headers') or {}).items()})
+    body = event.get('body')
+    if event.get('isBase64Encoded') and body:
+        body = base64.b64decode(body).decode('utf-8', 'replace')
+    out['body'] = redact_body(body)
+    return out
@@ -0,0 +1,100 @@
+"""
+Cold-start benchmark: import time per route, as a fresh Lambda container sees it.
+
+Run: python infrastructure/lambda/scripts/bench_cold_start.py [--runs N]
+
+Each sample is a new interpreter that imports lambda_function and serves one
+request against an empty in-memory table, so it pays every import that route
+pulls in. Two builds are measured side by side from throwaway copies of the
+lambda directory:
+
+  source    — no bytecode (what /var/task looked like before the bundling step
+              precompiled it: every module compiled on every cold start)
+  bytecode  — `compileall --invalidation-mode checked-hash`, as the CDK bundle
+              now ships
+
+Prints the median milliseconds per route and which Undercity modules it loaded.
+"""
+import argparse
+import json
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+LAMBDA_DIR = Path(__file__).resolve().parents[1]
+
+ROUTES = [
+    ('GET', '/comments/catan'),
+    ('GET', '/all-ratings'),
+    ('GET', '/catalog-summary'),
+    ('GET', '/queue/state'),
+    ('GET', '/game/state'),
+    ('GET', '/game/map'),
+]
+
+# One cold request: everything from the first import to the response.
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import lambda_function
+
+class EmptyTable:
+    def get_item(self, **kw): return {}
+    def query(self, **kw): return {'Items': []}
+    def put_item(self, **kw): return {}
+    def update_item(self, **kw): return {'Attributes': {}}
+
+lambda_function.table = EmptyTable()
+method, path = sys.argv[1:3]
+lambda_function.lambda_handler(
+    {'requestContext': {'http': {'method': method, 'path': path}},
+     'queryStringParameters': {'userId': 'bench'}}, None)
+ms = (time.perf_counter() - t0) * 1000
+mods = sorted(m for m in sys.modules if m.startswith(('undercity_', 'queue_db', 'push')))
+print(json.dumps({'ms': ms, 'modules': mods}), file=sys.__stderr__)
+"""
+
+
+def _copy(dest: Path, compiled: bool) -> Path:
+    shutil.copytree(LAMBDA_DIR, dest, ignore=shutil.ignore_patterns(
+        '__pycache__', 'tests', 'sim', 'scripts'))
+    if compiled:
+        subprocess.run([sys.executable, '-m', 'compileall', '-q',
+                        '--invalidation-mode', 'checked-hash', str(dest)], check=True)
+    return dest
+
+
+def _sample(build: Path, method: str, path: str) -> dict:
+    # -B: never write bytecode, so the source build stays source-only.
+    proc = subprocess.run([sys.executable, '-B', '-c', PROBE, method, path],
+                          cwd=build, capture_output=True, text=True,
+                          env={'AWS_DEFAULT_REGION': 'us-east-1', 'PATH': ''})
+    if proc.returncode:
+        raise SystemExit(proc.stderr)
+    return json.loads(proc.stderr.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        builds = {'source': _copy(Path(tmp) / 'source', compiled=False),
+                  'bytecode': _copy(Path(tmp) / 'bytecode', compiled=True)}
+        print(f'{"route":<22}{"source":>10}{"bytecode":>10}  modules')
+        for method, path in ROUTES:
+            row, modules = [], []
+            for build in builds.values():
+                samples = [_sample(build, method, path) for _ in range(args.runs)]
+                row.append(statistics.median(s['ms'] for s in samples))
+                modules = samples[0]['modules']
+            print(f'{method + " " + path:<22}{row[0]:>8.1f}ms{row[1]:>8.1f}ms  '
+                  f'{", ".join(modules) or "-"}')
+
+
+if __name__ == '__main__':
+    main()
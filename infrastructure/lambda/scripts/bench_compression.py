@@ -0,0 +1,89 @@
+"""
+Response-compression benchmark: CPU spent against bytes saved.
+
+Run: python infrastructure/lambda/scripts/bench_compression.py [--players N]
+
+Plays a game night in memory (the sim harness drives the real dispatcher):
+N creatures join, roll and chat. It then serializes GET /game/state and
+GET /game/map exactly as create_response does. For each payload it prints the
+raw size, then for gzip and deflate at a few levels: compressed size, the
+base64 size that actually goes on the wire, and the median time to compress
+and base64-encode.
+"""
+import argparse
+import base64
+import gzip
+import statistics
+import sys
+import time
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sim.harness import GameSim, debug_rolls, seed_all  # noqa: E402
+
+import lambda_function  # noqa: E402
+import undercity_data as data  # noqa: E402
+import undercity_db as db  # noqa: E402
+
+LEVELS = (1, 5, 6, 9)
+
+
+def busy_night(players: int) -> GameSim:
+    """A night with `players` creatures spread over the board, chatting."""
+    seed_all(7)
+    sim = GameSim()
+    starters = sorted(data.STARTERS)
+    homes = sorted(data.BIOMES)
+    with debug_rolls():
+        for i in range(players):
+            sim.user_id, sim.username = f'user-{i:02d}', f'Player {i}'
+            sim.act('join', starter=starters[i % len(starters)], home=homes[i % len(homes)])
+            sim.act('chat', text=f'evening from {sim.username}')
+            for _ in range(3):
+                status, resp = sim.raw('roll')
+                if status != 200 or not resp.get('destinations'):
+                    break
+                sim.raw('move', to=resp['destinations'][0])
+    return sim
+
+
+def _median_us(fn, runs=30):
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1e6)
+    return statistics.median(samples)
+
+
+def report(name: str, body: str):
+    raw = body.encode('utf-8')
+    print(f'\n{name}: {len(raw):,} bytes raw')
+    print(f'  {"coding":<10}{"level":>6}{"packed":>10}{"on wire":>10}{"ratio":>8}{"cpu":>10}')
+    for coding, pack in (('gzip', lambda b, l: gzip.compress(b, compresslevel=l, mtime=0)),
+                         ('deflate', zlib.compress)):
+        for level in LEVELS:
+            packed = pack(raw, level)
+            wire = len(base64.b64encode(packed))
+            us = _median_us(lambda: base64.b64encode(pack(raw, level)))
+            print(f'  {coding:<10}{level:>6}{len(packed):>10,}{wire:>10,}'
+                  f'{wire / len(raw):>8.1%}{us:>8.0f}us')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--players', type=int, default=15)
+    args = parser.parse_args()
+
+    sim = busy_night(args.players)
+    for name, (status, payload) in (
+            ('GET /game/state', db.handle_state(sim.table, {'userId': 'user-00'})),
+            ('GET /game/map', db.handle_map(sim.table, {}))):
+        assert status == 200, payload
+        report(name, lambda_function.create_response(status, payload)['body'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Response-serialization microbenchmark on a recorded 15-player state payload.
+
+Run: python infrastructure/lambda/scripts/bench_json.py [--record]
+
+The payload is scripts/fixtures/state-15-players.json: GET /game/state for
+one of 15 creatures after each joined, chatted and took a few turns. It is
+loaded the way the table hands rows back: every number is a Decimal, and the
+event and chat rows still carry pk/sk. The benchmark then times three ways of
+turning it into a response body:
+
+  old         per-row pk/sk comprehensions, then json.dumps(default=float)
+  old+clean   a `_clean` pass to a Decimal-free copy, then json.dumps
+  ddb_json    ddb_json.public per row, then one compact ddb_json.dumps pass
+
+--record replays the night through the sim harness and rewrites the fixture.
+"""
+import argparse
+import json
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import ddb_json  # noqa: E402
+import undercity_db as db  # noqa: E402
+
+FIXTURE = Path(__file__).with_name('fixtures') / 'state-15-players.json'
+
+
+def record():
+    from bench_compression import busy_night
+    sim = busy_night(15)
+    status, payload = db.handle_state(sim.table, {'userId': 'user-00'})
+    assert status == 200, payload
+    FIXTURE.write_text(json.dumps(payload, indent=1, sort_keys=True) + '\n', encoding='utf-8')
+    print(f'recorded {FIXTURE}')
+
+
+def load():
+    """The recorded payload, shaped the way DynamoDB rows arrive."""
+    state = json.loads(FIXTURE.read_text(encoding='utf-8'),
+                       parse_int=Decimal, parse_float=Decimal)
+    for family in ('events', 'chat'):
+        state[family] = [dict(row, pk='UNDERCITY#night', sk=f'{family}#{i}')
+                         for i, row in enumerate(state[family])]
+    return state
+
+
+def _old(state):
+    out = dict(state)
+    for family in ('events', 'chat'):
+        out[family] = [{k: v for k, v in r.items() if k not in ('pk', 'sk')} for r in state[family]]
+    return json.dumps(out, default=float)
+
+
+def _old_clean(state):
+    out = dict(state)
+    for family in ('events', 'chat'):
+        out[family] = [{k: v for k, v in r.items() if k not in ('pk', 'sk')} for r in state[family]]
+    return json.dumps(db._clean(out))
+
+
+def _new(state):
+    out = dict(state)
+    for family in ('events', 'chat'):
+        out[family] = [ddb_json.public(r) for r in state[family]]
+    return ddb_json.dumps(out)
+
+
+def _best_us(fn, runs=300):
+    """Fastest of `runs` calls: the least noisy figure for a sub-ms function."""
+    best = float('inf')
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, (time.perf_counter() - t0) * 1e6)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--record', action='store_true')
+    args = parser.parse_args()
+    if args.record:
+        record()
+
+    state = load()
+    assert json.loads(_new(state)) == json.loads(_old_clean(state))
+    print(f'{"path":<12}{"best":>10}{"bytes":>10}')
+    for name, fn in (('old', _old), ('old+clean', _old_clean), ('ddb_json', _new)):
+        print(f'{name:<12}{_best_us(lambda: fn(state)):>8.0f}us{len(fn(state)):>10,}')
+
+
+if __name__ == '__main__':
+    main()
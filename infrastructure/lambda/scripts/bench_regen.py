@@ -0,0 +1,76 @@
+"""
+Lazy-regen benchmark: regen_rolls / regen_hp cost against how long a player was away.
+
+Run: python infrastructure/lambda/scripts/bench_regen.py
+
+Both run for every player on every state poll, action and refill sweep. For a
+range of idle gaps this prints the best time per call of the closed-form
+regen_rolls next to the tick-by-tick loop it replaced, and of regen_hp. The
+player starts with an empty bank and no rested rolls, so the loop has to walk
+through both phases.
+"""
+import sys
+import timeit
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import undercity_data as data  # noqa: E402
+import undercity_engine as engine  # noqa: E402
+
+BASE = '2020-01-01T00:00:00'
+GAPS_HOURS = (0.5, 2, 8, 24, 24 * 7, 24 * 30)
+
+
+def loop_regen_rolls(player, now_iso, bank_rested=True):
+    """The tick-by-tick regen_rolls this benchmark compares against."""
+    last = player['rollRegenAt']
+    minutes = (engine._parse_iso(now_iso) - engine._parse_iso(last)).total_seconds() / 60
+    intervals = int(minutes // data.ROLL_REGEN_MINUTES)
+    rolls, rested = player.get('rolls', 0), player.get('rested', 0)
+    per, cap, rcap = data.ROLLS_PER_REGEN, data.ROLL_CAP, data.RESTED_CAP
+    for _ in range(intervals):
+        if rolls >= cap:
+            if not bank_rested or rested >= rcap:
+                break
+            rested = min(rcap, rested + per)
+        else:
+            gain = per
+            if bank_rested and rested > 0:
+                bonus = min(rested, per)
+                gain += bonus
+                rested -= bonus
+            new_rolls = rolls + gain
+            if new_rolls > cap:
+                if bank_rested:
+                    rested = min(rcap, rested + (new_rolls - cap))
+                rolls = cap
+            else:
+                rolls = new_rolls
+    player['rolls'], player['rested'] = rolls, rested
+    advanced = engine._parse_iso(last) + timedelta(minutes=intervals * data.ROLL_REGEN_MINUTES)
+    player['rollRegenAt'] = advanced.strftime(engine._ISO)
+
+
+def _best_us(fn, player, now, runs=5000):
+    def call():
+        fn(dict(player), now)
+    return min(timeit.repeat(call, number=runs, repeat=9)) / runs * 1e6
+
+
+def main():
+    player = {'starter': 'pest', 'level': 5, 'hp': 1, 'rolls': 0, 'rested': 0,
+              'rollRegenAt': BASE, 'hpUpdatedAt': BASE}
+    print(f'{"away":>8}{"ticks":>8}{"loop":>10}{"closed":>10}{"regen_hp":>10}')
+    for hours in GAPS_HOURS:
+        now = (datetime.fromisoformat(BASE) + timedelta(hours=hours)).strftime(engine._ISO)
+        ticks = int(hours * 60 // data.ROLL_REGEN_MINUTES)
+        print(f'{hours:>7g}h{ticks:>8}'
+              f'{_best_us(loop_regen_rolls, player, now):>8.1f}us'
+              f'{_best_us(engine.regen_rolls, player, now):>8.1f}us'
+              f'{_best_us(engine.regen_hp, player, now):>8.1f}us')
+
+
+if __name__ == '__main__':
+    main()
@@ -106,6 +106,7 @@ class Driver:
         if directive is not None:
             self.res.directive = directive.name
         self._graph = None                 # night's node dict, enriched with _depth
+        self._board = None                 # the same night as an engine.Board (hop matrix)
         self._recent = []                  # recently-visited nodes (anti-orbit memory)
         self._cur_target = None
 
@@ -123,22 +124,16 @@ class Driver:
             graph[nid] = {'type': n.get('type'), 'region': n.get('region'),
                           'neighbors': n.get('neighbors', []), '_depth': depth.get(nid, 0)}
         self._graph = graph
+        self._board = db._season_board(sim.table, sim.sid)
         return graph
 
     def _bfs(self, source):
-        """Hop-distance from `source` to every reachable node (undirected)."""
+        """Hop-distance from `source` to every reachable node (undirected), off
+        the night's board hop matrix (db._season_board) — a row is walked once
+        per game, then reused turn after turn."""
         if source not in self._graph:
             return {}
-        dist = {source: 0}
-        queue, i = [source], 0
-        while i < len(queue):
-            cur = queue[i]
-            i += 1
-            for nb in self._graph[cur]['neighbors']:
-                if nb in self._graph and nb not in dist:
-                    dist[nb] = dist[cur] + 1
-                    queue.append(nb)
-        return dist
+        return self._board.hops().from_node(source)
 
     def _choose_destination(self, sim, dests):
         """Directive pathfinding when a target exists (pick the dest closest to it,
@@ -17,6 +17,7 @@ night-length / roll-economy overlay is applied analytically in report.py.
 """
 import sys
 import random
+import re
 from contextlib import contextmanager
 from pathlib import Path
 
@@ -79,8 +80,43 @@ class FakeTable:
         self.items.pop(self._key(Key), None)
         return {}
 
+    def update_item(self, Key, UpdateExpression, ConditionExpression=None,
+                    ExpressionAttributeNames=None, ExpressionAttributeValues=None,
+                    ReturnValues=None):
+        """Subset db.py uses: `SET a = :x, ...` (or `a = if_not_exists(a, :x)`),
+        `REMOVE a, ...` and `ADD a :n, ...` sections (names may be #placeholders),
+        guarded like put_item by `ver = :v`, returning UPDATED_NEW or ALL_NEW.
+        Pattern-matches the expression like query()."""
+        key = self._key(Key)
+        names = ExpressionAttributeNames or {}
+        vals = ExpressionAttributeValues or {}
+        if ConditionExpression == 'ver = :v':
+            existing = self.items.get(key)
+            if not existing or existing.get('ver') != vals[':v']:
+                raise ClientError({'Error': {'Code': 'ConditionalCheckFailedException'}}, 'UpdateItem')
+        item = _ddb_copy(self.items.get(key) or dict(Key))
+        changed = {}
+        for action, body in re.findall(r'(SET|REMOVE|ADD) (.*?)(?= SET | REMOVE | ADD |$)',
+                                       UpdateExpression):
+            for clause in re.split(r',(?![^()]*\))', body):
+                if action == 'REMOVE':
+                    item.pop(names.get(clause.strip(), clause.strip()), None)
+                    continue
+                keep = re.fullmatch(r'\s*(\S+) = if_not_exists\(\S+, (\S+)\)\s*', clause)
+                attr, ref = keep.groups() if keep else clause.replace('=', ' ').split()
+                attr = names.get(attr, attr)
+                if keep and attr in item:
+                    continue
+                item[attr] = vals[ref] if action == 'SET' else item.get(attr, 0) + vals[ref]
+                changed[attr] = item[attr]
+        self.items[key] = _ddb_copy(item, reject_float=True)
+        if ReturnValues == 'ALL_NEW':
+            return {'Attributes': _ddb_copy(item)}
+        return {'Attributes': _ddb_copy(changed)} if ReturnValues == 'UPDATED_NEW' else {}
+
     def query(self, KeyConditionExpression, ExpressionAttributeValues,
-              ScanIndexForward=True, Limit=None):
+              ScanIndexForward=True, Limit=None, ProjectionExpression=None,
+              ExpressionAttributeNames=None):
         pk = ExpressionAttributeValues[':pk']
         sk = ExpressionAttributeValues.get(':sk')
         out = []
@@ -91,10 +127,21 @@ class FakeTable:
                 continue
             if 'sk >= :sk' in KeyConditionExpression and not isk >= sk:
                 continue
+            if 'sk < :sk' in KeyConditionExpression and not isk < sk:
+                continue
+            if 'sk > :sk' in KeyConditionExpression and not isk > sk:
+                continue
+            if 'BETWEEN' in KeyConditionExpression and not (
+                    ExpressionAttributeValues[':lo'] <= isk <= ExpressionAttributeValues[':hi']):
+                continue
             out.append(item)
         out.sort(key=lambda i: i['sk'], reverse=not ScanIndexForward)
         if Limit:
             out = out[:Limit]
+        if ProjectionExpression:
+            keep = [(ExpressionAttributeNames or {}).get(a.strip(), a.strip())
+                    for a in ProjectionExpression.split(',')]
+            out = [{k: i[k] for k in keep if k in i} for i in out]
         return {'Items': _ddb_copy(out)}
 
 
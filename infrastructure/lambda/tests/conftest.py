@@ -1,7 +1,12 @@
 """Shared test setup. Procedural dungeon generation is ON in production but OFF
 by default in tests: the legacy suite assumes the committed depths, and leaving
 generation off keeps season-start fast and deterministic. Tests that exercise
-generation opt in with `monkeypatch.setattr(data, 'PROCEDURAL_DUNGEONS', True)`."""
+generation opt in with `monkeypatch.setattr(data, 'PROCEDURAL_DUNGEONS', True)`.
+
+The warm-container world cache (ON in production) runs both ways: every test
+runs once cold and once warm, so the state and action paths are checked with
+shared rows served from a container's view as well as read afresh. Tests of the
+cache itself pin it on with `WARM_WORLD_CACHE = True`."""
 import sys
 from pathlib import Path
 
@@ -9,8 +14,15 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 import pytest
 import undercity_data as data
+import undercity_db as db
 
 
 @pytest.fixture(autouse=True)
 def _procedural_off(monkeypatch):
     monkeypatch.setattr(data, 'PROCEDURAL_DUNGEONS', False)
+
+
+@pytest.fixture(autouse=True, params=[False, True], ids=['cold', 'warm'])
+def _warm_world(request, monkeypatch):
+    monkeypatch.setattr(db, 'WARM_WORLD_CACHE', request.param)
+    db._warm_world.clear()
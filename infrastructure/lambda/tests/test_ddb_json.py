@@ -0,0 +1,35 @@
+"""ddb_json: one compact encoder pass over DynamoDB-shaped data."""
+import json
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+import ddb_json
+import undercity_db as db
+
+FIXTURE = Path(__file__).resolve().parents[1] / 'scripts' / 'fixtures' / 'state-15-players.json'
+
+
+def test_decimals_encode_like_clean():
+    row = {'pk': 'GAME#catan', 'rating': Decimal('8'), 'avg': Decimal('7.25'),
+           'nested': [{'n': Decimal('-3')}], 'big': Decimal(2 ** 60)}
+    assert ddb_json.dumps(row) == json.dumps(db._clean(row), separators=(',', ':'))
+    assert '"rating":8,' in ddb_json.dumps(row)
+
+
+def test_public_drops_only_the_keys():
+    row = {'pk': 'p', 'sk': 's', 'text': 'hi'}
+    assert ddb_json.public(row) == {'text': 'hi'}
+    assert row['pk'] == 'p'                      # the cached row is untouched
+
+
+def test_recorded_state_round_trips():
+    state = json.loads(FIXTURE.read_text(encoding='utf-8'),
+                       parse_int=Decimal, parse_float=Decimal)
+    assert json.loads(ddb_json.dumps(state)) == json.loads(FIXTURE.read_text(encoding='utf-8'))
+
+
+def test_unknown_types_still_fail_loudly():
+    with pytest.raises(TypeError):
+        ddb_json.dumps({'when': object()})
@@ -0,0 +1,130 @@
+"""GAME#{id}/AGG: per-game rating and like aggregates kept current by ADD on
+every write, and served for the whole catalog by /all-aggregates."""
+from decimal import Decimal
+
+import pytest
+
+import lambda_function
+from tests.test_lambda_bulk import NoScanTable, _call
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    table = NoScanTable(page_size=2)
+    monkeypatch.setattr(lambda_function, 'table', table)
+    return table
+
+
+def _rate(game, user, rating):
+    status, body = _call('POST', f'/ratings/{game}',
+                         {'userId': user, 'username': user.title(), 'rating': rating})
+    assert status == 201, body
+
+
+def _like(game, user):
+    status, body = _call('POST', f'/likes/{game}', {'userId': user, 'username': user.title()})
+    assert status == 200, body
+    return body['isLiked']
+
+
+def _aggregates(**query):
+    status, body = _call('GET', '/all-aggregates', query=query)
+    assert status == 200, body
+    return body
+
+
+def test_ratings_and_likes_roll_up_on_write(fake):
+    _rate('catan', 'amy', 8)
+    _rate('catan', 'bo', 6)
+    _rate('catan', 'amy', 10)            # a re-rate replaces amy's 8
+    assert _like('catan', 'amy') is True
+    assert _like('catan', 'bo') is True
+    assert _like('catan', 'bo') is False  # toggled back off
+
+    (agg,) = _aggregates()['aggregates']
+    assert agg['gameId'] == 'catan'
+    assert agg['totalRatings'] == 2 and agg['averageRating'] == 8.0
+    assert {k: v for k, v in agg['ratingHistogram'].items() if v} == {'6': 1, '10': 1}
+    assert agg['totalLikes'] == 1
+    # ...and it agrees with the per-game endpoints, which read it too.
+    _, ratings = _call('GET', '/ratings/catan')
+    assert ratings['averageRating'] == agg['averageRating']
+    _, likes = _call('GET', '/likes/catan', query={'userId': 'amy'})
+    assert likes['totalLikes'] == 1 and likes['isLikedByCurrentUser'] is True
+
+
+def test_rows_from_before_aggregates_are_folded_in_once(fake):
+    fake.put_item(Item={'pk': 'GAME#azul', 'sk': 'RATING#old', 'userId': 'old',
+                        'username': 'Old', 'rating': Decimal('4'),
+                        'timestamp': '2025-01-01T00:00:00', 'type': 'rating'})
+    fake.put_item(Item={'pk': 'GAME#azul', 'sk': 'LIKE#old', 'userId': 'old',
+                        'username': 'Old', 'timestamp': '2025-01-01T00:00:00',
+                        'type': 'like'})
+    _rate('azul', 'amy', 6)
+    _rate('azul', 'old', 5)
+
+    (agg,) = _aggregates()['aggregates']
+    assert agg['totalRatings'] == 2 and agg['averageRating'] == 5.5
+    assert agg['totalLikes'] == 1
+
+
+def test_all_aggregates_pages(fake):
+    for game in ('catan', 'azul', 'root'):
+        _rate(game, 'amy', 7)
+    first = _aggregates(limit='2')
+    rest = _aggregates(limit='2', cursor=first['nextCursor'])
+    games = [a['gameId'] for a in first['aggregates'] + rest['aggregates']]
+    assert sorted(games) == ['azul', 'catan', 'root'] and rest['nextCursor'] is None
+
+
+def _count_queries(monkeypatch, table):
+    queries = []
+    real = table.query
+    monkeypatch.setattr(table, 'query', lambda **kw: queries.append(kw) or real(**kw))
+    return queries
+
+
+def test_per_game_reads_come_off_the_aggregate(fake, monkeypatch):
+    _rate('catan', 'amy', 8)
+    _rate('catan', 'bo', 6)
+    _like('catan', 'bo')
+    queries = _count_queries(monkeypatch, fake)
+
+    _, ratings = _call('GET', '/ratings/catan')
+    _, likes = _call('GET', '/likes/catan', query={'userId': 'amy'})
+    assert queries == []
+    assert ratings == {'averageRating': 7.0, 'totalRatings': 2}
+    assert likes == {'totalLikes': 1, 'isLikedByCurrentUser': False}
+
+    _, ratings = _call('GET', '/ratings/catan', query={'details': 'true'})
+    assert sorted(r['rating'] for r in ratings['ratings']) == [6.0, 8.0]
+
+
+def test_a_game_with_no_aggregate_is_counted_from_its_rows(fake):
+    fake.put_item(Item={'pk': 'GAME#azul', 'sk': 'RATING#old', 'userId': 'old',
+                        'username': 'Old', 'rating': Decimal('4'),
+                        'timestamp': '2025-01-01T00:00:00', 'type': 'rating'})
+    fake.put_item(Item={'pk': 'GAME#azul', 'sk': 'LIKE#old', 'userId': 'old',
+                        'username': 'Old', 'timestamp': '2025-01-01T00:00:00',
+                        'type': 'like'})
+    _, ratings = _call('GET', '/ratings/azul')
+    _, likes = _call('GET', '/likes/azul', query={'userId': 'old'})
+    assert ratings == {'averageRating': 4.0, 'totalRatings': 1}
+    assert likes == {'totalLikes': 1, 'isLikedByCurrentUser': True}
+
+
+def test_only_the_first_write_seeds_the_aggregate(fake, monkeypatch):
+    _rate('catan', 'amy', 8)
+    queries = _count_queries(monkeypatch, fake)
+    _rate('catan', 'bo', 6)
+    _like('catan', 'bo')
+    assert queries == []
+
+
+def test_a_seed_that_loses_the_race_counts_nothing_twice(fake):
+    _rate('catan', 'amy', 8)
+    lambda_function._aggregated.clear()   # a second container's first write
+    _rate('catan', 'bo', 6)
+
+    (agg,) = _aggregates()['aggregates']
+    assert agg['totalRatings'] == 2 and agg['averageRating'] == 7.0
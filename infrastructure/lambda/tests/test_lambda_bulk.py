@@ -0,0 +1,84 @@
+"""Bulk /all-comments, /all-ratings, /all-likes: read off the type index, newest
+first and paged — never a scan of the table the Undercity nights share."""
+import base64
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import lambda_function
+from tests.test_undercity_db import FakeTable, act
+
+
+class NoScanTable(FakeTable):
+    def scan(self, **kw):
+        raise AssertionError('bulk reads must not scan the table')
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    table = NoScanTable(page_size=2)
+    monkeypatch.setattr(lambda_function, 'table', table)
+    return table
+
+
+def _call(method, path, body=None, query=None):
+    resp = lambda_function.lambda_handler({
+        'requestContext': {'http': {'method': method, 'path': path}},
+        'body': json.dumps(body) if body is not None else '',
+        'queryStringParameters': query or {},
+    }, None)
+    return resp['statusCode'], json.loads(resp['body'])
+
+
+def _seed():
+    for i, game in enumerate(('catan', 'azul', 'root')):
+        _call('POST', f'/comments/{game}',
+              {'userId': f'u{i}', 'username': f'U{i}', 'comment': f'{game}!'})
+        _call('POST', f'/ratings/{game}', {'userId': f'u{i}', 'username': f'U{i}',
+                                           'rating': 7 + i})
+        _call('POST', f'/likes/{game}', {'userId': f'u{i}', 'username': f'U{i}'})
+
+
+def test_bulk_reads_return_every_row_newest_first(fake):
+    act(fake, 'season-start', hostKey='swampking')   # Undercity rows share the table
+    _seed()
+
+    status, body = _call('GET', '/all-comments')
+    assert status == 200, body
+    assert [c['gameId'] for c in body['comments']] == ['root', 'azul', 'catan']
+    assert body['totalComments'] == 3 and body['nextCursor'] is None
+
+    _, body = _call('GET', '/all-ratings')
+    assert [r['rating'] for r in body['ratings']] == [9.0, 8.0, 7.0]
+
+    _, body = _call('GET', '/all-likes', query={'userId': 'u1'})
+    assert [lk['isCurrentUser'] for lk in body['likes']] == [False, True, False]
+
+
+def test_bulk_reads_page_with_a_cursor(fake):
+    _seed()
+    _, first = _call('GET', '/all-comments', query={'limit': '2'})
+    assert [c['gameId'] for c in first['comments']] == ['root', 'azul']
+    _, rest = _call('GET', '/all-comments', query={'limit': '2',
+                                                   'cursor': first['nextCursor']})
+    assert [c['gameId'] for c in rest['comments']] == ['catan']
+    assert rest['nextCursor'] is None
+
+
+@pytest.mark.parametrize('cursor', [
+    'not base64!', base64.urlsafe_b64encode(b'{nope').decode(),
+    base64.urlsafe_b64encode(b'[1, 2]').decode(),
+    base64.urlsafe_b64encode(json.dumps({'pk': 'GAME#catan'}).encode()).decode(),
+    base64.urlsafe_b64encode(json.dumps({'pk': 'GAME#x', 'sk': 'LIKE#u', 'type': 'like',
+                                         'timestamp': 't'}).encode()).decode(),
+    base64.urlsafe_b64encode(json.dumps({'pk': 1, 'sk': 'C', 'type': 'comment',
+                                         'timestamp': 't'}).encode()).decode(),
+])
+def test_bulk_reads_reject_a_forged_cursor(fake, cursor):
+    _seed()
+    status, body = _call('GET', '/all-comments', query={'cursor': cursor})
+    assert status == 400 and body['error'] == 'Invalid cursor'
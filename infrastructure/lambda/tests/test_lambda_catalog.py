@@ -0,0 +1,125 @@
+"""GET /catalog-summary: the games page in one call, off precomputed per-game
+summary rows that each rating/like/comment write refreshes for its own game."""
+from decimal import Decimal
+
+import pytest
+
+import lambda_function
+from tests.test_lambda_bulk import NoScanTable, _call
+
+
+class ReadLog(NoScanTable):
+    def __init__(self):
+        super().__init__()
+        self.reads = []
+
+    def get_item(self, Key):
+        self.reads.append(('get', Key['pk']))
+        return super().get_item(Key)
+
+    def query(self, **kw):
+        self.reads.append(('query', kw.get('IndexName') or kw['ExpressionAttributeValues'].get(':pk')))
+        return super().query(**kw)
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    table = ReadLog()
+    monkeypatch.setattr(lambda_function, 'table', table)
+    return table
+
+
+def _post(path, **body):
+    status, resp = _call('POST', path, body)
+    assert status in (200, 201), resp
+
+
+def _summary(user=None):
+    status, body = _call('GET', '/catalog-summary', query={'userId': user} if user else {})
+    assert status == 200, body
+    return {g['gameId']: g for g in body['games']}
+
+
+def test_summary_tracks_every_write(fake):
+    for i in range(5):
+        _post('/comments/catan', userId=f'u{i}', username=f'U{i}', comment=f'take {i}')
+    _post('/ratings/catan', userId='amy', username='Amy', rating=9)
+    _post('/ratings/azul', userId='amy', username='Amy', rating=4)
+    _post('/likes/azul', userId='amy', username='Amy')
+
+    games = _summary('amy')
+    assert [c['comment'] for c in games['catan']['comments']] == ['take 4', 'take 3', 'take 2']
+    assert games['catan']['averageRating'] == 9.0 and games['catan']['totalLikes'] == 0
+    assert games['catan']['totalComments'] == 5 and games['azul']['totalComments'] == 0
+    assert games['azul']['totalLikes'] == 1 and games['azul']['comments'] == []
+    assert games['azul']['isLikedByCurrentUser'] is True
+    assert games['catan']['isLikedByCurrentUser'] is False
+
+    status, body = _call('GET', '/comments/catan')
+    newest = max(body['comments'], key=lambda c: c['timestamp'])
+    _call('DELETE', f"/comments/catan/{newest['commentId']}")
+    _post('/likes/azul', userId='amy', username='Amy')   # unliked
+    games = _summary('amy')
+    assert [c['comment'] for c in games['catan']['comments']] == ['take 3', 'take 2', 'take 1']
+    assert games['azul']['totalLikes'] == 0 and not games['azul']['isLikedByCurrentUser']
+
+
+def test_landing_is_one_summary_read_plus_the_callers_likes(fake):
+    _post('/ratings/catan', userId='amy', username='Amy', rating=9)
+    _summary()                       # first read builds the summary
+    fake.reads.clear()
+    _summary('bo')
+    assert fake.reads == [('query', 'CATALOG'), ('query', 'user-index')]
+    assert {sk for pk, sk in fake.items if pk == 'CATALOG'} == {'BUILT', 'GAME#catan'}
+
+
+def test_summary_is_built_from_rows_that_predate_it(fake):
+    fake.put_item(Item={'pk': 'GAME#root', 'sk': 'RATING#old', 'userId': 'old',
+                        'username': 'Old', 'rating': Decimal('6'),
+                        'timestamp': '2025-01-01T00:00:00', 'type': 'rating'})
+    fake.put_item(Item={'pk': 'GAME#root', 'sk': 'COMMENT#old#1', 'userId': 'old',
+                        'username': 'Old', 'comment': 'classic', 'rating': None,
+                        'timestamp': '2025-01-01T00:00:00', 'type': 'comment'})
+    _post('/likes/azul', userId='amy', username='Amy')   # a write before any read
+
+    games = _summary()
+    assert games['root']['averageRating'] == 6.0
+    assert [c['comment'] for c in games['root']['comments']] == ['classic']
+    assert games['azul']['totalLikes'] == 1
+
+
+def test_build_keeps_a_row_written_while_it_ran(fake, monkeypatch):
+    fake.put_item(Item={'pk': 'GAME#root', 'sk': 'RATING#old', 'userId': 'old',
+                        'username': 'Old', 'rating': Decimal('2'),
+                        'timestamp': '2025-01-01T00:00:00', 'type': 'rating'})
+    query_by_type = lambda_function.query_by_type
+
+    def racing(kind, *a, **kw):
+        rows = query_by_type(kind, *a, **kw)
+        if kind == 'comment':          # the index was read; a rating lands now
+            _post('/ratings/root', userId='amy', username='Amy', rating=10)
+        return rows
+    monkeypatch.setattr(lambda_function, 'query_by_type', racing)
+
+    games = _summary()
+    assert games['root']['totalRatings'] == 2 and games['root']['averageRating'] == 6.0
+
+
+def test_a_failed_refresh_still_saves_the_write(fake, monkeypatch):
+    update_item = fake.update_item
+
+    def flaky(Key, **kw):
+        if Key['pk'] == 'CATALOG':
+            raise RuntimeError('throttled')
+        return update_item(Key, **kw)
+    monkeypatch.setattr(fake, 'update_item', flaky)
+
+    _post('/comments/catan', userId='amy', username='Amy', comment='once')
+    _post('/ratings/catan', userId='amy', username='Amy', rating=8)
+    status, body = _call('GET', '/comments/catan')
+    assert [c['comment'] for c in body['comments']] == ['once']
+
+    monkeypatch.setattr(fake, 'update_item', update_item)
+    _post('/comments/catan', userId='bo', username='Bo', comment='twice')
+    games = _summary()
+    assert games['catan']['totalComments'] == 2 and games['catan']['totalRatings'] == 1
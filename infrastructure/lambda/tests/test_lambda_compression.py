@@ -0,0 +1,68 @@
+"""Large JSON responses are gzip/deflate-compressed for clients that accept it,
+base64-encoded with isBase64Encoded; small ones and refusing clients get plain
+JSON."""
+import base64
+import gzip
+import json
+import zlib
+
+import pytest
+
+import lambda_function
+from tests.test_lambda_bulk import NoScanTable
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    table = NoScanTable()
+    monkeypatch.setattr(lambda_function, 'table', table)
+    for i in range(40):
+        table.put_item(Item={'pk': 'GAME#catan', 'sk': f'COMMENT#{i:03d}', 'type': 'comment',
+                             'gameId': 'catan', 'userId': f'user-{i}', 'username': f'U{i}',
+                             'comment': 'a fine evening of trading sheep ' * 3,
+                             'timestamp': f'2026-01-01T00:00:{i:02d}'})
+    return table
+
+
+def _get(path, accept=None):
+    event = {'requestContext': {'http': {'method': 'GET', 'path': path}},
+             'headers': {'accept-encoding': accept} if accept is not None else {}}
+    return lambda_function.lambda_handler(event, None)
+
+
+def _decoded(resp):
+    if not resp.get('isBase64Encoded'):
+        return resp['body']
+    packed = base64.b64decode(resp['body'])
+    coding = resp['headers']['Content-Encoding']
+    return (gzip.decompress(packed) if coding == 'gzip' else zlib.decompress(packed)).decode()
+
+
+def test_large_body_is_gzipped_for_a_gzip_client(fake):
+    plain = _get('/comments/catan')
+    packed = _get('/comments/catan', 'br, gzip, deflate')
+    assert 'isBase64Encoded' not in plain
+    assert packed['isBase64Encoded'] is True
+    assert packed['headers']['Content-Encoding'] == 'gzip'
+    assert packed['headers']['Vary'] == 'Accept-Encoding'
+    assert packed['headers']['Access-Control-Allow-Origin'] == '*'
+    assert json.loads(_decoded(packed)) == json.loads(plain['body'])
+    assert len(packed['body']) < len(plain['body']) / 3
+
+
+def test_deflate_when_gzip_is_refused(fake):
+    resp = _get('/comments/catan', 'gzip;q=0, deflate')
+    assert resp['headers']['Content-Encoding'] == 'deflate'
+    assert len(json.loads(_decoded(resp))['comments']) == 40
+
+
+@pytest.mark.parametrize('accept', [None, '', 'identity', 'br'])
+def test_no_acceptable_coding_means_plain_json(fake, accept):
+    resp = _get('/comments/catan', accept)
+    assert 'Content-Encoding' not in resp['headers']
+    assert len(json.loads(resp['body'])['comments']) == 40
+
+
+def test_small_bodies_are_left_alone(fake):
+    resp = _get('/ratings/catan', 'gzip')
+    assert 'isBase64Encoded' not in resp and json.loads(resp['body'])
@@ -0,0 +1,73 @@
+"""GET /game/map is serialized once per night and carries an ETag; a client
+revalidating with If-None-Match gets a 304 off a single META read."""
+import json
+
+import pytest
+
+import lambda_function
+import undercity_data as data
+import undercity_db as db
+from test_undercity_db import act
+from test_undercity_state_snapshot import CountingTable
+
+
+@pytest.fixture
+def table(monkeypatch):
+    monkeypatch.setattr(db, '_map_body_cache', {})
+    monkeypatch.setattr(db, '_season_map_cache', {})
+    table = CountingTable()
+    monkeypatch.setattr(lambda_function, 'table', table)
+    act(table, 'season-start', hostKey='swampking')
+    return table
+
+
+def _get_map(etag=None, query=None):
+    event = {'requestContext': {'http': {'method': 'GET', 'path': '/game/map'}},
+             'queryStringParameters': query or {},
+             'headers': {'if-none-match': etag} if etag else {}}
+    return lambda_function.lambda_handler(event, None)
+
+
+def test_map_carries_an_etag_and_the_same_board(table):
+    resp = _get_map()
+    assert resp['statusCode'] == 200 and resp['headers']['ETag'].startswith('"')
+    assert json.loads(resp['body']) == db._clean(db.handle_map(table, {})[1])
+
+
+def test_matching_etag_is_a_304_off_one_read(table):
+    etag = _get_map()['headers']['ETag']
+    table.reads.clear()
+    for header in (etag, f'W/{etag}', f'"stale", {etag}', '*'):
+        resp = _get_map(header)
+        assert resp['statusCode'] == 304 and resp['body'] == ''
+        assert resp['headers']['ETag'] == etag
+    assert table.reads == [('get', 'CURRENT')] * 4
+
+
+def test_stale_etag_gets_the_body(table):
+    resp = _get_map('"not-this-board"')
+    assert resp['statusCode'] == 200 and json.loads(resp['body'])['nodes']
+
+
+def test_body_is_built_once_per_night(table, monkeypatch):
+    first = _get_map()
+    monkeypatch.setattr(db, '_season_map', lambda *a: pytest.fail('map rebuilt'))
+    assert _get_map()['body'] == first['body']
+
+
+def test_a_different_board_gets_a_different_etag(table, monkeypatch):
+    monkeypatch.setattr(data, 'PROCEDURAL_DUNGEONS', True)
+    sid = db._active_season(table)[0]
+    etag = _get_map()['headers']['ETag']
+
+    db._map_body_cache.clear()
+    db._season_map_cache.clear()
+    stub = [{'id': 'city_lb', 'type': 'ladder', 'x': 7, 'y': 7,
+             'region': 'depths', 'neighbors': []}]
+    table.put_item(Item={'pk': db._season_pk(sid), 'sk': 'MAP', 'depths': stub})
+    assert _get_map(etag)['statusCode'] == 200
+
+
+def test_sample_previews_bypass_the_cache(table):
+    resp = _get_map(query={'sample': 'seed-1'})
+    assert resp['statusCode'] == 200 and 'ETag' not in resp['headers']
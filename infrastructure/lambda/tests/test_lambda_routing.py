@@ -1,5 +1,6 @@
 """End-to-end routing test: Function-URL event → lambda_handler → game module."""
 import json
+import subprocess
 import sys
 from pathlib import Path
 
@@ -99,3 +100,22 @@ def test_queue_endpoints_through_handler(monkeypatch):
 
     status, body = _call('GET', '/queue/nope')
     assert status == 404
+
+
+def test_catalog_routes_never_import_the_game_modules():
+    """A cold container serving /comments or /ratings skips the Undercity import."""
+    probe = (
+        'import sys, lambda_function\n'
+        'class T:\n'
+        '    def query(self, **kw): return {"Items": []}\n'
+        '    def get_item(self, **kw): return {}\n'
+        'lambda_function.table = T()\n'
+        'for path in ("/comments/catan", "/ratings/catan", "/all-comments"):\n'
+        '    r = lambda_function.lambda_handler(\n'
+        '        {"requestContext": {"http": {"method": "GET", "path": path}}}, None)\n'
+        '    assert r["statusCode"] == 200, r\n'
+        'print(sorted(m for m in sys.modules if m.endswith("_db") or m.startswith("undercity")))\n'
+    )
+    out = subprocess.run([sys.executable, '-c', probe], cwd=Path(lambda_function.__file__).parent,
+                         capture_output=True, text=True, check=True).stdout
+    assert out.strip().splitlines()[-1] == '[]'
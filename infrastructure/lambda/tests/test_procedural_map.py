@@ -148,6 +148,29 @@ def test_handle_map_sample_is_deterministic_per_seed(table):
     assert c != a                                            # different seed → different night
 
 
+def test_sample_depths_are_an_lru_per_seed(table, monkeypatch):
+    monkeypatch.setattr(db, '_sample_depths_cache', db.OrderedDict())
+    monkeypatch.setattr(db, 'SAMPLE_CACHE_SIZE', 2)
+    calls = []
+    real = db.mapgen.generate_all_depths
+    monkeypatch.setattr(db.mapgen, 'generate_all_depths',
+                        lambda seed: calls.append(seed) or real(seed))
+    for seed in ('a', 'b', 'a', 'c', 'a', 'b'):
+        db.handle_map(table, {'sample': seed})
+    # 'a' stays warm as the most recently used; 'b' was evicted by 'c'.
+    assert calls == ['a', 'b', 'c', 'b']
+
+
+def test_batch_samples_match_the_single_previews(table):
+    status, body = db.handle_map(table, {'samples': 'seed-x,seed-y'})
+    assert status == 200 and [s['seed'] for s in body['samples']] == ['seed-x', 'seed-y']
+    for sample in body['samples']:
+        _, doc = db.handle_map(table, {'sample': sample['seed']})
+        assert sample['depths'] == [n for n in doc['nodes'] if n.get('region') == 'depths']
+    too_many = ','.join(f's{i}' for i in range(db.MAX_SAMPLE_BATCH + 1))
+    assert db.handle_map(table, {'samples': too_many})[0] == 400
+
+
 def test_handle_map_without_sample_still_works(table):
     status, doc = db.handle_map(table, {})
     assert status == 200
@@ -427,3 +427,14 @@ def test_second_close_is_404_and_no_double_grant():
                                      'payload': {'gameId': 'catan', 'hadWinner': False}})
     assert status == 404
     assert ucdb._get_player(t, _sid(t), 'user-alex')['rolls'] == rolls_after
+
+
+def test_state_lists_every_page_of_entries():
+    t = FakeTable(page_size=2)
+    start_night(t)
+    for game in ('catan', 'azul', 'root', 'wingspan', 'brass'):
+        q.handle_action(t, {'type': 'join', 'userId': 'user-alex', 'username': 'Alex',
+                             'payload': {'gameId': game, 'gameTitle': game.title()}})
+    status, body = q.handle_state(t, {})
+    assert status == 200
+    assert {e['gameId'] for e in body['entries']} == {'catan', 'azul', 'root', 'wingspan', 'brass'}
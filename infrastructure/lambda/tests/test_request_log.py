@@ -0,0 +1,98 @@
+"""Structured request logging: lines are built only when emitted, polling
+routes are sampled, secrets never reach the logs, and every request ends in
+one compact summary line."""
+import json
+
+import pytest
+
+import lambda_function
+import request_log as log
+from tests.test_lambda_bulk import NoScanTable, _call
+
+
+@pytest.fixture(autouse=True)
+def _fresh(monkeypatch):
+    monkeypatch.setattr(log, 'LOG_LEVEL', log.LEVELS['info'])
+    monkeypatch.setattr(log, 'LOG_SAMPLE', dict(log.DEFAULT_SAMPLE))
+    monkeypatch.setattr(log, '_request', None)
+
+
+def _lines(capsys):
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def _event(method, path, body=None):
+    return {'requestContext': {'http': {'method': method, 'path': path}},
+            'body': body or ''}
+
+
+def test_filtered_lines_are_never_built(capsys):
+    built = []
+    log.debug('event', event=lambda: built.append(1))
+    assert built == [] and capsys.readouterr().out == ''
+
+    log.info('hello', n=lambda: 7)
+    assert _lines(capsys) == [{'level': 'info', 'msg': 'hello', 'n': 7}]
+
+
+def test_routes_fold_ids_and_keep_game_subroutes():
+    assert log.route_of(_event('GET', '/comments/catan')) == 'GET /comments'
+    assert log.route_of(_event('GET', '/game/state')) == 'GET /game/state'
+    assert log.route_of(_event('POST', '/queue/push/subscribe')) == 'POST /queue/push'
+    assert log.route_of({'task': 'roll-refill-sweep'}) == 'TASK roll-refill-sweep'
+
+
+def test_sampled_out_requests_still_log_errors(monkeypatch, capsys):
+    monkeypatch.setattr(log.random, 'random', lambda: 0.5)
+    log.begin(_event('GET', '/game/state'))
+    log.info('detail')
+    log.finish(200)
+    assert capsys.readouterr().out == ''
+
+    log.begin(_event('GET', '/game/state'))
+    log.error('boom')
+    log.finish(500)
+    assert [(l['level'], l['msg']) for l in _lines(capsys)] == [('error', 'boom'),
+                                                                  ('error', 'request')]
+
+
+def test_secrets_are_redacted_and_bodies_truncated(monkeypatch):
+    monkeypatch.setattr(log, 'LOG_BODY_MAX', 40)
+    body = json.dumps({'type': 'season-start', 'payload': {'hostKey': 'swampking'},
+                       'text': 'x' * 100})
+    event = dict(_event('POST', '/game/action', body),
+                 headers={'Authorization': 'Bearer t'})
+    logged = log.loggable_event(event)
+    assert logged['headers'] == {'authorization': '***'}
+    assert 'swampking' not in logged['body']
+    masked = json.dumps({'type': 'season-start', 'payload': {'hostKey': '***'},
+                         'text': 'x' * 100}, separators=(',', ':'))
+    assert logged['body'] == f'{masked[:40]}…(+{len(masked) - 40})'
+
+
+def test_summary_counts_dynamodb_calls(capsys):
+    class Events:
+        def register(self, name, handler):
+            self.handler = handler
+
+    class Client:
+        meta = type('Meta', (), {'events': Events()})()
+
+    client = Client()
+    log.track(client)
+    log.begin(_event('GET', '/ratings/catan'))
+    client.meta.events.handler()
+    client.meta.events.handler()
+    log.finish(200)
+    (line,) = _lines(capsys)
+    assert line['msg'] == 'request' and line['route'] == 'GET /ratings'
+    assert line['status'] == 200 and line['ddb'] == 2 and line['ms'] >= 0
+
+
+def test_handler_writes_one_compact_summary_and_no_event_dump(monkeypatch, capsys):
+    monkeypatch.setattr(lambda_function, 'table', NoScanTable())
+    status, _ = _call('GET', '/comments/catan')
+    assert status == 200
+    out = capsys.readouterr().out
+    assert out.count('\n') == 1 and '  ' not in out
+    assert json.loads(out)['route'] == 'GET /comments'
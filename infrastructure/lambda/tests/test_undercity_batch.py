@@ -0,0 +1,113 @@
+"""{type: 'batch'}: a turn's actions applied to one loaded doc — per-step
+results, one ver-guarded player write, and a stop at the first error, at a
+decision the next step doesn't answer, or after a step that wrote shared rows."""
+import random
+
+import pytest
+
+import undercity_data as data
+import undercity_db as db
+from test_undercity_db import act
+from test_undercity_unit_of_work import WriteLog
+
+
+@pytest.fixture(autouse=True)
+def _fixed(monkeypatch):
+    monkeypatch.setattr(data, 'DEBUG', True)      # free rolls, picked faces
+    monkeypatch.setattr(db, '_now', lambda: '2026-01-01T20:00:00')
+
+
+def _night():
+    random.seed(7)
+    db._rng.seed(7)
+    table = WriteLog()
+    act(table, 'season-start', hostKey='swampking')
+    act(table, 'join', starter='saproling', home='cavern')
+    return table
+
+
+def _player(table):
+    sid = db._active_season(table)[0]
+    return table.items[(db._season_pk(sid), 'PLAYER#user-alex')]
+
+
+def _batch(table, *steps):
+    return act(table, 'batch', actions=[{'type': t, 'payload': p} for t, p in steps])
+
+
+def _destination():
+    """Where a picked 1 can take Alex from home (same night, played singly)."""
+    table = _night()
+    return act(table, 'roll', value=1)[1]['roll']['destinations'][0]
+
+
+def test_a_turn_is_one_player_write_and_matches_single_actions():
+    dest = _destination()
+    single = _night()
+    act(single, 'roll', value=1)
+    act(single, 'move', to=dest)
+
+    batched = _night()
+    batched.writes.clear()
+    status, resp = _batch(batched, ('roll', {'value': 1}), ('move', {'to': dest}))
+    assert status == 200 and resp['stopped'] is None
+    assert [s['type'] for s in resp['steps']] == ['roll', 'move']
+    assert resp['steps'][0]['roll']['value'] == 1 and 'you' not in resp['steps'][0]
+    assert resp['you']['position'] == _player(batched)['position']
+    assert [w[1] for w in batched.writes if w[1].startswith('PLAYER#')] == ['PLAYER#user-alex']
+
+    a, b = _player(single), _player(batched)
+    assert b['ver'] == a['ver'] - 1             # one save, not two
+    ignore = {'ver'}
+    assert {k: v for k, v in a.items() if k not in ignore} == \
+           {k: v for k, v in b.items() if k not in ignore}
+
+
+def test_an_error_stops_the_batch_and_keeps_earlier_steps():
+    table = _night()
+    status, resp = _batch(table, ('roll', {'value': 2}), ('move', {'to': 'nowhere'}),
+                          ('chat', {'text': 'never sent'}))
+    assert status == 200 and resp['stopped'] == 'error'
+    assert [(s['type'], s['status']) for s in resp['steps']] == [('roll', 200), ('move', 409)]
+    assert _player(table)['pendingMove']['value'] == 2      # the roll was saved
+    assert not any(sk.startswith('CHAT#') for _, sk in table.items)
+
+
+def test_an_open_decision_stops_before_an_unrelated_step():
+    table = _night()
+    status, resp = _batch(table, ('roll', {'value': 3}), ('chat', {'text': 'hi'}))
+    assert status == 200 and resp['stopped'] == 'decision'
+    assert [s['type'] for s in resp['steps']] == ['roll']
+    assert resp['you']['pendingMove']['value'] == 3
+
+
+def test_a_shared_write_ends_the_batch_behind_a_save():
+    table = _night()
+    table.writes.clear()
+    status, resp = _batch(table, ('chat', {'text': 'first'}), ('chat', {'text': 'second'}))
+    assert status == 200 and resp['stopped'] == 'shared'
+    assert [s['type'] for s in resp['steps']] == ['chat']
+    chats = [row['text'] for (_, sk), row in table.items.items() if sk.startswith('CHAT#')]
+    assert chats == ['first']
+
+    status, resp = _batch(table, ('roll', {'value': 1}), ('chat', {'text': 'last'}))
+    assert resp['stopped'] == 'decision'
+    status, resp = _batch(table, ('chat', {'text': 'only'}))
+    assert status == 200 and resp['stopped'] is None
+
+
+def test_a_failing_first_step_is_just_that_error():
+    table = _night()
+    table.writes.clear()
+    status, resp = _batch(table, ('move', {'to': 'cavern_r1'}), ('roll', {}))
+    assert status == 409 and resp['error'] == 'Roll first.'
+    assert table.writes == []
+
+
+def test_batches_are_bounded_and_do_not_nest():
+    table = _night()
+    assert act(table, 'batch', actions=[])[0] == 400
+    too_many = [{'type': 'chat', 'payload': {'text': 'x'}}] * (db.MAX_BATCH_STEPS + 1)
+    assert act(table, 'batch', actions=too_many)[0] == 400
+    status, resp = _batch(table, ('batch', {}))
+    assert status == 400 and 'nest' in resp['error']
@@ -0,0 +1,125 @@
+"""The live battle record lives in its own BATTLE#{uid} item with its own ver
+guard: a combat round writes that small item, and the player doc is touched only
+when the fight starts and when it ends."""
+from datetime import datetime, timedelta
+
+import undercity_data as data
+import undercity_db as db
+import undercity_engine as engine
+from test_undercity_db import FakeTable, _FODDER, _sid, act
+
+
+class WriteLog(FakeTable):
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+
+    def put_item(self, Item, **kw):
+        self.writes.append(Item['sk'])
+        return super().put_item(Item, **kw)
+
+    def update_item(self, Key, **kw):
+        self.writes.append(Key['sk'])
+        return super().update_item(Key, **kw)
+
+    def delete_item(self, Key, **kw):
+        self.writes.append(('delete', Key['sk']))
+        return super().delete_item(Key, **kw)
+
+
+def _iso_min_ago(minutes):
+    return (datetime.utcnow() - timedelta(minutes=minutes)).strftime(engine._ISO)
+
+
+def _in_a_fight():
+    table = WriteLog()
+    act(table, 'season-start', hostKey='swampking')
+    act(table, 'join', starter='pest')
+    sid = _sid(table)
+    doc = db._get_player(table, sid, 'user-alex')
+    db._start_battle(table, sid, doc, 'wild', dict(_FODDER, hp=500, maxHp=500),
+                     node=doc.get('position'))
+    doc['lastActionAt'] = db._now()
+    assert db._put_player(table, doc)
+    table.writes.clear()
+    return table, sid
+
+
+def test_round_writes_only_the_battle_item():
+    table, sid = _in_a_fight()
+    pk = db._season_pk(sid)
+    before = dict(table.items[(pk, 'PLAYER#user-alex')])
+
+    status, resp = act(table, 'combat-round', stance='guard')
+    assert status == 200 and 'combat' in resp, resp
+    assert table.writes == ['BATTLE#user-alex']
+    assert table.items[(pk, 'PLAYER#user-alex')] == before
+    assert table.items[(pk, 'BATTLE#user-alex')]['battle']['round'] == 2
+    assert db._get_player(table, sid, 'user-alex')['battle']['round'] == 2
+
+
+def test_a_long_fight_keeps_the_idle_stamp_current(monkeypatch):
+    table, sid = _in_a_fight()
+    pk = db._season_pk(sid)
+    row = table.items[(pk, 'PLAYER#user-alex')]
+    row.update(lastActionAt=_iso_min_ago(60), rolls=data.ROLL_NUDGE_THRESHOLD,
+               rollRegenAt=_iso_min_ago(60), rollNudged=False)
+
+    status, resp = act(table, 'combat-round', stance='guard')
+    assert status == 200 and 'combat' in resp, resp
+    assert 'PLAYER#user-alex' in table.writes
+    pushes = []
+    monkeypatch.setattr(db, '_push_user', lambda t, uid, body: pushes.append(uid))
+    db.sweep_roll_refills(table)
+    assert pushes == []
+
+    table.writes.clear()    # the stamp is fresh again: the next round skips it
+    status, resp = act(table, 'combat-round', stance='guard')
+    assert status == 200 and 'combat' in resp, resp
+    assert table.writes == ['BATTLE#user-alex']
+
+
+def test_finishing_clears_the_item_and_the_flag():
+    table, sid = _in_a_fight()
+    pk = db._season_pk(sid)
+    for _ in range(40):
+        status, resp = act(table, 'combat-round', stance='guard')
+        assert status == 200, resp
+        if 'combat' not in resp:
+            break
+    assert (pk, 'BATTLE#user-alex') not in table.items
+    assert 'battle' not in table.items[(pk, 'PLAYER#user-alex')]
+    assert ('delete', 'BATTLE#user-alex') in table.writes
+
+
+def test_stale_battle_write_conflicts():
+    table, sid = _in_a_fight()
+    doc = db._get_player(table, sid, 'user-alex')
+    table.items[(db._season_pk(sid), 'BATTLE#user-alex')]['ver'] += 1
+    doc['battle']['round'] = 9
+    assert db._put_player(table, doc) is False
+
+
+def test_a_stale_player_doc_leaves_the_battle_item_alone():
+    table, sid = _in_a_fight()
+    pk = db._season_pk(sid)
+    doc = db._get_player(table, sid, 'user-alex')
+    table.items[(pk, 'PLAYER#user-alex')]['ver'] += 1
+    doc['battle']['round'] = 9
+    doc['spores'] = doc.get('spores', 0) + 5
+    assert db._put_player(table, doc) is False
+    assert table.items[(pk, 'BATTLE#user-alex')]['battle']['round'] == 1
+    assert 'BATTLE#user-alex' not in table.writes
+
+
+def test_legacy_inline_record_moves_out_on_save():
+    table, sid = _in_a_fight()
+    pk = db._season_pk(sid)
+    rec = table.items.pop((pk, 'BATTLE#user-alex'))['battle']
+    table.items[(pk, 'PLAYER#user-alex')]['battle'] = rec     # pre-split row
+
+    status, resp = act(table, 'combat-round', stance='guard')
+    assert status == 200, resp
+    assert table.items[(pk, 'PLAYER#user-alex')].get('battle') in (True, None)
+    if 'combat' in resp:
+        assert table.items[(pk, 'BATTLE#user-alex')]['battle']['round'] == 2
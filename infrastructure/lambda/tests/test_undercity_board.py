@@ -0,0 +1,185 @@
+"""The compiled movement board: the same answers as walking the node dict,
+built once per season map."""
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import undercity_data as data
+import undercity_db as db
+import undercity_engine as engine
+from tests.test_undercity_db import table, _sid  # reuse harness + fixture
+
+NODES = data.MAP_NODES
+BARRIERS = frozenset(n for n, v in NODES.items() if v.get('type') == 'barrier')
+TUNNELS = frozenset(n for n, v in NODES.items() if v.get('type') == 'tunnel')
+
+
+def _walk(nodes, start, steps, closed, blocked):
+    """Reference exact-count walk straight over the dict (the pre-Board one)."""
+    results, stack, seen = set(), [(start, None, steps)], set()
+    while stack:
+        node, prev, remaining = stack.pop()
+        if remaining == 0 or (node in closed and node != start):
+            results.add(node)
+            continue
+        if (node, prev, remaining) in seen:
+            continue
+        seen.add((node, prev, remaining))
+        stack.extend((nb, node, remaining - 1) for nb in nodes[node]['neighbors']
+                     if nb != prev and nb not in blocked)
+    return results
+
+
+def _bfs(nodes, start, goal, closed, blocked):
+    return _dists(nodes, start, closed, blocked).get(goal)
+
+
+def _dists(nodes, start, closed, blocked):
+    dist, queue = {start: 0}, [start]
+    for cur in queue:
+        if cur != start and cur in closed:
+            continue
+        for nb in nodes[cur]['neighbors']:
+            if nb not in dist and nb not in blocked:
+                dist[nb] = dist[cur] + 1
+                queue.append(nb)
+    return dist
+
+
+def test_legal_destinations_match_the_dict_walk():
+    board = engine.Board(NODES)
+    for start in NODES:
+        for steps in range(1, 7):
+            for closed, blocked in ((frozenset(), frozenset()), (BARRIERS, TUNNELS)):
+                assert engine.legal_destinations(board, start, steps, closed, blocked) \
+                    == _walk(NODES, start, steps, closed, blocked), (start, steps)
+
+
+def test_board_distance_matches_bfs():
+    board = engine.Board(NODES)
+    rng = random.Random(3)
+    ids = sorted(NODES)
+    for _ in range(400):
+        a, b = rng.choice(ids), rng.choice(ids)
+        want = _bfs(NODES, a, b, BARRIERS, TUNNELS)
+        got = engine.board_distance(board, a, b, 99, BARRIERS, TUNNELS)
+        assert got == want, (a, b)
+        assert engine.board_distance(NODES, a, b, 99, BARRIERS, TUNNELS) == want
+
+
+def test_walk_validation_accepts_board_or_dict():
+    board = engine.Board(NODES)
+    start = next(iter(NODES))
+    for steps in (1, 2, 3):
+        for dest in _walk(NODES, start, steps, frozenset(), frozenset()):
+            path = _path(NODES, start, dest, steps)
+            assert engine.validate_walk(board, path, [steps])
+            assert engine.validate_walk(NODES, path, [steps])
+    nb = NODES[start]['neighbors'][0]
+    assert not engine.validate_walk(board, [start, nb, start], [2])        # backtrack
+    assert engine.validate_free_walk(board, [start, nb, start])
+    assert not engine.validate_free_walk(board, [start, nb], blocked=frozenset({nb}))
+
+
+def _path(nodes, start, dest, steps, prev=None):
+    if steps == 0:
+        return [start] if start == dest else None
+    for nb in nodes[start]['neighbors']:
+        if nb != prev:
+            rest = _path(nodes, nb, dest, steps - 1, start)
+            if rest:
+                return [start] + rest
+    return None
+
+
+def test_dangling_neighbour_is_a_landing_not_a_corridor():
+    nodes = {'a': {'neighbors': ['b']}, 'b': {'neighbors': ['a', 'ghost']}}
+    board = engine.Board(nodes)
+    assert engine.legal_destinations(board, 'a', 2) == {'ghost'}
+    assert engine.legal_destinations(board, 'a', 3) == set()
+    assert 'ghost' not in board
+    assert board.offsets.tolist() == [0, 1, 3, 3]
+
+
+def test_closed_sets_are_interned_once_per_set():
+    board = engine.Board(NODES)
+    assert board.intern(BARRIERS) is board.intern(frozenset(BARRIERS))
+    assert board.intern({'nowhere'}) == frozenset()
+
+
+def test_season_board_is_cached_and_follows_the_map(table, monkeypatch):
+    monkeypatch.setattr(data, 'PROCEDURAL_DUNGEONS', True)
+    db._season_map_cache.clear()
+    sid = _sid(table)
+    board = db._season_board(table, sid)
+    assert db._season_board(table, sid) is board
+    assert board.nodes is db._season_map(table, sid)
+
+    db._season_map_cache.clear()               # a new map object for the night
+    rebuilt = db._season_board(table, sid)
+    assert rebuilt is not board and rebuilt.nodes is db._season_map(table, sid)
+
+
+def test_hop_matrix_matches_bfs_for_every_pair():
+    board = engine.Board(NODES)
+    for closed, blocked in ((frozenset(), frozenset()), (BARRIERS, TUNNELS)):
+        hops = board.hops(closed, blocked)
+        for a in NODES:
+            assert hops.from_node(a) == _dists(NODES, a, closed, blocked), a
+        assert all(hops.filled[:len(NODES)])
+
+
+def test_hop_rows_fill_on_first_use_and_overlays_are_kept():
+    board = engine.Board(NODES)
+    start = next(iter(NODES))
+    hops = board.hops(BARRIERS)
+    assert not any(hops.filled)
+    assert hops.row(board.index[start])[board.index[start]] == 0
+    assert sum(hops.filled) == 1
+    assert board.hops(frozenset(BARRIERS)) is hops
+    for i in range(engine.HOP_OVERLAYS):
+        board.hops(blocked=frozenset([f'nowhere{i}', *list(NODES)[:i + 1]]))
+    assert board.hops(BARRIERS) is not hops                # oldest overlay dropped
+
+
+def test_unreachable_and_range_via_board_distance():
+    nodes = {'a': {'neighbors': ['b']}, 'b': {'neighbors': ['a']},
+             'c': {'neighbors': []}}
+    board = engine.Board(nodes)
+    assert board.hops().row(board.index['a'])[board.index['c']] == engine.UNREACHABLE
+    assert engine.board_distance(board, 'a', 'c', 9) is None
+    assert engine.board_distance(board, 'a', 'b', 0) is None
+    assert engine.board_distance(board, 'a', 'b', 1) == 1
+    assert engine.board_distance(board, 'a', 'zzz', 9) is None
+    assert engine.board_distance(board, 'zzz', 'a', 9) is None
+    assert board.hops().distance('zzz', 'a') is None
+
+
+def test_every_face_from_one_walk_matches_single_rolls():
+    board = engine.Board(NODES)
+    for start in list(NODES)[::7]:
+        by_face = engine.destinations_by_face(board, start, BARRIERS, TUNNELS)
+        assert len(by_face) == engine.DIE_FACES + 1 and by_face[0] == {start}
+        for steps in range(1, engine.DIE_FACES + 1):
+            assert by_face[steps] == _walk(NODES, start, steps, BARRIERS, TUNNELS)
+        assert engine.destinations_by_face(NODES, start, BARRIERS, TUNNELS, 3) == by_face[:4]
+
+
+def test_destinations_are_an_lru_per_start_and_overlay(monkeypatch):
+    monkeypatch.setattr(engine, 'DEST_CACHE_SIZE', 2)
+    board = engine.Board(NODES)
+    a, b, c = list(NODES)[:3]
+    first = engine.destinations_by_face(board, a, BARRIERS)
+    assert engine.destinations_by_face(board, a, frozenset(BARRIERS)) is first
+    assert engine.destinations_by_face(board, a) is not first      # other overlay
+    engine.destinations_by_face(board, a, BARRIERS)                 # refresh a
+    engine.destinations_by_face(board, b)
+    engine.destinations_by_face(board, c)
+    assert len(board._dests) == 2
+    assert engine.destinations_by_face(board, a, BARRIERS) is not first
+
+    longer = engine.destinations_by_face(board, b, faces=9)           # past a d6
+    assert len(longer) == 10 and longer[9] == _walk(NODES, b, 9, frozenset(), frozenset())
+    assert engine.legal_destinations(board, b, 4) == longer[4]
@@ -1,5 +1,6 @@
 """Integration tests for the action dispatcher against an in-memory table."""
 import random
+import re
 import sys
 import time
 from datetime import datetime, timedelta
@@ -44,8 +45,10 @@ class FakeTable:
     def _key(self, item_or_key):
         return (item_or_key['pk'], item_or_key['sk'])
 
-    def put_item(self, Item, ConditionExpression=None, ExpressionAttributeValues=None):
+    def put_item(self, Item, ConditionExpression=None, ExpressionAttributeValues=None,
+                 ReturnValues=None):
         key = self._key(Item)
+        old = self.items.get(key)
         if ConditionExpression == 'attribute_not_exists(pk)' and key in self.items:
             raise ClientError({'Error': {'Code': 'ConditionalCheckFailedException'}}, 'PutItem')
         if ConditionExpression == 'ver = :v':
@@ -54,21 +57,62 @@ class FakeTable:
                 raise ClientError({'Error': {'Code': 'ConditionalCheckFailedException'}}, 'PutItem')
         # Real DynamoDB rejects float; the write path must convert to Decimal.
         self.items[key] = _ddb_copy(Item, reject_float=True)
-        return {}
+        return {'Attributes': _ddb_copy(old)} if ReturnValues == 'ALL_OLD' and old else {}
 
     def get_item(self, Key):
         item = self.items.get(self._key(Key))
         return {'Item': _ddb_copy(item)} if item else {}
 
-    def delete_item(self, Key, ConditionExpression=None):
+    def delete_item(self, Key, ConditionExpression=None, ReturnValues=None):
         key = self._key(Key)
         if ConditionExpression == 'attribute_exists(sk)' and key not in self.items:
             raise ClientError({'Error': {'Code': 'ConditionalCheckFailedException'}}, 'DeleteItem')
-        self.items.pop(key, None)
-        return {}
+        old = self.items.pop(key, None)
+        return {'Attributes': _ddb_copy(old)} if ReturnValues == 'ALL_OLD' and old else {}
+
+    def update_item(self, Key, UpdateExpression, ConditionExpression=None,
+                    ExpressionAttributeNames=None, ExpressionAttributeValues=None,
+                    ReturnValues=None):
+        """Subset db.py uses: `SET a = :x, ...` (or `a = if_not_exists(a, :x)`),
+        `REMOVE a, ...` and `ADD a :n, ...` sections (names may be #placeholders),
+        guarded like put_item by `ver = :v`, returning UPDATED_NEW or ALL_NEW.
+        Pattern-matches the expression like query()."""
+        key = self._key(Key)
+        names = ExpressionAttributeNames or {}
+        vals = ExpressionAttributeValues or {}
+        if ConditionExpression == 'ver = :v':
+            existing = self.items.get(key)
+            if not existing or existing.get('ver') != vals[':v']:
+                raise ClientError({'Error': {'Code': 'ConditionalCheckFailedException'}}, 'UpdateItem')
+        item = _ddb_copy(self.items.get(key) or dict(Key))
+        changed = {}
+        for action, body in re.findall(r'(SET|REMOVE|ADD) (.*?)(?= SET | REMOVE | ADD |$)',
+                                       UpdateExpression):
+            for clause in re.split(r',(?![^()]*\))', body):
+                if action == 'REMOVE':
+                    item.pop(names.get(clause.strip(), clause.strip()), None)
+                    continue
+                keep = re.fullmatch(r'\s*(\S+) = if_not_exists\(\S+, (\S+)\)\s*', clause)
+                attr, ref = keep.groups() if keep else clause.replace('=', ' ').split()
+                attr = names.get(attr, attr)
+                if keep and attr in item:
+                    continue
+                item[attr] = vals[ref] if action == 'SET' else item.get(attr, 0) + vals[ref]
+                changed[attr] = item[attr]
+        self.items[key] = _ddb_copy(item, reject_float=True)
+        if ReturnValues == 'ALL_NEW':
+            return {'Attributes': _ddb_copy(item)}
+        return {'Attributes': _ddb_copy(changed)} if ReturnValues == 'UPDATED_NEW' else {}
+
+    # Global secondary indexes the app queries: name -> (hash attr, range attr).
+    INDEXES = {'type-index': ('type', 'timestamp'), 'user-index': ('userId', 'timestamp')}
 
     def query(self, KeyConditionExpression, ExpressionAttributeValues,
-              ScanIndexForward=True, Limit=None, ExclusiveStartKey=None):
+              ScanIndexForward=True, Limit=None, ProjectionExpression=None,
+              ExpressionAttributeNames=None, ExclusiveStartKey=None, IndexName=None):
+        if IndexName:
+            return self._query_index(IndexName, ExpressionAttributeValues,
+                                     ScanIndexForward, Limit, ExclusiveStartKey)
         pk = ExpressionAttributeValues[':pk']
         sk = ExpressionAttributeValues.get(':sk')
         out = []
@@ -79,24 +123,59 @@ class FakeTable:
                 continue
             if 'sk >= :sk' in KeyConditionExpression and not isk >= sk:
                 continue
+            if 'sk < :sk' in KeyConditionExpression and not isk < sk:
+                continue
+            if 'sk > :sk' in KeyConditionExpression and not isk > sk:
+                continue
+            if 'BETWEEN' in KeyConditionExpression and not (
+                    ExpressionAttributeValues[':lo'] <= isk <= ExpressionAttributeValues[':hi']):
+                continue
             out.append(item)
         out.sort(key=lambda i: i['sk'], reverse=not ScanIndexForward)
+        if ExclusiveStartKey is not None:
+            after = ExclusiveStartKey['sk']
+            out = [i for i in out if (i['sk'] > after if ScanIndexForward
+                                      else i['sk'] < after)]
         if Limit:
             out = out[:Limit]
         # Optional paging, so callers that must follow LastEvaluatedKey can be
         # tested. Real DynamoDB caps a page at 1MB; `page_size` stands in for
         # that. Off by default (0) — one page, exactly as before.
         if self.page_size:
-            if ExclusiveStartKey is not None:
-                after = ExclusiveStartKey['sk']
-                out = [i for i in out if (i['sk'] > after if ScanIndexForward
-                                          else i['sk'] < after)]
             page, rest = out[:self.page_size], out[self.page_size:]
-            res = {'Items': _ddb_copy(page)}
+            res = {'Items': _ddb_copy(self._project(page, ProjectionExpression,
+                                                    ExpressionAttributeNames))}
             if rest and page:
                 res['LastEvaluatedKey'] = {'pk': pk, 'sk': page[-1]['sk']}
             return res
-        return {'Items': _ddb_copy(out)}
+        return {'Items': _ddb_copy(self._project(out, ProjectionExpression,
+                                                 ExpressionAttributeNames))}
+
+    def _query_index(self, name, values, forward, limit, start):
+        """`hash = :v` on a sparse GSI: rows carrying both index keys, in range
+        order, paged like query()."""
+        hk, rk = self.INDEXES[name]
+        (want,) = values.values()
+        order = lambda i: (i[rk], i['pk'], i['sk'])
+        out = sorted((i for i in self.items.values() if i.get(hk) == want and rk in i),
+                     key=order, reverse=not forward)
+        if start is not None:
+            out = [i for i in out if (order(i) > order(start) if forward
+                                      else order(i) < order(start))]
+        page = out[:min(limit or len(out), self.page_size or len(out))]
+        if len(page) < len(out):
+            last = page[-1]
+            return {'Items': _ddb_copy(page),
+                    'LastEvaluatedKey': {k: last[k] for k in ('pk', 'sk', hk, rk)}}
+        return {'Items': _ddb_copy(page)}
+
+    @staticmethod
+    def _project(items, projection, names):
+        """Keep only the projected top-level attributes, like the real thing."""
+        if not projection:
+            return items
+        keep = [(names or {}).get(a.strip(), a.strip()) for a in projection.split(',')]
+        return [{k: i[k] for k in keep if k in i} for i in items]
 
     def scan(self, FilterExpression=None, ExpressionAttributeValues=None):
         """Subset used by the reset-all admin cmd: filter on sk == a literal and
@@ -2692,7 +2771,9 @@ def test_started_battle_persists_without_floats(table):
     doc = db._get_player(table, sid, 'user-alex')
     db._start_battle(table, sid, doc, 'wild', dict(_FODDER, bluff=0.15), node=doc.get('position'))
     assert db._put_player(table, doc) is True   # would raise TypeError pre-fix
-    stored = table.items[(db._season_pk(sid), 'PLAYER#user-alex')]['battle']
+    # The record lives in its own item; the player doc only flags the fight.
+    assert table.items[(db._season_pk(sid), 'PLAYER#user-alex')]['battle'] is True
+    stored = table.items[(db._season_pk(sid), 'BATTLE#user-alex')]['battle']
 
     def has_float(o):
         if isinstance(o, bool):
@@ -517,6 +517,50 @@ def test_cursed_idol_debuff():
     assert effective_stats(p)['atk'] == 5
 
 
+def test_buff_table_applies_mult_to_boons_and_floors_curses_in_order():
+    base = {'atk': 2, 'def': 2, 'spd': 2, 'maxHp': 30, 'gear': {}}
+    doubled = effective_stats({**base, 'buffs': [{'kind': 'warding_dance', 'mult': 2},
+                                                 {'kind': 'sovereign_might', 'mult': 2}]})
+    assert (doubled['def'], doubled['spd']) == (2 + 6, 2 + 6)
+    assert doubled['atk'] == 2 + 2 * data.SOVEREIGN_ATK
+    cursed = effective_stats({**base, 'buffs': [{'kind': 'grave_chill', 'mult': 2}]})
+    assert (cursed['atk'], cursed['def']) == (1, 1)                 # mult ignored, floored
+    # The floor makes order matter: curse-then-boon lands higher.
+    first = effective_stats({**base, 'buffs': [{'kind': 'weaken_hex'}, {'kind': 'rot_surge'}]})
+    last = effective_stats({**base, 'buffs': [{'kind': 'rot_surge'}, {'kind': 'weaken_hex'}]})
+    assert (first['atk'], last['atk']) == (4, 2)
+    chosen = effective_stats({**base, 'buffs': [{'kind': 'mimic', 'stat': 'spd', 'amount': 4},
+                                                {'kind': 'trophy', 'stat': 'maxHp', 'amount': 9}]})
+    assert (chosen['spd'], chosen['maxHp']) == (6, 30)
+
+
+def test_buff_table_covers_every_stat_buff():
+    kinds = {'rot_surge', 'acorn_fury', 'cursed_idol', 'bone_chill', 'grave_chill',
+             'glowveil', 'harden_shell', 'weaken_hex', 'savage_roar', 'iron_hide',
+             'fleetfoot', 'sovereign_might', 'sovereign_ward', 'sovereign_haste',
+             'warding_dance', 'sap_vigor', 'rust_curse', 'high_five',
+             'trophy', 'mimic', 'improvise'}
+    assert kinds == set(engine.BUFF_BOONS) | set(engine.BUFF_CURSES) | engine.BUFF_CHOSEN_STAT
+    assert not set(engine.BUFF_BOONS) & set(engine.BUFF_CURSES)
+
+
+def test_effective_stats_cache_keys_on_stat_inputs_only(monkeypatch):
+    monkeypatch.setattr(engine, '_stats_cache', {})
+    calls = []
+    compute = engine._compute_stats
+    monkeypatch.setattr(engine, '_compute_stats', lambda p: calls.append(1) or compute(p))
+    p = {'atk': 6, 'def': 5, 'spd': 5, 'maxHp': 30, 'gear': {'fang': 'wurm_tooth'},
+         'buffs': [{'kind': 'vines', 'turns': 2}, {'kind': 'rot_surge'}], 'ver': 3}
+    eff = effective_stats(p)
+    eff['atk'] = 0                                    # the caller's copy, not the cache's
+    p['buffs'][0]['turns'], p['ver'], p['hp'] = 1, 4, 12
+    assert effective_stats(p)['atk'] == 6 + 6 + 3 and len(calls) == 1
+    p['buffs'].pop()
+    assert effective_stats(p)['atk'] == 6 + 6 and len(calls) == 2
+    p['gear'] = {}
+    assert effective_stats(p)['atk'] == 6 and len(calls) == 3
+
+
 # ── Renown ───────────────────────────────────────────────────────────────────
 
 def test_renown_table():
@@ -0,0 +1,189 @@
+"""The fan-out writer behind _broadcast_away and the world payout: it reuses the
+roster docs already in hand, saves each recipient as a delta, retries just the
+ones that lost an optimistic-lock race, and reports who got the write."""
+import threading
+
+import boto3
+
+import request_log as log
+import undercity_data as data
+import undercity_db as db
+from test_undercity_db import act
+from test_undercity_state_snapshot import CountingTable
+
+
+class RacyTable(CountingTable):
+    """Once `victim` is set, someone else saves that player just before our
+    next write to them lands."""
+
+    victim = None
+    raced = False
+
+    def _race(self, sk):
+        if self.victim and sk == 'PLAYER#' + self.victim and not self.raced:
+            self.raced = True
+            row = next(v for (pk, s), v in self.items.items() if s == sk)
+            row['ver'] += 1
+
+    def put_item(self, Item, **kw):
+        self._race(Item['sk'])
+        return super().put_item(Item, **kw)
+
+    def update_item(self, Key, **kw):
+        self._race(Key['sk'])
+        return super().update_item(Key, **kw)
+
+
+class WriteLog(CountingTable):
+    """Tallies every write as (call, sk, update expression)."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+
+    def put_item(self, Item, **kw):
+        self.writes.append(('put', Item['sk'], None))
+        return super().put_item(Item, **kw)
+
+    def update_item(self, Key, **kw):
+        self.writes.append(('update', Key['sk'], kw.get('UpdateExpression')))
+        return super().update_item(Key, **kw)
+
+
+class BarrierTable(CountingTable):
+    """Holds every PLAYER# update until `n` of them are in flight at once, so
+    saves that go out one at a time break the barrier."""
+
+    def __init__(self, n):
+        super().__init__()
+        self.barrier = threading.Barrier(n, timeout=2)
+        self.threads = set()
+
+    def update_item(self, Key, **kw):
+        if Key['sk'].startswith('PLAYER#'):
+            self.threads.add(threading.current_thread().name)
+            self.barrier.wait()
+        return super().update_item(Key, **kw)
+
+
+def _night(table):
+    act(table, 'season-start', hostKey='swampking')
+    for uid, name in (('user-alex', 'Alex'), ('user-sam', 'Sam'),
+                      ('user-kit', 'Kit'), ('user-bo', 'Bo')):
+        status, resp = act(table, 'join', user=uid, name=name,
+                           starter='saproling', home='cavern')
+        assert status == 200, resp
+    return db._active_season(table)[0]
+
+
+def _news(table, sid, uid):
+    return [e['kind'] for e in db._get_player(table, sid, uid).get('awayEvents', [])]
+
+
+def test_broadcast_reports_every_recipient_off_one_roster_read():
+    table = CountingTable()
+    sid = _night(table)
+    table.reads.clear()
+
+    report = db._broadcast_away(table, sid, {'kind': 'note', 'at': db._now()},
+                                'user-alex', skip_user_ids={'user-bo'})
+    assert report == {'user-sam': (True, None), 'user-kit': (True, None)}
+    assert table.reads == [('query', 'PLAYER#')]
+    assert 'note' in _news(table, sid, 'user-kit')
+    assert 'note' not in _news(table, sid, 'user-bo')
+
+
+def test_roster_recipients_are_saved_as_deltas():
+    table = WriteLog()
+    sid = _night(table)
+    table.writes.clear()
+
+    with db._unit_of_work(table):
+        db._broadcast_away(table, sid, {'kind': 'note', 'at': db._now()}, 'user-alex')
+    assert sorted(w[1] for w in table.writes) == ['PLAYER#user-bo', 'PLAYER#user-kit',
+                                                  'PLAYER#user-sam']
+    assert all(call == 'update' and '#a' in expr and 'REMOVE' not in expr
+               for call, _, expr in table.writes)
+    assert 'note' in _news(table, sid, 'user-bo')
+
+
+def test_recipient_saves_overlap():
+    table = BarrierTable(3)
+    sid = _night(table)             # joins put their rows: the barrier is untouched
+    log.begin({'requestContext': {'http': {'method': 'POST', 'path': '/game/action'}}})
+
+    with db._unit_of_work(table):
+        report = db._broadcast_away(table, sid, {'kind': 'note', 'at': db._now()},
+                                    'user-alex')
+    assert all(ok for ok, _ in report.values()) and len(report) == 3
+    assert len(table.threads) == 3 and threading.current_thread().name not in table.threads
+    assert log._request['ddb'] == 3
+    log.finish(200)
+    assert 'note' in _news(table, sid, 'user-bo')
+
+
+def test_each_worker_gets_its_own_table_resource():
+    shared = boto3.resource('dynamodb', region_name='us-east-1').Table('games')
+    mine = db._worker_table(shared)
+    assert mine is not shared and mine.name == 'games'
+    assert db._worker_table(shared) is mine
+    other = []
+    worker = threading.Thread(target=lambda: other.append(db._worker_table(shared)))
+    worker.start()
+    worker.join()
+    assert other[0] is not mine
+    fake = CountingTable()
+    assert db._worker_table(fake) is fake
+
+
+def test_a_lost_race_is_reread_and_retried():
+    table = RacyTable()
+    sid = _night(table)
+    table.victim = 'user-kit'
+    report = db._broadcast_away(table, sid, {'kind': 'note', 'at': db._now()})
+    assert table.raced
+    assert all(ok for ok, _ in report.values()) and len(report) == 4
+    assert _news(table, sid, 'user-kit').count('note') == 1
+
+
+def test_a_departed_recipient_is_reported_unsaved():
+    table = CountingTable()
+    sid = _night(table)
+    report = db._fan_out(table, sid, {'user-sam': None, 'user-ghost': None},
+                         lambda p: p.setdefault('awayEvents', []).append({'kind': 'x'}))
+    assert report['user-sam'][0] is True
+    assert report['user-ghost'] == (False, None)
+
+
+def test_broadcast_leaves_a_live_battle_alone():
+    table = CountingTable()
+    sid = _night(table)
+    pk = db._season_pk(sid)
+    rec = {'kind': 'test', 'round': 3}
+    table.put_item(Item={'pk': pk, 'sk': 'BATTLE#user-sam', 'ver': 1, 'battle': rec})
+    table.items[(pk, 'PLAYER#user-sam')]['battle'] = True
+
+    db._broadcast_away(table, sid, {'kind': 'note', 'at': db._now()}, 'user-alex')
+    assert table.items[(pk, 'BATTLE#user-sam')]['battle'] == rec
+    assert table.items[(pk, 'PLAYER#user-sam')]['battle'] is True
+
+
+def test_world_payout_pays_through_a_race():
+    table = RacyTable()
+    sid = _night(table)
+    table.victim = 'user-kit'
+    before = db._get_player(table, sid, 'user-kit')['spores']
+    db._set_world_event(table, sid, {
+        'spawned': True, 'node': 'x', 'nodes': ['a', 'x', 'b'],
+        'endsAt': db._iso_in_minutes(60), 'dead': False,
+        'dmg': {'user-alex': 200, 'user-sam': 80, 'user-kit': 80}})
+
+    killer = db._get_player(table, sid, 'user-alex')
+    results = db._world_event_payout(table, sid, killer)
+
+    assert table.raced
+    assert {r['userId'] for r in results} == {'user-alex', 'user-sam', 'user-kit'}
+    kit = db._get_player(table, sid, 'user-kit')
+    assert kit['spores'] == before + data.WORLD_EVENT_REWARDS['minor']['spores']
+    assert _news(table, sid, 'user-kit').count('world_kill') == 1
+    assert 'world_fallen' in _news(table, sid, 'user-bo')
@@ -0,0 +1,89 @@
+"""The OCCUPANCY index: who stands on a node comes off one packed row that
+_put_player keeps current, never off the season roster."""
+import undercity_db as db
+from test_undercity_db import act
+from test_undercity_state_snapshot import CountingTable
+from test_undercity_unit_of_work import WriteLog
+
+
+def _night(table):
+    act(table, 'season-start', hostKey='swampking')
+    act(table, 'join', starter='saproling', home='cavern')
+    act(table, 'join', user='user-sam', name='Sam', starter='pest', home='bone')
+    return db._active_season(table)[0]
+
+
+def _teleport(table, target, node):
+    status, resp = act(table, 'admin', hostKey='swampking', cmd='teleport',
+                       target=target, node=node)
+    assert status == 200, resp
+
+
+def test_occupants_follow_moves_without_reading_the_roster():
+    table = CountingTable()
+    sid = _night(table)
+    here = db._get_player(table, sid, 'user-alex')['position']
+    assert db._occupants(table, sid, here, 'user-alex') == []
+
+    _teleport(table, 'user-sam', here)
+    table.reads.clear()
+    (sam,) = db._occupants(table, sid, here, 'user-alex')
+    assert sam['userId'] == 'user-sam' and sam['username'] == 'Sam'
+    assert sam['formName'] == db._form_name(db._get_player(table, sid, 'user-sam'))
+    assert ('query', 'PLAYER#') not in table.reads
+    table.reads.clear()
+    assert [o['userId'] for o in db._occupants(table, sid, here, 'user-sam')] == ['user-alex']
+    assert table.reads == [('get', 'OCCUPANCY')]
+
+
+def test_a_season_without_the_index_builds_it_from_the_roster():
+    table = CountingTable()
+    sid = _night(table)
+    pk = db._season_pk(sid)
+    del table.items[(pk, 'OCCUPANCY')]
+    here = table.items[(pk, 'PLAYER#user-alex')]['position']
+    table.items[(pk, 'PLAYER#user-sam')]['position'] = here
+    _teleport(table, 'user-alex', here)     # an entry write before the build
+
+    assert [o['userId'] for o in db._occupants(table, sid, here, 'user-alex')] == ['user-sam']
+    assert table.items[(pk, 'OCCUPANCY')]['built'] is True
+
+
+def test_saves_that_leave_the_entry_alone_skip_the_index():
+    table = WriteLog()
+    _night(table)
+    table.writes.clear()
+    act(table, 'chat', text='standing still')
+    assert not [w for w in table.writes if w[1] == 'OCCUPANCY']
+
+
+def test_kicked_creatures_leave_the_index():
+    table = CountingTable()
+    sid = _night(table)
+    status, _ = act(table, 'admin', hostKey='swampking', cmd='kick', target='user-sam')
+    assert status == 200
+    assert set(db._positions(table, sid)) == {'user-alex'}
+
+
+def test_the_build_never_overwrites_an_entry_written_during_it():
+    table = CountingTable()
+    sid = _night(table)
+    pk = db._season_pk(sid)
+    del table.items[(pk, 'OCCUPANCY')]
+    sam = db._get_player(table, sid, 'user-sam')
+    moved = dict(sam, position='somewhere-new')
+    put_item = table.put_item
+
+    def racing_put(Item, **kw):
+        if Item['sk'] == 'OCCUPANCY':   # Sam moves after the roster read
+            table.put_item = put_item
+            db._index_position(table, moved, sam)
+        return put_item(Item=Item, **kw)
+
+    table.put_item = racing_put
+    with db._unit_of_work(table):
+        positions = db._positions(table, sid)
+    assert positions['user-sam']['position'] == 'somewhere-new'
+    assert set(positions) == {'user-alex', 'user-sam'}
+    row = table.items[(pk, 'OCCUPANCY')]
+    assert row['built'] is True and row['user-sam']['position'] == 'somewhere-new'
@@ -0,0 +1,59 @@
+"""_iter_query: every prefix read streams page by page across LastEvaluatedKey,
+so a partition past DynamoDB's 1MB page is never silently truncated."""
+import undercity_db as db
+from test_undercity_db import act
+from test_undercity_state_snapshot import CountingTable
+
+
+def _night(table, n=5):
+    act(table, 'season-start', hostKey='swampking')
+    for i in range(n):
+        status, resp = act(table, 'join', user=f'user-{i}', name=f'P{i}',
+                           starter='saproling', home='cavern')
+        assert status == 200, resp
+    return db._active_season(table)[0]
+
+
+def test_prefix_reads_follow_every_page():
+    table = CountingTable(page_size=2)
+    sid = _night(table)
+    table.reads.clear()
+    assert len(db._season_players(table, sid)) == 5
+    assert table.reads == [('query', 'PLAYER#')] * 3
+    assert len(db._roster(table, sid, ('level',))) == 5
+    status, state = db.handle_state(table, {'userId': 'user-0'})
+    assert status == 200 and len(state['players']) == 5
+
+
+def test_limit_and_early_exit_stop_paging():
+    table = CountingTable(page_size=2)
+    sid = _night(table)
+    pk = db._season_pk(sid)
+    table.reads.clear()
+    assert [p['userId'] for p in db._iter_query(table, pk, 'PLAYER#', limit=3)] == \
+        ['user-0', 'user-1', 'user-2']
+    assert len(table.reads) == 2
+
+    table.reads.clear()
+    rows = db._iter_query(table, pk, 'PLAYER#')
+    assert next(rows)['userId'] == 'user-0'
+    assert len(table.reads) == 1
+
+
+def test_after_bound_still_yields_a_full_limit():
+    table = CountingTable(page_size=2)
+    sid = _night(table)
+    pk = db._season_pk(sid)
+    first = next(db._iter_query(table, pk, 'PLAYER#'))['sk']
+    rows = list(db._iter_query(table, pk, 'PLAYER#', after=first, limit=3))
+    assert [r['userId'] for r in rows] == ['user-1', 'user-2', 'user-3']
+
+
+def test_projection_and_raw_rows():
+    table = CountingTable()
+    sid = _night(table, n=1)
+    pk = db._season_pk(sid)
+    (row,) = db._iter_query(table, pk, 'PLAYER#', fields=('userId', 'level'))
+    assert row == {'userId': 'user-0', 'level': 1}
+    assert list(db._iter_query(table, pk, 'PLAYER#', fields=('level',),
+                               clean=False)) == [{'level': 1}]
@@ -1,5 +1,9 @@
 """Rested-rolls mechanic — unit tests over engine.regen_rolls (no table needed)."""
+import random
 from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
 
 import undercity_data as data
 import undercity_engine as engine
@@ -83,6 +87,50 @@ def test_bank_rested_false_restores_cap_and_discard():
     assert p['rested'] == 0
 
 
+def _loop_regen(rolls, rested, intervals, bank_rested):
+    """The original tick-by-tick regen_rolls, kept as the reference."""
+    per, cap, rcap = data.ROLLS_PER_REGEN, data.ROLL_CAP, data.RESTED_CAP
+    for _ in range(intervals):
+        if rolls >= cap:
+            if not bank_rested or rested >= rcap:
+                break
+            rested = min(rcap, rested + per)
+        else:
+            gain = per
+            if bank_rested and rested > 0:
+                bonus = min(rested, per)
+                gain += bonus
+                rested -= bonus
+            new_rolls = rolls + gain
+            if new_rolls > cap:
+                if bank_rested:
+                    rested = min(rcap, rested + (new_rolls - cap))
+                rolls = cap
+            else:
+                rolls = new_rolls
+    return rolls, rested
+
+
+@pytest.mark.parametrize('per,cap,rcap', [
+    (data.ROLLS_PER_REGEN, data.ROLL_CAP, data.RESTED_CAP), (1, 5, 3), (4, 10, 2), (3, 2, 20)])
+def test_closed_form_matches_the_tick_loop(monkeypatch, per, cap, rcap):
+    monkeypatch.setattr(data, 'ROLLS_PER_REGEN', per)
+    monkeypatch.setattr(data, 'ROLL_CAP', cap)
+    monkeypatch.setattr(data, 'RESTED_CAP', rcap)
+    rng = random.Random(per * 1000 + cap)
+    for _ in range(3000):
+        rolls = rng.randint(0, cap + 4)
+        rested = rng.randint(0, rcap + 4)
+        ticks = rng.choice([1, 2, 3, rng.randint(1, 40), rng.randint(40, 5000)])
+        bank = rng.random() < 0.8
+        if rng.random() < 0.2:
+            rolls, rested = Decimal(rolls), Decimal(rested)   # as DynamoDB hands them back
+        p = _player(rolls, rested)
+        engine.regen_rolls(p, _later(p['rollRegenAt'], ticks), bank_rested=bank)
+        assert (p['rolls'], p['rested']) == _loop_regen(rolls, rested, ticks, bank), \
+            (rolls, rested, ticks, bank)
+
+
 from tests.test_undercity_db import table, act, _sid  # noqa: E402,F401
 import undercity_db as db  # noqa: E402
 
@@ -110,10 +110,22 @@ def test_sweep_no_write_when_nothing_changes(monkeypatch):
     # Below threshold, not nudged, idle: nothing to do — no push, no flag write.
     _set(t, sid, 'user-sam', rolls=0, rollNudged=False,
          lastActionAt=_iso_min_ago(60), rollRegenAt=_iso_min_ago(1))
-    writes = []
-    real_put = db._put_player
-    monkeypatch.setattr(db, '_put_player',
-                        lambda table, doc: (writes.append(doc['userId']), real_put(table, doc))[1])
+    before = dict(t.items)
     monkeypatch.setattr(db, '_push_user', lambda table, uid, body: None)
     db.sweep_roll_refills(t)
-    assert writes == []
+    assert t.items == before
+
+
+def test_sweep_flips_only_the_flag(monkeypatch):
+    t = _table()
+    _join(t, 'user-sam', 'Sam')
+    sid = _sid(t)
+    _set(t, sid, 'user-sam', rolls=data.ROLL_NUDGE_THRESHOLD,
+         rollNudged=False, lastActionAt=_iso_min_ago(60))
+    before = db._get_player(t, sid, 'user-sam')
+    monkeypatch.setattr(db, '_push_user', lambda table, uid, body: None)
+    db.sweep_roll_refills(t)
+    # The sweep reads a projected roster, so it must never save that thin row
+    # whole: everything but the flag and the version is untouched.
+    after = db._get_player(t, sid, 'user-sam')
+    assert after == dict(before, rollNudged=True, ver=before['ver'] + 1)
@@ -0,0 +1,60 @@
+"""Roster-wide scans read a projected roster (_roster): just the fields the
+caller looks at, never the whole creature doc."""
+import undercity_data as data
+import undercity_db as db
+from test_undercity_db import FakeTable, act
+
+
+class ProjectionLog(FakeTable):
+    """FakeTable that records the ProjectionExpression of every PLAYER# read."""
+
+    def __init__(self):
+        super().__init__()
+        self.projections = []
+
+    def query(self, **kw):
+        if kw['ExpressionAttributeValues'].get(':sk') == 'PLAYER#':
+            names = kw.get('ExpressionAttributeNames') or {}
+            proj = kw.get('ProjectionExpression')
+            self.projections.append(
+                sorted(names[a.strip()] for a in proj.split(',')) if proj else None)
+        return super().query(**kw)
+
+
+def _night(table):
+    act(table, 'season-start', hostKey='swampking')
+    act(table, 'join', starter='saproling', home='cavern')
+    act(table, 'join', user='user-sam', name='Sam', starter='pest', home='bone')
+    return db._active_season(table)[0]
+
+
+def test_roster_reads_only_the_asked_fields():
+    table = ProjectionLog()
+    sid = _night(table)
+    rows = db._roster(table, sid, ('level', 'rolls'))
+    assert table.projections == [['level', 'rolls', 'userId']]
+    assert {tuple(sorted(r)) for r in rows} == {('level', 'rolls', 'userId')}
+
+
+def test_roster_reuses_player_rows_the_request_already_holds():
+    table = ProjectionLog()
+    sid = _night(table)
+    with db._unit_of_work(table):
+        db._season_players(table, sid)
+        assert [r['userId'] for r in db._roster(table, sid)] == ['user-alex', 'user-sam']
+    assert table.projections == [None]
+
+
+def test_standings_come_off_the_projected_roster():
+    table = ProjectionLog()
+    sid = _night(table)
+    full = {p['userId']: p for p in db._season_players(table, sid)}
+    table.projections.clear()
+
+    status, _ = act(table, 'season-end', hostKey='swampking')
+    assert status == 200
+    assert sorted(table.projections[0]) == sorted(('userId', *db._STANDING_FIELDS))
+    result = table.items[(db._season_pk(sid), 'RESULT')]
+    for s in result['standings']:
+        assert s['renown'] == data.compute_renown(full[s['userId']])
+        assert s['creatureName'] == full[s['userId']]['creatureName']
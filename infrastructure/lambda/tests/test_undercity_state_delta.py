@@ -0,0 +1,102 @@
+"""GET /game/state?since=<cursor>: a delta poll carries only what moved since
+the cursor — changed creatures, new events/chat, and the shared-world blocks
+only when a shared row changed."""
+import base64
+import json
+
+import undercity_db as db
+from test_undercity_db import act
+from test_undercity_state_snapshot import CountingTable, _busy_night
+
+
+def _poll(table, since=None, user='user-alex'):
+    params = {'userId': user}
+    if since:
+        params['since'] = since
+    status, state = db.handle_state(table, params)
+    assert status == 200
+    return state
+
+
+def _settled():
+    """A busy night plus one full poll (which lazily rolls the Enraged record),
+    and the cursor of a second, quiet full poll."""
+    table = CountingTable()
+    sid = _busy_night(table)
+    _poll(table)
+    return table, sid, _poll(table)['cursor']
+
+
+def test_full_poll_carries_a_cursor():
+    table, _, _ = _settled()
+    state = _poll(table)
+    assert state['cursor'] and 'delta' not in state
+    assert 'bazaars' in state and len(state['players']) == 2
+
+
+def test_quiet_delta_sends_only_the_caller():
+    table, _, cursor = _settled()
+    table.reads.clear()
+    state = _poll(table, cursor)
+
+    assert state['delta'] is True and state['gone'] == []
+    assert [p['userId'] for p in state['players']] == ['user-alex']
+    assert state['you']['userId'] == 'user-alex'
+    assert state['events'] == [] and state['chat'] == []
+    for shared in ('season', 'bazaars', 'market', 'swarm', 'excavations'):
+        assert shared not in state
+    # No partition sweep: just the creatures, the new-log reads and the wardrobe.
+    assert ('query', 'EVENT$') not in table.reads
+
+
+def test_delta_carries_changed_creatures_and_new_chat():
+    table, _, cursor = _settled()
+    act(table, 'chat', user='user-sam', name='Sam', text='anyone home?')
+    act(table, 'roll', user='user-sam', name='Sam')
+
+    state = _poll(table, cursor)
+    assert {p['userId'] for p in state['players']} == {'user-alex', 'user-sam'}
+    assert [m['text'] for m in state['chat']] == ['anyone home?']
+
+    # ...and the cursor it hands back moves past them.
+    again = _poll(table, state['cursor'])
+    assert again['chat'] == [] and [p['userId'] for p in again['players']] == ['user-alex']
+
+
+def test_delta_reports_departed_creatures():
+    table, sid, cursor = _settled()
+    del table.items[(db._season_pk(sid), 'PLAYER#user-sam')]
+    assert _poll(table, cursor)['gone'] == ['user-sam']
+
+
+def test_shared_write_brings_the_world_blocks_back():
+    table, sid, cursor = _settled()
+    db._set_swarm(table, sid, ['cavern_r1'])
+
+    state = _poll(table, cursor)
+    assert state['delta'] is True
+    assert state['swarm']['nodes'] == ['cavern_r1']
+    assert 'season' in state and 'bazaars' in state
+
+
+def test_foreign_or_garbage_cursor_gets_a_full_payload():
+    table, _, cursor = _settled()
+    other = json.loads(base64.urlsafe_b64decode(cursor))
+    other['s'] = 'some-other-night'
+    foreign = base64.urlsafe_b64encode(json.dumps(other).encode()).decode()
+
+    for since in (foreign, 'not-a-cursor', '!!'):
+        state = _poll(table, since)
+        assert 'delta' not in state and len(state['players']) == 2
+
+
+def test_forged_cursor_fields_get_a_full_payload():
+    table, _, cursor = _settled()
+    good = json.loads(base64.urlsafe_b64decode(cursor))
+    for field, value in (('e', 5), ('e', ['x']), ('c', 'EVENT#1'), ('e', 'PLAYER#a'),
+                         ('w', 'x'), ('w', True), ('t', 'x'), ('t', [[1]]),
+                         ('p', {'user-alex': 'x'})):
+        forged = base64.urlsafe_b64encode(json.dumps({**good, field: value}).encode()).decode()
+        state = _poll(table, forged)
+        assert 'delta' not in state and len(state['players']) == 2, (field, value)
+    assert _poll(table, cursor)['delta'] is True
@@ -0,0 +1,113 @@
+"""GET /game/state reads the season partition in one sweep (_prime_season)
+and must build exactly the response the per-family reads used to."""
+import undercity_data as data
+import undercity_db as db
+from test_undercity_db import FakeTable, act
+
+
+class CountingTable(FakeTable):
+    """FakeTable that tallies every read call, so a test can assert on them."""
+
+    def __init__(self, page_size=0):
+        super().__init__(page_size)
+        self.reads = []
+
+    def get_item(self, Key):
+        self.reads.append(('get', Key['sk']))
+        return super().get_item(Key)
+
+    def query(self, **kw):
+        values = kw['ExpressionAttributeValues']
+        self.reads.append(('query', values.get(':sk', values.get(':lo'))))
+        return super().query(**kw)
+
+
+def _busy_night(table):
+    """A night with every shared family populated: players, chat, events, a
+    market listing, an open barrier, a swarm, the world event and a reclaim."""
+    act(table, 'season-start', hostKey='swampking')
+    sid = db._active_season(table)[0]
+    act(table, 'join', starter='saproling', home='cavern')
+    act(table, 'join', user='user-sam', name='Sam', starter='pest', home='bone')
+    act(table, 'chat', text='evening all')
+    act(table, 'chat', user='user-sam', name='Sam', text='hi')
+    db._open_barrier(table, sid, next(iter(data.BARRIER_GUARDIANS)))
+    db._set_swarm(table, sid, ['cavern_r0'])
+    db._spawn_world_event(table, sid)
+    table.put_item(Item={'pk': db._season_pk(sid), 'sk': 'RECLAIM#cavern_r1',
+                         'node': 'cavern_r1', 'type': 'shop', 'origType': 'empty',
+                         'by': 'user-alex', 'byName': 'Alex'})
+    table.put_item(Item={'pk': db._season_pk(sid), 'sk': 'FIRST#boss',
+                         'by': 'Alex', 'uid': 'user-alex', 'at': db._now(),
+                         'kind': 'boss'})
+    return sid
+
+
+def test_state_matches_the_per_family_reads(monkeypatch):
+    table = FakeTable()
+    _busy_night(table)
+    monkeypatch.setattr(db, '_now', lambda: '2026-01-01T00:00:00')
+
+    _, swept = db.handle_state(table, {'userId': 'user-alex'})
+
+    monkeypatch.setattr(db, '_prime_season', lambda table, sid, *a, **kw: None)
+    _, direct = db.handle_state(table, {'userId': 'user-alex'})
+
+    # The first poll lazily rolls the Enraged record, so the cursors differ.
+    swept.pop('cursor'), direct.pop('cursor')
+    assert swept == direct
+    assert {c['text'] for c in swept['chat']} == {'evening all', 'hi'}
+    assert swept['season']['reclaimed']['cavern_r1']['type'] == 'shop'
+    assert swept['firsts']['boss']['by'] == 'Alex'
+
+
+def test_state_poll_reads_the_partition_in_one_sweep():
+    table = CountingTable()
+    _busy_night(table)
+    table.reads.clear()
+
+    status, state = db.handle_state(table, {'userId': 'user-alex'})
+    assert status == 200 and len(state['players']) == 2
+
+    # META pointer, the world version the cursor is stamped with, the range
+    # reads around the families that grow all night, the newest events and
+    # chat, and the caller's permanent wardrobe — nothing per family/pool.
+    assert table.reads == [('get', 'CURRENT'), ('get', 'WORLDVER'), ('query', 'BATTLE#'),
+                           ('query', 'BATTLE$'), ('query', 'CHAT$'), ('query', 'EVENT$'),
+                           ('query', 'PERMRENOWN$'), ('query', 'EVENT#'),
+                           ('query', 'CHAT#'), ('get', 'META')]
+
+
+def test_sweep_skips_the_rows_that_grow_all_night(monkeypatch):
+    table = CountingTable()
+    sid = _busy_night(table)
+    pk = db._season_pk(sid)
+    for uid in ('user-alex', 'user-sam'):
+        table.put_item(Item={'pk': pk, 'sk': f'BATTLE#{uid}', 'ver': 1, 'battle': {}})
+        table.put_item(Item={'pk': pk, 'sk': f'PERMRENOWN#{uid}', 'amount': 1})
+    table.items[(pk, 'PLAYER#user-alex')]['battle'] = True
+    swept, real = [], db._sweep
+
+    def sweep(t, cond, values):
+        rows = real(t, cond, values)
+        swept.extend(rows)
+        return rows
+    monkeypatch.setattr(db, '_sweep', sweep)
+    table.reads.clear()
+
+    db.handle_state(table, {'userId': 'user-alex'})
+    sks = [i['sk'] for i in swept]
+    assert 'PLAYER#user-sam' in sks and 'OCCUPANCY' in sks and 'BARRIERS' in sks
+    assert not [sk for sk in sks if sk.startswith(db._UNSWEPT_FAMILIES)]
+    assert [r for r in table.reads if 'BATTLE#' in (r[1] or '')] == [
+        ('query', 'BATTLE#'), ('get', 'BATTLE#user-alex')]
+
+
+def test_sweep_follows_pagination():
+    table = CountingTable(page_size=2)
+    _busy_night(table)
+
+    _, state = db.handle_state(table, {'userId': 'user-alex'})
+    assert {p['userId'] for p in state['players']} == {'user-alex', 'user-sam'}
+    assert len(state['chat']) == 2
+    assert state['swarm']['nodes'] == ['cavern_r0']
@@ -0,0 +1,124 @@
+"""The request-scoped unit of work: inside one handle_action each distinct row is
+read once, the module's own writes keep the map coherent, a failed conditional
+write forgets the row so the retry sees the live one, and a player doc loaded in
+the request is saved as a ver-guarded UpdateItem of just its changed fields."""
+from collections import Counter
+
+import undercity_db as db
+from test_undercity_db import act
+from test_undercity_state_snapshot import CountingTable
+
+
+def _night():
+    table = CountingTable()
+    act(table, 'season-start', hostKey='swampking')
+    act(table, 'join', starter='saproling', home='cavern')
+    act(table, 'join', user='user-sam', name='Sam', starter='pest', home='bone')
+    return table, db._active_season(table)[0]
+
+
+def test_an_action_reads_each_row_once():
+    table, _ = _night()
+    for atype in ('roll', 'chat'):
+        table.reads.clear()
+        status, resp = act(table, atype, text='hi')
+        assert status == 200, resp
+        gets = Counter(sk for kind, sk in table.reads if kind == 'get')
+        assert gets and max(gets.values()) == 1, gets
+
+
+def test_own_writes_are_visible_to_later_reads():
+    table, sid = _night()
+    pk = db._season_pk(sid)
+    with db._unit_of_work(table):
+        doc = db._get_player(table, sid, 'user-alex')
+        assert [p['userId'] for p in db._all_players(table, sid)] == ['user-alex', 'user-sam']
+        doc['spores'] = 77
+        assert db._put_player(table, doc)
+        assert db._get_player(table, sid, 'user-alex')['spores'] == 77
+        assert {p['userId']: p['spores'] for p in db._all_players(table, sid)}['user-alex'] == 77
+        db._delete(table, Key={'pk': pk, 'sk': 'PLAYER#user-sam'})
+        assert db._get_player(table, sid, 'user-sam') is None
+        assert [p['userId'] for p in db._all_players(table, sid)] == ['user-alex']
+
+
+def test_failed_conditional_write_rereads_the_live_row():
+    table, sid = _night()
+    key = (db._season_pk(sid), 'PLAYER#user-alex')
+    with db._unit_of_work(table):
+        stale = db._get_player(table, sid, 'user-alex')
+        table.items[key]['ver'] += 1          # someone else wrote in between
+        table.items[key]['spores'] = 999
+        assert db._get_player(table, sid, 'user-alex')['spores'] == stale['spores']
+        assert not db._put_player(table, dict(stale, spores=1))
+        table.reads.clear()
+        assert db._get_player(table, sid, 'user-alex')['spores'] == 999
+        assert table.reads == [('get', 'PLAYER#user-alex')]
+
+
+def test_nothing_is_cached_outside_a_request():
+    table, sid = _night()
+    key = (db._season_pk(sid), 'PLAYER#user-alex')
+    db._get_player(table, sid, 'user-alex')
+    table.items[key]['spores'] = 4242
+    assert db._get_player(table, sid, 'user-alex')['spores'] == 4242
+    assert db._UOW is None
+
+
+class WriteLog(CountingTable):
+    """CountingTable that also records which write call each row went through."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+
+    def put_item(self, Item, **kw):
+        self.writes.append(('put', Item['sk'], sorted(Item)))
+        return super().put_item(Item, **kw)
+
+    def update_item(self, Key, **kw):
+        names = sorted(kw.get('ExpressionAttributeNames', {}).values())
+        self.writes.append(('update', Key['sk'], names))
+        return super().update_item(Key, **kw)
+
+
+def test_loaded_doc_is_saved_as_a_delta():
+    table = WriteLog()
+    act(table, 'season-start', hostKey='swampking')
+    act(table, 'join', starter='saproling', home='cavern')
+    sid = db._active_season(table)[0]
+    key = (db._season_pk(sid), 'PLAYER#user-alex')
+    table.items[key]['doomed'] = 'x'
+    expected = {**table.items[key], 'spores': 1234, 'status': 'hi',
+                'ver': table.items[key]['ver'] + 1}
+    del expected['doomed']
+
+    table.writes.clear()
+    with db._unit_of_work(table):
+        doc = db._get_player(table, sid, 'user-alex')
+        doc.update(spores=1234, status='hi')
+        del doc['doomed']
+        assert db._put_player(table, doc)
+    assert table.writes == [('update', 'PLAYER#user-alex', ['doomed', 'spores', 'status'])]
+    assert table.items[key] == expected
+
+
+def test_stale_delta_write_is_a_conflict():
+    table, sid = _night()
+    key = (db._season_pk(sid), 'PLAYER#user-alex')
+    with db._unit_of_work(table):
+        doc = db._get_player(table, sid, 'user-alex')
+        table.items[key]['ver'] += 1
+        assert not db._put_player(table, dict(doc, spores=1))
+    assert table.items[key]['spores'] != 1
+
+
+def test_actions_save_players_without_whole_document_puts():
+    table = WriteLog()
+    act(table, 'season-start', hostKey='swampking')
+    act(table, 'join', starter='saproling', home='cavern')   # new doc: a put
+    table.writes.clear()
+    status, resp = act(table, 'roll')
+    assert status == 200, resp
+    player_writes = [w for w in table.writes if w[1].startswith('PLAYER#')]
+    assert player_writes and all(kind == 'update' for kind, _, _ in player_writes)
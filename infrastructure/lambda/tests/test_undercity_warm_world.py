@@ -0,0 +1,109 @@
+"""The warm-container world cache: shared season rows survive across requests,
+revalidated by one GetItem on the world-version row that every shared write
+stamps."""
+import pytest
+
+import undercity_data as data
+import undercity_db as db
+from test_undercity_db import act
+from test_undercity_state_snapshot import CountingTable, _busy_night
+
+
+@pytest.fixture(autouse=True)
+def _warm_on(monkeypatch):
+    monkeypatch.setattr(db, 'WARM_WORLD_CACHE', True)
+
+
+def _warm_night():
+    table = CountingTable()
+    sid = _busy_night(table)
+    db.handle_state(table, {'userId': 'user-alex'})   # rolls the Enraged record
+    db.handle_state(table, {'userId': 'user-alex'})   # cold poll fills the view
+    table.reads.clear()
+    return table, sid
+
+
+def test_shared_writes_stamp_the_world_version():
+    table = CountingTable()
+    sid = _busy_night(table)
+    pk = db._season_pk(sid)
+    before = db._world_version(table, pk)
+    db._set_swarm(table, sid, ['cavern_r1'])
+    assert db._world_version(table, pk) == before + 1
+    act(table, 'chat', text='not shared')
+    assert db._world_version(table, pk) == before + 1
+
+
+def test_warm_poll_reads_only_the_version_and_players():
+    table, _ = _warm_night()
+    _, warm = db.handle_state(table, {'userId': 'user-alex'})
+
+    assert table.reads == [('get', 'CURRENT'), ('get', 'WORLDVER'),
+                           ('query', 'PLAYER#'), ('query', 'EVENT#'),
+                           ('query', 'CHAT#'), ('get', 'META')]
+    db._warm_world.clear()
+    _, cold = db.handle_state(table, {'userId': 'user-alex'})
+    assert warm == cold
+
+
+def test_own_shared_write_drops_the_view():
+    table, sid = _warm_night()
+    db._set_swarm(table, sid, ['cavern_r1'])
+    assert db._season_pk(sid) not in db._warm_world
+    table.reads.clear()
+
+    _, state = db.handle_state(table, {'userId': 'user-alex'})
+    assert state['swarm']['nodes'] == ['cavern_r1']
+    assert ('query', 'EVENT$') in table.reads          # re-swept
+
+
+def test_a_foreign_write_racing_our_stamp_is_not_masked(monkeypatch):
+    table, sid = _warm_night()
+    pk = db._season_pk(sid)
+    real = table.update_item
+
+    def update_item(Key, **kw):
+        if Key['sk'] == 'WORLDVER' and not raced:
+            # Another container rewrites the swarm between our write and our
+            # stamp; its own stamp hasn't landed yet.
+            raced.append(True)
+            table.items[(pk, 'SWARM')]['nodes'] = ['cavern_r2']
+        return real(Key=Key, **kw)
+    raced = []
+    monkeypatch.setattr(table, 'update_item', update_item)
+    with db._unit_of_work(table):
+        db._set_swarm(table, sid, ['cavern_r1'])
+
+    _, state = db.handle_state(table, {'userId': 'user-alex'})
+    assert state['swarm']['nodes'] == ['cavern_r2']
+
+
+def test_world_seen_outside_a_request():
+    table, sid = _warm_night()
+    pk = db._season_pk(sid)
+    assert db._world_seen(table, pk) == db._world_version(table, pk)
+
+
+def test_foreign_write_invalidates_the_view():
+    table, sid = _warm_night()
+    pk = db._season_pk(sid)
+    opened = table.items[(pk, 'BARRIERS')]['open']
+    barrier = next(b for b in sorted(data.BARRIER_GUARDIANS) if b not in opened)
+    # Another container opened a barrier: row written, then the version stamped.
+    opened.append(barrier)
+    table.update_item(Key={'pk': pk, 'sk': 'WORLDVER'},
+                      UpdateExpression='ADD v :one',
+                      ExpressionAttributeValues={':one': 1})
+
+    _, state = db.handle_state(table, {'userId': 'user-alex'})
+    assert barrier in state['barriersOpen']
+    assert ('query', 'EVENT$') in table.reads          # stale view re-swept
+
+
+def test_actions_serve_shared_rows_from_the_view():
+    table, _ = _warm_night()
+    status, resp = act(table, 'roll')
+    assert status == 200, resp
+    gets = [sk for kind, sk in table.reads if kind == 'get']
+    assert 'WORLDVER' in gets
+    assert 'CONFIG' not in gets and 'BARRIERS' not in gets
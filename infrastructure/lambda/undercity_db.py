@@ -16,16 +16,25 @@ Item layout (existing single table, pk/sk strings):
   UNDERCITY#HALLOFFAME      / NIGHT#{sid}    per-night archive
   UNDERCITYUSER#{uid}       / META           permanent wardrobe/seals/lifetime
 """
+import base64
+import copy
+import hashlib
 import json
 import random
+import threading
 import uuid
 import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from decimal import Decimal
 
 from botocore.exceptions import ClientError
 
+import ddb_json
 import push_db
+import request_log
 import undercity_data as data
 import undercity_engine as engine
 import undercity_mapgen as mapgen
@@ -260,7 +269,7 @@ def _event(table, sid, etype, text, actor=None, extra=None):
         item['actor'] = actor
     if extra:
         item['data'] = extra
-    table.put_item(Item=item)
+    _put(table, Item=item)
 
 
 def _metric(doc, key, n=1):
@@ -277,11 +286,10 @@ def _claim_first(table, sid, node, kind, doc):
     Returns True iff THIS call won the race (this player is the global first).
     Race-safe: the conditional put lets exactly one concurrent writer win."""
     try:
-        table.put_item(
-            Item={'pk': _season_pk(sid), 'sk': f'FIRST#{node}',
-                  'by': doc['username'], 'uid': doc['userId'],
-                  'at': _now(), 'kind': kind},
-            ConditionExpression='attribute_not_exists(pk)')
+        _put(table, Item={'pk': _season_pk(sid), 'sk': f'FIRST#{node}',
+                          'by': doc['username'], 'uid': doc['userId'],
+                          'at': _now(), 'kind': kind},
+             ConditionExpression='attribute_not_exists(pk)')
         return True
     except ClientError as e:
         if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
@@ -289,11 +297,390 @@ def _claim_first(table, sid, node, kind, doc):
         raise
 
 
+# ── Request-scoped unit of work ──────────────────────────────────────────────
+# One action used to re-read the same rows over and over: CONFIG through
+# _active_season and _awakened, BARRIERS through _stop_nodes on every walk
+# legality check, RECLAIM# through _effective_type, the WILDWARP pointer, and so
+# on. While a request is open, _get and _query_rows answer from an identity map
+# of every row this request has already read or written, so each distinct key
+# costs one read. The module's own writes go through _put/_delete, which keep
+# the map coherent: a successful write replaces the cached row and drops cached
+# range reads over its partition, and a failed conditional write forgets the row
+# so a retry loop re-reads the live one. Request-scoped like _DEV_NIGHT: opened
+# at the top of handle_action/handle_state and torn down when they return, so
+# nothing is ever served across invocations (or to a direct helper call) —
+# except the shared world rows, through the version-checked warm cache below.
+#
+# GET /game/state additionally sweeps the season partition up front, all but the
+# families that grow all night (see _prime_season); once a row family is swept,
+# a row missing from the map is authoritatively absent and every read of that
+# family is answered in memory.
+_UOW = None
+
+# Row families of a season partition that belong to one player, grow all night
+# or move with every step (the OCCUPANCY index). Everything else (CONFIG,
+# BARRIERS, MAP, RECLAIM#, SWARM, WORLDEVENT, MARKET#, FIRST#/FOG#, the facility
+# records, ...) is shared world state.
+_PRIVATE_FAMILIES = ('EVENT#', 'PLAYER#', 'BATTLE#', 'CHAT#', 'PERMRENOWN#',
+                     'OCCUPANCY')
+
+
+@contextmanager
+def _unit_of_work(table):
+    global _UOW
+    _UOW = {'table': table, 'rows': {}, 'queries': {}, 'swept': {}, 'world': {}}
+    try:
+        yield
+    finally:
+        _UOW = None
+
+
+def _uow_for(table):
+    """The open unit of work, if it belongs to `table`."""
+    uow = _UOW
+    return uow if uow is not None and uow['table'] is table else None
+
+
+def _family(sk):
+    """The family a row (or a prefix read) belongs to: a private family by its
+    prefix, or 'shared'."""
+    for fam in _PRIVATE_FAMILIES:
+        if sk.startswith(fam):
+            return fam
+    return 'shared'
+
+
+def _swept(uow, pk, sk):
+    """True when a sweep answers for (pk, sk). The _UNSWEPT_FAMILIES never are
+    — they grow without bound all night."""
+    return _family(sk) in uow['swept'].get(pk, ())
+
+
+def _covers(uow, pk, prefix, start):
+    """True when the swept families answer a whole prefix (or sk >= start) read."""
+    if prefix is not None:
+        return _swept(uow, pk, prefix)
+    fams = uow['swept'].get(pk, ())
+    return 'shared' in fams and all(f in fams for f in _PRIVATE_FAMILIES
+                                    if f >= start[:len(f)])
+
+
+# ── Warm-container world cache ───────────────────────────────────────────────
+# A warm Lambda container serves request after request for the same night, and
+# the shared world rows barely move between them. Every write to one stamps the
+# season's world version (a single counter row, bumped with ADD after the write
+# lands), and the container keeps the shared rows it has read in module memory,
+# tagged with the version it read them at. A request revalidates that view with
+# ONE GetItem on the version row the first time it needs a shared row; a match
+# serves every shared read from memory, a mismatch drops the view and refills it
+# as the request reads. Read the version BEFORE the data and stamp AFTER the
+# write, and a view can only ever be newer than its tag, never older. A
+# container's own shared write drops its view too (see _stamp_world).
+#
+# ON in production; the suite runs every test both ways (see conftest).
+WARM_WORLD_CACHE = True
+_WORLD_VER_SK = 'WORLDVER'
+_warm_world = {}   # season pk -> {'table', 'ver', 'rows', 'queries', 'swept'}
+
+
+def _shared(pk, sk):
+    """True for a season row covered by the world version."""
+    return (pk.startswith('UNDERCITY#') and pk not in (META_PK, HOF_PK)
+            and sk != _WORLD_VER_SK and _family(sk) == 'shared')
+
+
+def _world_version(table, pk):
+    item = table.get_item(Key={'pk': pk, 'sk': _WORLD_VER_SK}).get('Item')
+    return int(item['v']) if item else 0
+
+
+def _world(table, pk):
+    """The warm view of `pk`'s shared rows, revalidated once per request. Seeds
+    a fully-swept view straight into the unit of work. None when the cache is
+    off, no request is open, or this request's own writes invalidated it."""
+    uow = _uow_for(table)
+    if uow is None or not WARM_WORLD_CACHE:
+        return None
+    if pk not in uow['world']:
+        ver = uow['world'][pk] = _world_version(table, pk)
+        warm = _warm_world.get(pk)
+        if warm is None or warm['table'] is not table or warm['ver'] != ver:
+            _warm_world.clear()   # one live night per container; never grows
+            warm = _warm_world[pk] = {'table': table, 'ver': ver, 'rows': {},
+                                      'queries': {}, 'swept': False}
+        if warm['swept']:
+            for sk, item in warm['rows'].items():
+                uow['rows'].setdefault((pk, sk), item)
+            uow['swept'].setdefault(pk, set()).add('shared')
+    return _warm_world.get(pk)
+
+
+def _stamp_world(table, key, item):
+    """Bump the world version after a shared write and drop this container's
+    view. It is never patched with the write: another container's write to the
+    same row can land between ours and the bump, so only a re-read knows which
+    one stands."""
+    pk, sk = key
+    if not _shared(pk, sk):
+        return
+    ver = int(table.update_item(
+        Key={'pk': pk, 'sk': _WORLD_VER_SK}, UpdateExpression='ADD v :one',
+        ExpressionAttributeValues={':one': 1},
+        ReturnValues='UPDATED_NEW')['Attributes']['v'])
+    _warm_world.pop(pk, None)
+    uow = _uow_for(table)
+    if uow is not None:
+        uow['world'][pk] = ver
+
+
+def _world_seen(table, pk):
+    """The world version this request read `pk`'s shared rows at — probed once,
+    before any shared data, so a cursor built on it is never ahead of the data."""
+    uow = _uow_for(table)
+    if uow is None:
+        return _world_version(table, pk)
+    _world(table, pk)
+    if pk not in uow['world']:
+        uow['world'][pk] = _world_version(table, pk)
+    return uow['world'][pk]
+
+
+def _remember(table, key, item):
+    """Record a successful write (item=None for a delete) in the unit of work."""
+    uow = _uow_for(table)
+    if uow is None:
+        return
+    staged = uow.get('batch')
+    if staged is not None and staged['key'] != key:
+        staged['shared'] = True
+    uow['rows'][key] = _clean(item) if item is not None else None
+    uow['queries'] = {q: v for q, v in uow['queries'].items() if q[0] != key[0]}
+
+
+def _forget(table, key):
+    """Drop a row whose stored state is unknown (a failed conditional write)."""
+    uow = _uow_for(table)
+    if uow is not None:
+        uow['rows'].pop(key, None)
+        uow['queries'] = {q: v for q, v in uow['queries'].items() if q[0] != key[0]}
+        uow['swept'].pop(key[0], None)
+    warm = _warm_world.get(key[0])
+    if warm is not None:
+        warm['rows'].pop(key[1], None)
+        warm['queries'], warm['swept'] = {}, False
+
+
+def _put(table, Item, **kw):
+    """table.put_item, kept coherent with the request's unit of work."""
+    key = (Item['pk'], Item['sk'])
+    try:
+        table.put_item(Item=Item, **kw)
+    except ClientError:
+        _forget(table, key)
+        raise
+    _stamp_world(table, key, Item)
+    _remember(table, key, Item)
+
+
+def _delete(table, Key, **kw):
+    """table.delete_item, kept coherent with the request's unit of work."""
+    key = (Key['pk'], Key['sk'])
+    try:
+        table.delete_item(Key=Key, **kw)
+    except ClientError:
+        _forget(table, key)
+        raise
+    _stamp_world(table, key, None)
+    _remember(table, key, None)
+
+
+def _update(table, Key, Item, **kw):
+    """table.update_item, kept coherent with the request's unit of work. `Item`
+    is the whole row as it stands after the update."""
+    key = (Key['pk'], Key['sk'])
+    try:
+        table.update_item(Key=Key, **kw)
+    except ClientError:
+        _forget(table, key)
+        raise
+    _stamp_world(table, key, Item)
+    _remember(table, key, Item)
+
+
 def _get(table, pk, sk):
+    uow = _uow_for(table)
+    if uow is not None:
+        key = (pk, sk)
+        if key not in uow['rows'] and not _swept(uow, pk, sk):
+            warm = _world(table, pk) if _shared(pk, sk) else None
+            if warm is not None and (warm['swept'] or sk in warm['rows']):
+                uow['rows'].setdefault(key, warm['rows'].get(sk))
+            else:
+                uow['rows'][key] = table.get_item(Key={'pk': pk, 'sk': sk}).get('Item')
+                if warm is not None:
+                    warm['rows'][sk] = uow['rows'][key]
+        item = uow['rows'].get(key)
+        return _clean(item) if item else None
     resp = table.get_item(Key={'pk': pk, 'sk': sk})
     return _clean(resp.get('Item')) if resp.get('Item') else None
 
 
+def _query_rows(table, pk, prefix=None, start=None, newest_first=False, limit=None,
+                after=None):
+    """Rows under `pk` whose sk begins with `prefix` (or sorts at/after `start`),
+    cleaned, in sk order (newest-first on request). `after` narrows a prefix read
+    to the rows sorting strictly after that sk. Answered from the unit of
+    work when this request already swept the family or ran the same read, and
+    from the warm world view for a shared family it already holds."""
+    uow = _uow_for(table)
+    warm = _world(table, pk) if prefix is not None and _shared(pk, prefix) else None
+    if uow is not None and _covers(uow, pk, prefix, start):
+        rows = sorted((i for (p, sk), i in uow['rows'].items()
+                       if p == pk and i is not None
+                       and (prefix is None or sk.startswith(prefix))
+                       and (start is None or sk >= start)
+                       and (after is None or sk > after)),
+                      key=lambda i: i['sk'], reverse=newest_first)
+        return [_clean(i) for i in rows[:limit]]
+    qkey = (pk, prefix, start, newest_first, limit, after)
+    if uow is not None and qkey in uow['queries']:
+        return [_clean(i) for i in uow['queries'][qkey]]
+    if warm is not None and qkey in warm['queries']:
+        items = warm['queries'][qkey]
+    else:
+        items = list(_iter_query(table, pk, prefix, start=start, after=after,
+                                 newest_first=newest_first, limit=limit, clean=False))
+        if warm is not None:
+            warm['queries'][qkey] = items
+    if uow is not None:
+        uow['queries'][qkey] = items
+    return [_clean(i) for i in items]
+
+
+def _pages(table, limit=None, **kw):
+    """Raw items of one table.query, streamed page by page across
+    LastEvaluatedKey — a page is capped at 1MB, and stopping at the first one
+    drops the tail of a big partition silently. Stops after `limit` items, and
+    whenever the consumer stops pulling."""
+    left = limit
+    while True:
+        if left is not None:
+            kw['Limit'] = left
+        page = table.query(**kw)
+        for item in page.get('Items', []):
+            yield item
+        if left is not None:
+            left -= len(page.get('Items', []))
+        start = page.get('LastEvaluatedKey')
+        if not start or (left is not None and left <= 0):
+            return
+        kw['ExclusiveStartKey'] = start
+
+
+def _iter_query(table, pk, prefix=None, *, start=None, after=None, newest_first=False,
+                limit=None, fields=None, clean=True):
+    """Every row under `pk` whose sk begins with `prefix` (sorts at/after `start`,
+    or — neither given — the whole partition), as a generator over every page.
+    `after` narrows a prefix read to the rows sorting strictly after that sk;
+    `fields` projects the read down to those attributes; `limit` caps the rows
+    yielded. Each row is _clean-ed as it is pulled unless `clean=False`."""
+    kw = {'ScanIndexForward': not newest_first}
+    if after is not None:
+        # No begins_with-and-greater-than key condition: bound the prefix by the
+        # next sk after it instead, and drop the inclusive `after` below.
+        kw['KeyConditionExpression'] = 'pk = :pk AND sk BETWEEN :lo AND :hi'
+        kw['ExpressionAttributeValues'] = {
+            ':pk': pk, ':lo': after, ':hi': prefix[:-1] + chr(ord(prefix[-1]) + 1)}
+    elif prefix is not None:
+        kw['KeyConditionExpression'] = 'pk = :pk AND begins_with(sk, :sk)'
+        kw['ExpressionAttributeValues'] = {':pk': pk, ':sk': prefix}
+    elif start is not None:
+        kw['KeyConditionExpression'] = 'pk = :pk AND sk >= :sk'
+        kw['ExpressionAttributeValues'] = {':pk': pk, ':sk': start}
+    else:
+        kw['KeyConditionExpression'] = 'pk = :pk'
+        kw['ExpressionAttributeValues'] = {':pk': pk}
+    if fields:
+        names = {f'#p{i}': f for i, f in enumerate(fields)}
+        kw['ProjectionExpression'] = ', '.join(names)
+        kw['ExpressionAttributeNames'] = names
+    n = 0
+    # One spare row per page read covers the inclusive `after` bound.
+    for item in _pages(table, limit=limit + (after is not None) if limit else None, **kw):
+        if after is not None and item['sk'] <= after:
+            continue
+        if limit and n >= limit:
+            return
+        n += 1
+        yield _clean(item) if clean else item
+
+
+def query_items(table, pk, prefix=None, **kw):
+    """Public streaming prefix read for other Lambda modules (e.g. queue_db);
+    see _iter_query."""
+    return _iter_query(table, pk, prefix, **kw)
+
+
+def _sweep(table, key_condition, values):
+    """Every row matching one key condition, following LastEvaluatedKey."""
+    return list(_pages(table, KeyConditionExpression=key_condition,
+                       ExpressionAttributeValues=values))
+
+
+# Private families that grow all night — the Grapevine log, the plaza chat,
+# every creature's battle record and banked-renown ledger. The state sweep reads
+# around them; the poll reads the newest slice of the first two itself and the
+# caller's own battle record by key.
+_UNSWEPT_FAMILIES = ('BATTLE#', 'CHAT#', 'EVENT#', 'PERMRENOWN#')
+
+
+def _sweep_around(table, pk, skip):
+    """Every row of `pk` outside the `skip` prefixes: one range read per gap
+    between them, in sk order."""
+    rows, lo = [], None
+    for fam in sorted(skip):
+        if lo is None:
+            rows += _sweep(table, 'pk = :pk AND sk < :sk', {':pk': pk, ':sk': fam})
+        else:
+            rows += _sweep(table, 'pk = :pk AND sk BETWEEN :lo AND :hi',
+                           {':pk': pk, ':lo': lo, ':hi': fam})
+        lo = fam[:-1] + chr(ord(fam[-1]) + 1)
+    return rows + _sweep(table, 'pk = :pk AND sk > :sk', {':pk': pk, ':sk': lo})
+
+
+def _prime_season(table, sid, user_id='', players_only=False):
+    """One-pass GET /game/state: load the season's shared rows, the OCCUPANCY
+    index and every PLAYER# row of UNDERCITY#{sid} into the open unit of work,
+    so the poll's PLAYER# range, per-family prefix reads and BARRIERS/SWARM/
+    BOSS/WORLDEVENT/ENRAGED/barrier-pool/lair-pool GetItems are all answered in
+    memory. The range reads skip the _UNSWEPT_FAMILIES; the caller's own battle
+    record is one GetItem. On a warm container whose world view is still
+    current — or for a delta poll whose cursor says the shared rows haven't
+    moved — only the PLAYER# rows are read."""
+    uow = _uow_for(table)
+    if uow is None or not sid:
+        return
+    pk = _season_pk(sid)
+    warm = _world(table, pk)
+    swept = uow['swept'].setdefault(pk, set())
+    if players_only or (warm is not None and warm['swept']):
+        rows = _sweep(table, 'pk = :pk AND begins_with(sk, :sk)',
+                      {':pk': pk, ':sk': 'PLAYER#'})
+        fams = {'PLAYER#'}
+    else:
+        rows = _sweep_around(table, pk, _UNSWEPT_FAMILIES)
+        fams = {'shared', 'OCCUPANCY', 'PLAYER#'}
+        if warm is not None:
+            warm['rows'] = {i['sk']: i for i in rows if _shared(pk, i['sk'])}
+            warm['queries'], warm['swept'] = {}, True
+    for item in rows:
+        uow['rows'][(pk, item['sk'])] = item
+    swept.update(fams)
+    you = uow['rows'].get((pk, f'PLAYER#{user_id}'))
+    if you is not None and you.get('battle') is True:
+        _get(table, pk, _battle_sk(user_id))
+
+
 _season_map_cache = {}   # sid -> merged node dict for the night (built once)
 
 
@@ -319,6 +706,20 @@ def _season_map(table, sid):
     return cached
 
 
+_season_board_cache = {}   # sid -> engine.Board compiled from _season_map
+
+
+def _season_board(table, sid):
+    """The night's node graph compiled for movement (engine.Board), cached per
+    sid beside _season_map and rebuilt whenever that map object is replaced.
+    Movement legality, spell range and the sim's pathfinding run over it."""
+    nodes = _season_map(table, sid)
+    board = _season_board_cache.get(sid)
+    if board is None or board.nodes is not nodes:
+        board = _season_board_cache[sid] = engine.Board(nodes)
+    return board
+
+
 def _reclaimed(table, sid):
     """Every standing Grime Gorger claim this season, keyed by node id.
 
@@ -326,10 +727,7 @@ def _reclaimed(table, sid):
     `_season_map` hands back the committed module-level node dict *by reference*,
     so editing the graph in place would corrupt state across Lambda invocations
     (and across tests in one process). Never write a node type; layer over it."""
-    resp = table.query(
-        KeyConditionExpression='pk = :pk AND begins_with(sk, :sk)',
-        ExpressionAttributeValues={':pk': _season_pk(sid), ':sk': 'RECLAIM#'})
-    return {it['node']: it for it in resp.get('Items', [])}
+    return {it['node']: it for it in _query_rows(table, _season_pk(sid), 'RECLAIM#')}
 
 
 def _effective_type(table, sid, node):
@@ -346,30 +744,26 @@ _season_depth_cache = {}   # sid -> {depths node id -> hops from its biome mouth
 
 def _season_depth_map(table, sid):
     """Hop-distance of every depths node from its biome's ladder mouth
-    (`<biome>_lb`), BFS'd once per night and cached. No longer drives enemy
-    difficulty (that is region-gated now — see `data.region_tier`); retained as a
-    general depth utility (`_node_depth`) and its test. Works for both procedural
-    and committed boards without stamping — mapgen already guarantees the mouth
-    reaches every pocket node."""
+    (`<biome>_lb`), read off the season board's hop matrix once per night and
+    cached. No longer drives enemy difficulty (that is region-gated now — see
+    `data.region_tier`); retained as a general depth utility (`_node_depth`)
+    and its test. Works for both procedural and committed boards without
+    stamping — mapgen already guarantees the mouth reaches every pocket node."""
     cached = _season_depth_cache.get(sid)
     if cached is not None:
         return cached
-    nodes = _season_map(table, sid)
+    board = _season_board(table, sid)
+    # Depths-only walk: every other node (and any dangling id) is off limits.
+    hops = board.hops(blocked=frozenset(
+        nid for nid in board.ids
+        if (board.nodes.get(nid) or {}).get('region') != 'depths'))
     depth = {}
     for biome in data.BIOMES:
         mouth = f'{biome}_lb'
-        if mouth not in nodes:
-            continue
-        depth[mouth] = 0
-        queue, i = [mouth], 0
-        while i < len(queue):
-            cur = queue[i]
-            i += 1
-            for nb in nodes.get(cur, {}).get('neighbors', []):
-                n = nodes.get(nb)
-                if n and n.get('region') == 'depths' and nb not in depth:
-                    depth[nb] = depth[cur] + 1
-                    queue.append(nb)
+        if mouth in board:
+            depth[mouth] = 0
+            for nid, d in hops.from_node(mouth).items():
+                depth.setdefault(nid, d)
     _season_depth_cache[sid] = depth
     return depth
 
@@ -468,9 +862,46 @@ def _get_player(table, sid, user_id):
             migrated = _migrate_passives(passives)
             if migrated != passives:
                 doc['passives'] = migrated
+        _load_battle(table, sid, doc)
     return doc
 
 
+# ── Live battle record ───────────────────────────────────────────────────────
+# A fight in progress lives in its own BATTLE#{uid} item (full npc spec, both
+# combatant snapshots, the growing strikes list) with its own `ver` guard. The
+# player doc only carries `battle: True` while it runs, so every reader that
+# just asks "is this creature fighting?" still works on the raw row. In memory
+# nothing changes: _get_player swaps the flag for the record (doc['battle']) and
+# remembers its version (doc['battleVer']); _put_player splits them apart again.
+# A combat round therefore writes the small battle item and leaves the player
+# doc alone — it is touched at battle start and when _finish_battle clears it.
+
+def _battle_sk(user_id):
+    return f'BATTLE#{user_id}'
+
+
+def _load_battle(table, sid, doc):
+    """Swap a player doc's live-battle flag for the BATTLE# record it stands for.
+    A legacy doc still holding the record inline is left as it is (the next save
+    moves it out); a flag whose record is gone is dropped."""
+    if doc.get('battle') is not True:
+        return
+    item = _get(table, _season_pk(sid), _battle_sk(doc['userId']))
+    if item:
+        doc['battle'], doc['battleVer'] = item['battle'], item['ver']
+    else:
+        doc.pop('battle')
+
+
+# Player fields every action rewrites without meaning anything new mid-fight:
+# regen is recomputed from its own timestamps on every load. A combat round that
+# changed nothing else leaves the player doc unwritten. The idle stamp rides
+# along only while the stored one is fresh: the roll-nudge sweep reads it off
+# PLAYER#, so a long fight still mirrors it there every half idle window.
+_BATTLE_AMBIENT = frozenset({'hp', 'hpUpdatedAt', 'rolls', 'rested', 'rollRegenAt',
+                             'lastActionAt'})
+
+
 def _open_barriers(table, sid):
     """Barrier ids broken open this season — shared by every player."""
     item = _get(table, _season_pk(sid), 'BARRIERS')
@@ -532,7 +963,7 @@ def _wild_warp_dest(nodes, node):
 
 
 def _set_wild_warp_node(table, sid, node):
-    table.put_item(Item={'pk': _season_pk(sid), 'sk': 'WILDWARP', 'node': node})
+    _put(table, Item={'pk': _season_pk(sid), 'sk': 'WILDWARP', 'node': node})
 
 
 def _wild_warp_node(table, sid):
@@ -555,8 +986,8 @@ def _rotate_wild_warp(table, sid, current):
 def _open_barrier(table, sid, barrier_id):
     opened = _open_barriers(table, sid)
     opened.add(barrier_id)
-    table.put_item(Item={'pk': _season_pk(sid), 'sk': 'BARRIERS',
-                         'open': sorted(opened)})
+    _put(table, Item={'pk': _season_pk(sid), 'sk': 'BARRIERS',
+                      'open': sorted(opened)})
 
 
 def _to_decimal(obj):
@@ -575,17 +1006,42 @@ def _to_decimal(obj):
 
 
 def _put_player(table, doc):
-    """Optimistic write: bumps ver, fails (409) if someone wrote in between."""
+    """Optimistic write: bumps ver, fails (409) if someone wrote in between.
+    A doc loaded in this request is written as a delta (see _player_delta); a
+    live battle goes to its own item (see _load_battle), written only once the
+    ver-guarded doc write has landed, so a save that loses the race never
+    advances the fight. A raw row that still carries the bare `battle: True`
+    flag leaves the battle item alone. Inside a batch the acting player's saves
+    are only staged (see _batch)."""
+    uow = _uow_for(table)
+    staged = uow.get('batch') if uow is not None else None
+    if staged is not None and staged['key'] == (doc['pk'], doc['sk']):
+        staged['doc'] = doc       # the batch writes it once, at the end
+        return True
     expected = doc.get('ver', 0)
-    doc = _to_decimal(dict(doc))
-    doc['ver'] = expected + 1
+    before = uow['rows'].get((doc['pk'], doc['sk'])) if uow is not None else None
+    rec, battle_ver = doc.get('battle'), doc.get('battleVer')
+    doc = {k: v for k, v in doc.items() if k not in ('battle', 'battleVer')}
+    if rec:
+        doc['battle'] = True
+    write = _doc_write(table, doc, expected, mid_fight=bool(rec) and battle_ver is not None)
     try:
-        if expected == 0:
-            table.put_item(Item=doc, ConditionExpression='attribute_not_exists(pk)')
-        else:
-            table.put_item(Item=doc,
-                           ConditionExpression='ver = :v',
-                           ExpressionAttributeValues={':v': expected})
+        if write is not None:
+            call, kw, row = write
+            if call == 'put_item':
+                _put(table, **kw)
+            else:
+                _update(table, Item=row, **kw)
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return False
+        raise
+    _index_position(table, doc, before)
+    try:
+        if rec and rec is not True:
+            _put_battle(table, doc, rec, battle_ver)
+        elif not rec and battle_ver is not None:
+            _delete(table, Key={'pk': doc['pk'], 'sk': _battle_sk(doc['userId'])})
     except ClientError as e:
         if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
             return False
@@ -593,6 +1049,156 @@ def _put_player(table, doc):
     return True
 
 
+def _put_battle(table, doc, rec, battle_ver):
+    """Write the live battle record, guarded by its own version. A fight that
+    is just starting (no version yet) overwrites any stale leftover: the doc
+    write that set its flag has already won the player's ver race."""
+    item = {'pk': doc['pk'], 'sk': _battle_sk(doc['userId']),
+            'ver': (battle_ver or 0) + 1, 'battle': _to_decimal(rec)}
+    if battle_ver is None:
+        _put(table, Item=item)
+    else:
+        _put(table, Item=item, ConditionExpression='ver = :v',
+             ExpressionAttributeValues={':v': battle_ver})
+
+
+def _player_delta(table, doc, expected, mid_fight=False):
+    """The UpdateItem that writes only the top-level attributes differing from
+    the row this request loaded (its baseline in the unit of work), as SET/REMOVE
+    under the same `ver` guard — an action usually touches a handful of fields,
+    not metrics/awayEvents/pets/eggs/gear. Mid-fight, a save that changed only
+    _BATTLE_AMBIENT fields needs no write ({}), unless the stored idle stamp has
+    gone stale. None when there is no baseline at this ver to diff against (no
+    request open, or a doc that didn't come through _get)."""
+    uow = _uow_for(table)
+    key = (doc['pk'], doc['sk'])
+    base = uow['rows'].get(key) if uow is not None else None
+    if not base or base.get('ver') != expected:
+        return None
+    names, values, sets = {}, {':v': expected, ':nv': expected + 1}, ['ver = :nv']
+    for i, (k, v) in enumerate(doc.items()):
+        if k in ('pk', 'sk', 'ver') or (k in base and _clean(base[k]) == v):
+            continue
+        names[f'#a{i}'] = k
+        values[f':a{i}'] = _to_decimal(v)
+        sets.append(f'#a{i} = :a{i}')
+    gone = [k for k in base if k not in doc]
+    ambient = (_BATTLE_AMBIENT if _acted_within(base, data.ROLL_NUDGE_IDLE_MIN / 2)
+               else _BATTLE_AMBIENT - {'lastActionAt'})
+    if mid_fight and not gone and set(names.values()) <= ambient:
+        return {}
+    for i, k in enumerate(gone):
+        names[f'#r{i}'] = k
+    expr = 'SET ' + ', '.join(sets)
+    if gone:
+        expr += ' REMOVE ' + ', '.join(f'#r{i}' for i in range(len(gone)))
+    kw = {'ExpressionAttributeNames': names} if names else {}
+    return dict(Key={'pk': doc['pk'], 'sk': doc['sk']}, UpdateExpression=expr,
+                ConditionExpression='ver = :v', ExpressionAttributeValues=values, **kw)
+
+
+def _doc_write(table, doc, expected, mid_fight=False):
+    """The ver-guarded write that saves a player doc (its battle record already
+    split off), as (call, kwargs, row): `table.<call>(**kwargs)` and the row as it
+    stands once that lands. A delta when the request holds a baseline, else a
+    whole put; None when a mid-fight save has nothing to write."""
+    if expected:
+        kw = _player_delta(table, doc, expected, mid_fight)
+        if kw == {}:
+            return None
+        if kw is not None:
+            return 'update_item', kw, dict(doc, ver=expected + 1)
+    row = _to_decimal(doc)
+    row['ver'] = expected + 1
+    if not expected:
+        return 'put_item', {'Item': row, 'ConditionExpression': 'attribute_not_exists(pk)'}, row
+    return 'put_item', {'Item': row, 'ConditionExpression': 'ver = :v',
+                        'ExpressionAttributeValues': {':v': expected}}, row
+
+
+# ── Occupancy index ──────────────────────────────────────────────────────────
+# Who stands where, without reading the roster: one packed OCCUPANCY row per
+# season (it sorts below PLAYER#, so the poll's creature range never drags it
+# in), one top-level attribute per userId holding that creature's node and the
+# few fields _occupants shows. Every move, freemove, ladder crossing, warp,
+# teleport, respawn and admin teleport lands through _put_player, which rewrites
+# a creature's entry only when one of _POS_FIELDS changed. The row is built
+# from the roster the first time it is read (a season from before the index, or
+# a night nobody has looked at yet); until then the entry writes just accumulate.
+_POS_SK = 'OCCUPANCY'
+_POS_FIELDS = ('position', 'username', 'form', 'creatureName', 'level',
+               'shieldUntil', 'stance')
+
+
+def _pos_entry(doc):
+    return {f: doc[f] for f in _POS_FIELDS if doc.get(f) is not None}
+
+
+def _index_position(table, doc, before):
+    """Rewrite `doc`'s entry in the occupancy index unless `before` (the row
+    as this request last saw it) already matches it."""
+    entry = _pos_entry(doc)
+    if before and _pos_entry(_clean(before)) == entry:
+        return
+    key = {'pk': doc['pk'], 'sk': _POS_SK}
+    row = table.update_item(
+        Key=key, UpdateExpression='SET #u = :e',
+        ExpressionAttributeNames={'#u': doc['userId']},
+        ExpressionAttributeValues={':e': _to_decimal(entry)},
+        ReturnValues='ALL_NEW')['Attributes']
+    _remember(table, (key['pk'], key['sk']), row)
+
+
+def _unindex_position(table, sid, user_id):
+    key = {'pk': _season_pk(sid), 'sk': _POS_SK}
+    row = table.update_item(Key=key, UpdateExpression='REMOVE #u',
+                            ExpressionAttributeNames={'#u': user_id},
+                            ReturnValues='ALL_NEW')['Attributes']
+    _remember(table, (key['pk'], key['sk']), row)
+
+
+def _positions(table, sid):
+    """{userId: index entry} for every creature in the season — one GetItem.
+
+    A season without the index builds it from the roster. The build never
+    overwrites an _index_position SET that lands between the roster read and
+    the write: the row is created only if absent, and when a SET got there
+    first the roster entries are merged in only where no entry exists yet."""
+    pk = _season_pk(sid)
+    row = _get(table, pk, _POS_SK)
+    if not row or not row.get('built'):
+        entries = {p['userId']: _pos_entry(p) for p in _all_players(table, sid)}
+        if not row:
+            try:
+                row = {'pk': pk, 'sk': _POS_SK, 'built': True, **entries}
+                _put(table, Item=_to_decimal(row),
+                     ConditionExpression='attribute_not_exists(pk)')
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
+                row = _get(table, pk, _POS_SK)   # _put forgot it: a fresh read
+        if not row.get('built'):
+            row = _merge_positions(table, pk, entries)
+    return {uid: e for uid, e in row.items() if uid not in ('pk', 'sk', 'built')}
+
+
+def _merge_positions(table, pk, entries):
+    """Mark the index built, adding the roster's entry for each creature that
+    has none yet (an entry already there was written after the roster read)."""
+    names, values = {}, {':t': True}
+    sets = ['built = :t']
+    for i, (uid, entry) in enumerate(entries.items()):
+        names[f'#u{i}'], values[f':e{i}'] = uid, _to_decimal(entry)
+        sets.append(f'#u{i} = if_not_exists(#u{i}, :e{i})')
+    kw = {'ExpressionAttributeNames': names} if names else {}
+    key = {'pk': pk, 'sk': _POS_SK}
+    row = table.update_item(Key=key, UpdateExpression='SET ' + ', '.join(sets),
+                            ExpressionAttributeValues=values, ReturnValues='ALL_NEW',
+                            **kw)['Attributes']
+    _remember(table, (pk, _POS_SK), row)
+    return row
+
+
 def _get_perm(table, user_id):
     doc = _get(table, f'UNDERCITYUSER#{user_id}', 'META')
     if not doc:
@@ -620,19 +1226,19 @@ def _bank_perm_renown(table, sid, user_id, amount):
 
     Every mid-night Renown payout goes through here. The ledger is season-scoped
     rather than a counter on the player doc because the world-event payout credits
-    non-killers through _pay_world_reward_retry, which owns its own optimistic-lock
+    non-killers through _pay_world_rewards, which owns its own optimistic-lock
     retry loop — a separate item can't lose a grant to a write conflict."""
     amount = int(amount or 0)
     if not amount:
         return
     perm = _get_perm(table, user_id)
     perm['renown'] = perm.get('renown', 0) + amount
-    table.put_item(Item=perm)
+    _put(table, Item=perm)
     sk = _perm_renown_sk(user_id)
     rec = _get(table, _season_pk(sid), sk) or {'pk': _season_pk(sid), 'sk': sk,
                                                'amount': 0}
     rec['amount'] = int(rec.get('amount', 0)) + amount
-    table.put_item(Item=rec)
+    _put(table, Item=rec)
 
 
 def _refund_perm_renown(table, sid):
@@ -640,15 +1246,12 @@ def _refund_perm_renown(table, sid):
     Floors each wallet at 0 — a player who earned 10 then spent down to 5 lands on
     0, never negative (a discard doesn't refund what they bought). Returns the
     number of wallets touched."""
-    recs = table.query(
-        KeyConditionExpression='pk = :pk AND begins_with(sk, :sk)',
-        ExpressionAttributeValues={':pk': _season_pk(sid), ':sk': 'PERMRENOWN#'})['Items']
-    for raw in recs:
-        rec = _clean(raw)
+    recs = _query_rows(table, _season_pk(sid), 'PERMRENOWN#')
+    for rec in recs:
         user_id = rec['sk'].split('#', 1)[1]
         perm = _get_perm(table, user_id)
         perm['renown'] = max(0, perm.get('renown', 0) - int(rec.get('amount', 0)))
-        table.put_item(Item=perm)
+        _put(table, Item=perm)
     return len(recs)
 
 
@@ -1800,11 +2403,8 @@ def _umori_bids(table, sid, window):
     records (separate items so concurrent bidders never clobber each other).
     Returns {userId: {'amount': int, 'username': str, 'ts': str}}."""
     prefix = f'POST#UMORI#{window}#BID#'
-    rows = table.query(
-        KeyConditionExpression='pk = :pk AND begins_with(sk, :sk)',
-        ExpressionAttributeValues={':pk': _season_pk(sid), ':sk': prefix})['Items']
     out = {}
-    for r in (_clean(x) for x in rows):
+    for r in _query_rows(table, _season_pk(sid), prefix):
         uid = r['sk'].split('#BID#', 1)[1]
         out[uid] = {'amount': int(r['amount']),
                     'username': r.get('username', 'someone'), 'ts': r.get('ts', '')}
@@ -2046,7 +2646,7 @@ def _create_market_listing(table, sid, doc, kind, item_id, price, payload=None):
         'kind': kind, 'itemId': item_id, 'price': int(price), 'createdAt': _now()}
     if payload is not None:
         item['payload'] = payload
-    table.put_item(Item=item)
+    _put(table, Item=item)
     return listing_id
 
 
@@ -2094,8 +2694,8 @@ def _market_buy_instance(table, sid, doc, listing, kind):
     if not obj:
         return _err('That listing is gone.', 409)
     try:
-        table.delete_item(Key={'pk': pk, 'sk': f'MARKET#{listing_id}'},
-                          ConditionExpression='attribute_exists(sk)')
+        _delete(table, Key={'pk': pk, 'sk': f'MARKET#{listing_id}'},
+                ConditionExpression='attribute_exists(sk)')
     except ClientError as e:
         if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
             return _err('That listing just sold.', 409)
@@ -2125,8 +2725,8 @@ def _market_cancel_instance(table, sid, doc, listing, kind):
     if not obj:
         return _err('That listing is gone.', 409)
     try:
-        table.delete_item(Key={'pk': pk, 'sk': f'MARKET#{listing_id}'},
-                          ConditionExpression='attribute_exists(sk)')
+        _delete(table, Key={'pk': pk, 'sk': f'MARKET#{listing_id}'},
+                ConditionExpression='attribute_exists(sk)')
     except ClientError as e:
         if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
             return _err('That listing just sold.', 409)
@@ -2141,9 +2741,7 @@ def _market_cancel_instance(table, sid, doc, listing, kind):
 
 def _market_listing_count(table, sid, seller_id):
     """How many active listings `seller_id` currently has on the market."""
-    active = table.query(
-        KeyConditionExpression='pk = :pk AND begins_with(sk, :sk)',
-        ExpressionAttributeValues={':pk': _season_pk(sid), ':sk': 'MARKET#'})['Items']
+    active = _query_rows(table, _season_pk(sid), 'MARKET#')
     return sum(1 for m in active if m.get('sellerId') == seller_id)
 
 
@@ -2359,8 +2957,8 @@ def _market_buy(table, sid, doc, payload):
     if len(doc.get(spec['field']) or []) >= _kind_cap(doc, kind):
         return _err(f"Your {_MARKET_FULL_LABEL[kind]} is full — make room first.", 409)
     try:
-        table.delete_item(Key={'pk': pk, 'sk': f'MARKET#{listing_id}'},
-                          ConditionExpression='attribute_exists(sk)')
+        _delete(table, Key={'pk': pk, 'sk': f'MARKET#{listing_id}'},
+                ConditionExpression='attribute_exists(sk)')
     except ClientError as e:
         if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
             return _err('That listing just sold.', 409)
@@ -2395,8 +2993,8 @@ def _market_cancel(table, sid, doc, payload):
     if len(doc.get(spec['field']) or []) >= _kind_cap(doc, kind):
         return _err(f"Your {_MARKET_FULL_LABEL[kind]} is full — make room first.", 409)
     try:
-        table.delete_item(Key={'pk': pk, 'sk': f'MARKET#{listing_id}'},
-                          ConditionExpression='attribute_exists(sk)')
+        _delete(table, Key={'pk': pk, 'sk': f'MARKET#{listing_id}'},
+                ConditionExpression='attribute_exists(sk)')
     except ClientError as e:
         if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
             return _err('That listing just sold.', 409)
@@ -2439,7 +3037,7 @@ def _market_edit(table, sid, doc, payload):
         return _ok(doc, text='Price unchanged.')
     listing['price'] = price
     try:
-        table.put_item(Item=listing, ConditionExpression='attribute_exists(sk)')
+        _put(table, Item=listing, ConditionExpression='attribute_exists(sk)')
     except ClientError as e:
         if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
             return _err('That listing just sold.', 409)
@@ -2554,24 +3152,144 @@ def handle_map(table, query_params):
     in the BoardMap shape the client renders. `?sample=<seed>` instead returns a
     preview: the surface plus freshly generated depths for that seed, ignoring the
     flag and the active season (the map editor uses this to browse generator
-    output). Falls back to the committed board when no season is active."""
-    doc = dict(data._MAP_DOC)     # worldW/H, gate, boss, regions, decals, labels
-    sample = (query_params or {}).get('sample')
+    output). `?samples=<seed>,<seed>,...` is the batch form: just each seed's
+    generated depths pockets, no surface (the caller already has it). Falls
+    back to the committed board when no season is active."""
+    params = query_params or {}
+    if params.get('samples'):
+        seeds = [s for s in params['samples'].split(',') if s]
+        if len(seeds) > MAX_SAMPLE_BATCH:
+            return _err(f'At most {MAX_SAMPLE_BATCH} samples per call')
+        return 200, {'samples': [{'seed': s, 'depths': _sample_depths(s)} for s in seeds]}
+    sample = params.get('sample')
     if sample:
-        depths = {n['id']: n for n in mapgen.generate_all_depths(sample)}
-        nodes = data.merge_map(depths)
-    else:
-        sid, config = _active_season(table)
-        # _season_map handles a None sid (no active season) by returning the
-        # committed board, so no direct read of the global is needed here.
-        nodes = _season_map(table, sid)
+        depths = {n['id']: n for n in _sample_depths(sample)}
+        return 200, _map_doc(data.merge_map(depths))
+    sid, config = _active_season(table)
+    # _season_map handles a None sid (no active season) by returning the
+    # committed board, so no direct read of the global is needed here.
+    return 200, _map_doc(_season_map(table, sid))
+
+
+def _map_doc(nodes):
+    doc = dict(data._MAP_DOC)     # worldW/H, gate, boss, regions, decals, labels
     doc['nodes'] = list(nodes.values())
-    return 200, doc
+    return doc
+
+
+MAX_SAMPLE_BATCH = 12
+SAMPLE_CACHE_SIZE = 64
+_sample_depths_cache = OrderedDict()   # preview seed -> generated depths, LRU
+
+
+def _sample_depths(seed):
+    """Generated depths for a map-editor preview seed. A preview is a pure
+    function of its seed, so the last SAMPLE_CACHE_SIZE seeds are kept
+    (least recently used evicted) and re-browsing them costs nothing."""
+    depths = _sample_depths_cache.get(seed)
+    if depths is None:
+        depths = mapgen.generate_all_depths(seed)
+        _sample_depths_cache[seed] = depths
+        if len(_sample_depths_cache) > SAMPLE_CACHE_SIZE:
+            _sample_depths_cache.popitem(last=False)
+    else:
+        _sample_depths_cache.move_to_end(seed)
+    return depths
+
+
+_map_body_cache = {}   # sid -> (etag, serialized GET /game/map body) for the night
+
+
+def map_body(table):
+    """The active night's GET /game/map, serialized once per sid: (etag, body).
+    The board is fixed for the whole night, so after the first load a warm
+    container answers from here off the single META read, and the etag (a hash
+    of the body) lets a client that already holds it get a 304."""
+    meta = _get(table, META_PK, 'CURRENT')
+    sid = meta['seasonId'] if meta else None
+    cached = _map_body_cache.get(sid)
+    if cached is None:
+        body = ddb_json.dumps(_map_doc(_season_map(table, sid)))
+        cached = (f'"{hashlib.sha256(body.encode()).hexdigest()[:32]}"', body)
+        _map_body_cache[sid] = cached
+    return cached
 
 
 def handle_state(table, query_params):
-    user_id = (query_params or {}).get('userId') or ''
-    sid, config = _active_season(table)
+    """GET /game/state. Every response carries a `cursor`; passing it back as
+    `since` turns the next poll into a delta (`delta: true`): `players` holds only
+    the creatures whose doc changed (`gone` lists the ones that left), `events`
+    and `chat` only what was posted after the cursor, and the shared-world blocks
+    (season, bazaars, market, facilities, swarm, ...) are present only when a
+    shared row changed or a stock/Umori/Enraged window rolled — absent means
+    "keep what you have". `you`, `umori`, `battle` and `wardrobe` are always
+    sent whole. A cursor from another season (or garbage) gets a full payload.
+
+    Other creatures' display-only regen (hp/rolls ticking up between writes)
+    only refreshes on their next write or a full poll."""
+    params = query_params or {}
+    user_id = params.get('userId') or ''
+    with _unit_of_work(table):
+        meta = _get(table, META_PK, 'CURRENT')
+        sid = meta['seasonId'] if meta else None
+        cursor = _read_cursor(params.get('since'), sid)
+        world = _world_seen(table, _season_pk(sid)) if sid else 0
+        fresh = (cursor is None or cursor['w'] != world
+                 or cursor['t'] != _state_windows())
+        _prime_season(table, sid, user_id, players_only=not fresh)
+        return _state(table, sid, user_id, cursor, fresh, world)
+
+
+def _state_windows():
+    """The wall-clock windows shared state rolls over on without a write."""
+    return [_shop_window(), _umori_window(), _enraged_window()]
+
+
+def _read_cursor(since, sid):
+    """Decode a `since` cursor; None when absent, malformed, or another season's.
+    Every field is checked against the shape _write_cursor produces — a forged
+    one falls back to a full snapshot instead of reaching the queries."""
+    if not since:
+        return None
+    try:
+        cursor = json.loads(base64.urlsafe_b64decode(since.encode()))
+    except (ValueError, TypeError):
+        return None
+    if (not isinstance(cursor, dict) or cursor.get('s') != sid
+            or not isinstance(cursor.get('p'), dict)
+            or not all(_is_int(v) for v in cursor['p'].values())
+            or not _is_int(cursor.get('w'))
+            or not isinstance(cursor.get('t'), list)
+            or not all(_is_int(v) for v in cursor['t'])
+            or not _cursor_sk(cursor.get('e'), 'EVENT#')
+            or not _cursor_sk(cursor.get('c'), 'CHAT#')):
+        return None
+    return cursor
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _cursor_sk(value, prefix):
+    """A cursor's last-seen sk: absent, or a key of the right row family."""
+    return value is None or (isinstance(value, str) and value.startswith(prefix))
+
+
+def _write_cursor(sid, world, events, chat, vers, cursor):
+    """Encode where this response leaves the client: the world version and
+    windows it saw, its newest event/chat sks, and every creature's ver."""
+    last_event = events[0]['sk'] if events else (cursor or {}).get('e')
+    last_chat = chat[-1]['sk'] if chat else (cursor or {}).get('c')
+    raw = json.dumps({'s': sid, 'w': world, 't': _state_windows(),
+                      'e': last_event, 'c': last_chat, 'p': vers},
+                     separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _state(table, sid, user_id, cursor=None, fresh=True, world=0):
+    # Same lookup as _active_season, minus a second read of the META pointer.
+    config = _get(table, _season_pk(sid), 'CONFIG') if sid else None
     _set_dev_night(config)
 
     if not sid or not config:
@@ -2581,58 +3299,31 @@ def handle_state(table, query_params):
 
     nodes = _season_map(table, sid)
     pk = _season_pk(sid)
-    resp = table.query(
-        KeyConditionExpression='pk = :pk AND sk >= :sk',
-        ExpressionAttributeValues={':pk': pk, ':sk': 'PLAYER#'})
-    items = [_clean(i) for i in resp['Items']]
+    # A delta poll over an unmoved world needs the creatures and nothing else
+    # from the sk >= 'PLAYER#' range.
+    items = (_query_rows(table, pk, start='PLAYER#') if fresh
+             else _query_rows(table, pk, 'PLAYER#'))
+    since = cursor or {}
 
-    ev = table.query(
-        KeyConditionExpression='pk = :pk AND begins_with(sk, :sk)',
-        ExpressionAttributeValues={':pk': pk, ':sk': 'EVENT#'},
-        ScanIndexForward=False, Limit=150)
-    events = [_clean(i) for i in ev['Items']]
+    events = _query_rows(table, pk, 'EVENT#', newest_first=True, limit=150,
+                         after=since.get('e'))
 
     # Plaza chat: newest CHAT_STATE_LIMIT, flipped back to chronological. CHAT#
-    # sorts before PLAYER#, so (like FIRST#/FOG#) it needs its own query.
-    ch = table.query(
-        KeyConditionExpression='pk = :pk AND begins_with(sk, :sk)',
-        ExpressionAttributeValues={':pk': pk, ':sk': 'CHAT#'},
-        ScanIndexForward=False, Limit=CHAT_STATE_LIMIT)
-    chat = [_clean(i) for i in ch['Items']][::-1]
-
-    mk = table.query(
-        KeyConditionExpression='pk = :pk AND begins_with(sk, :sk)',
-        ExpressionAttributeValues={':pk': pk, ':sk': 'MARKET#'})
-    market = []
-    for m in (_clean(i) for i in mk['Items']):
-        kind, item_id = _market_kind(m)
-        market.append({'id': m['id'], 'sellerId': m['sellerId'],
-                       'sellerName': m.get('sellerName', ''),
-                       'kind': kind, 'itemId': item_id, 'price': int(m['price'])})
-
-    # Season-global first-conqueror records. FIRST# sorts before PLAYER#, so it
-    # is NOT covered by the sk >= 'PLAYER#' range query above — it needs its own.
-    fr = table.query(
-        KeyConditionExpression='pk = :pk AND begins_with(sk, :sk)',
-        ExpressionAttributeValues={':pk': pk, ':sk': 'FIRST#'})
-    firsts = {i['sk'].replace('FIRST#', ''):
-              {'by': i.get('by'), 'at': i.get('at'), 'kind': i.get('kind')}
-              for i in (_clean(x) for x in fr['Items'])}
-
-    # Ashen Fog reveals: FOG# also sorts before PLAYER#, so (like FIRST#) it needs
-    # its own query. Maps a revealed fog node -> the space type it locked to.
-    fg = table.query(
-        KeyConditionExpression='pk = :pk AND begins_with(sk, :sk)',
-        ExpressionAttributeValues={':pk': pk, ':sk': 'FOG#'})
-    fog_reveals = {i['sk'].replace('FOG#', ''): i.get('revealed')
-                   for i in (_clean(x) for x in fg['Items']) if i.get('revealed')}
+    # sorts before PLAYER#, so (like FIRST#/FOG#) it needs its own read.
+    chat = _query_rows(table, pk, 'CHAT#', newest_first=True,
+                       limit=CHAT_STATE_LIMIT, after=since.get('c'))[::-1]
 
     players, you, result, posts, sites = [], None, None, {}, {}
     veins, vaults, shops = {}, {}, {}
     umori_reveal = None
+    vers = {}
     now = _now()
     for item in items:
         if item['sk'].startswith('PLAYER#'):
+            vers[item['userId']] = item.get('ver', 0)
+            if (item['userId'] != user_id
+                    and since.get('p', {}).get(item['userId']) == vers[item['userId']]):
+                continue  # unchanged since the cursor — the client already has it
             engine.regen_hp(item, now)  # display-only; persisted on next action
             engine.regen_rolls(item, now)
             _expire_buffs(item)
@@ -2641,7 +3332,8 @@ def handle_state(table, query_params):
             players.append(_public_player(item))
             if item['userId'] == user_id:
                 umori_reveal = _collect_umori(table, sid, item)  # settle closed auctions
-                you = {k: v for k, v in item.items() if k not in ('pk', 'sk')}
+                _load_battle(table, sid, item)
+                you = {k: v for k, v in item.items() if k not in ('pk', 'sk', 'battleVer')}
                 you.update(_roll_meta(item))
                 you['perks'] = sorted(engine.attribute_perks(item))
                 # Report EFFECTIVE max HP (base + gear + perks), matching `_ok`
@@ -2665,7 +3357,7 @@ def handle_state(table, query_params):
         elif item['sk'].startswith('SHOP#'):
             shops[item['sk'].replace('SHOP#', '')] = item
         elif item['sk'] == 'RESULT':
-            result = {k: v for k, v in item.items() if k not in ('pk', 'sk')}
+            result = ddb_json.public(item)
 
     # A pending interactive battle: hand the client a SANITIZED resume so a
     # refresh can reopen the fight (otherwise the server's battle-guard soft-
@@ -2676,17 +3368,45 @@ def handle_state(table, query_params):
     if you is not None and you.get('battle'):
         battle_resume = _battle_resume(you.pop('battle'), you.get('hp', 0))
 
+    # Umori the wandering collector: just its current node/window for the auction
+    # block (no display stock — the auction is bid-driven, not barter).
+    umori_win = _umori_window()
+    umori = {'node': _umori_node(umori_win), 'movesAt': _umori_window_end(umori_win),
+             'minBid': data.UMORI_MIN_BID, 'reserves': data.UMORI_RESERVES,
+             'yourBid': (you.get('umoriBidAmount', 0)
+                         if you and you.get('umoriBidWindow') == umori_win else 0),
+             **({'reveal': umori_reveal} if umori_reveal else {})}
+    public_events = [ddb_json.public(e) for e in events]
+    public_chat = [ddb_json.public(m) for m in chat]
+    if not fresh:
+        return _state_reply(table, sid, user_id, cursor, world, vers, events, chat, {
+            'you': you, 'players': players, 'umori': umori,
+            'events': public_events, 'chat': public_chat, 'battle': battle_resume})
+
+    market = []
+    for m in _query_rows(table, pk, 'MARKET#'):
+        kind, item_id = _market_kind(m)
+        market.append({'id': m['id'], 'sellerId': m['sellerId'],
+                       'sellerName': m.get('sellerName', ''),
+                       'kind': kind, 'itemId': item_id, 'price': int(m['price'])})
+
+    # Season-global first-conqueror records. FIRST# sorts before PLAYER#, so it
+    # is NOT covered by the sk >= 'PLAYER#' range read above — it needs its own.
+    firsts = {i['sk'].replace('FIRST#', ''):
+              {'by': i.get('by'), 'at': i.get('at'), 'kind': i.get('kind')}
+              for i in _query_rows(table, pk, 'FIRST#')}
+
+    # Ashen Fog reveals: FOG# also sorts before PLAYER#, so (like FIRST#) it needs
+    # its own read. Maps a revealed fog node -> the space type it locked to.
+    fog_reveals = {i['sk'].replace('FOG#', ''): i.get('revealed')
+                   for i in _query_rows(table, pk, 'FOG#') if i.get('revealed')}
+
     # Show a display-seeded stock for any post nobody has traded at yet, so the
     # exchange renders from turn one without a write on read.
     for nid, n in nodes.items():
         if n['type'] == 'trading_post' and nid not in posts:
             posts[nid] = _seed_stock()
 
-    # Umori the wandering collector: just its current node/window for the auction
-    # block below (no display stock — the auction is bid-driven, not barter).
-    umori_win = _umori_window()
-    umori_node = _umori_node(umori_win)
-
     # Grime Gorger claims. Every facility view below is seeded off the EFFECTIVE
     # type, not the raw node: a bought Bazaar Post / Dig Site / Crystal Vein is a
     # real one, and would otherwise render as a facility with nothing in it.
@@ -2738,11 +3458,7 @@ def handle_state(table, query_params):
         'you': you,
         'players': players,
         'tradingPosts': posts,
-        'umori': {'node': umori_node, 'movesAt': _umori_window_end(umori_win),
-                  'minBid': data.UMORI_MIN_BID, 'reserves': data.UMORI_RESERVES,
-                  'yourBid': (you.get('umoriBidAmount', 0)
-                              if you and you.get('umoriBidWindow') == umori_win else 0),
-                  **({'reveal': umori_reveal} if umori_reveal else {})},
+        'umori': umori,
         'bazaars': bazaars,
         'market': market,
         'excavations': excavations,
@@ -2761,19 +3477,29 @@ def handle_state(table, query_params):
         'worldEvent': _world_event_public(table, sid),
         'enraged': _enraged_public(table, sid),
         'guardians': _guardian_pools(table, sid),
-        'events': [{k: v for k, v in e.items() if k not in ('pk', 'sk')} for e in events],
-        'chat': [{k: v for k, v in m.items() if k not in ('pk', 'sk')} for m in chat],
+        'events': public_events,
+        'chat': public_chat,
         'result': result if config.get('status') == 'ended' else None,
         'battle': battle_resume,
     }
+    if config.get('status') == 'ended':
+        out['hallOfFame'] = _hall_of_fame(table)
+    return _state_reply(table, sid, user_id, cursor, world, vers, events, chat, out)
+
+
+def _state_reply(table, sid, user_id, cursor, world, vers, events, chat, out):
+    """Finish a state payload: the caller's wardrobe, the delta markers, and the
+    cursor for the next poll."""
+    if cursor is not None:
+        out['delta'] = True
+        out['gone'] = sorted(set(cursor.get('p', {})) - set(vers))
+    out['cursor'] = _write_cursor(sid, world, events, chat, vers, cursor)
     if user_id:
         perm = _get_perm(table, user_id)
         out['wardrobe'] = {'hats': perm['hats'], 'paints': perm['paints'],
                            'effects': perm['effects'],
                            'seals': perm['seals'], 'nights': perm.get('nights', 0),
                            'renown': perm.get('renown', 0)}
-    if config.get('status') == 'ended':
-        out['hallOfFame'] = _hall_of_fame(table)
     return 200, out
 
 
@@ -2815,17 +3541,17 @@ def _public_player(p):
 
 
 def _hall_of_fame(table):
-    resp = table.query(
-        KeyConditionExpression='pk = :pk',
-        ExpressionAttributeValues={':pk': HOF_PK},
-        ScanIndexForward=False, Limit=20)
-    return [{k: v for k, v in _clean(i).items() if k not in ('pk', 'sk')}
-            for i in resp['Items']]
+    return [ddb_json.public(i) for i in _iter_query(table, HOF_PK, newest_first=True, limit=20)]
 
 
 # ── POST /game/action ────────────────────────────────────────────────────────
 
 def handle_action(table, body):
+    with _unit_of_work(table):
+        return _action(table, body)
+
+
+def _action(table, body):
     try:
         req = json.loads(body) if isinstance(body, str) else body
     except (json.JSONDecodeError, TypeError):
@@ -2913,6 +3639,12 @@ def handle_action(table, body):
         'use-pet-ability': _use_pet_ability,
         'pet-scout-peek': _pet_scout_peek, 'pet-scout-buy': _pet_scout_buy,
     }
+    if atype == 'batch':
+        return _batch(table, sid, doc, payload, handlers)
+    return _dispatch(handlers, table, sid, doc, atype, payload)
+
+
+def _dispatch(handlers, table, sid, doc, atype, payload):
     handler = handlers.get(atype)
     if not handler:
         return _err(f'Unknown action: {atype}')
@@ -2930,6 +3662,85 @@ _BATTLE_ALLOWED_ACTIONS = frozenset({
 })
 
 
+# ── Batched actions ──────────────────────────────────────────────────────────
+# {type: 'batch', payload: {actions: [{type, payload}, ...]}} runs a turn's
+# worth of player actions (roll → move → combat-rounds ...) against the one doc
+# this request loaded: one season read, one regen pass, one ver-guarded save.
+
+MAX_BATCH_STEPS = 16
+
+# Decisions a step can leave open on the doc, and the actions that answer them.
+# A batch only carries on past an open decision when its next step answers it;
+# anything else is the client's call to make.
+_BATCH_DECISIONS = {
+    'pendingMove': frozenset({'move', 'ladder-cross', 'roll'}),   # roll: Fleetfoot reroll
+    'pendingRespawn': frozenset({'respawn', 'roll'}),
+    'pendingTrophy': frozenset({'trophy-choose'}),
+    'pendingLoot': frozenset({'solve-loot-puzzle', 'cancel-loot-puzzle'}),
+    'pendingPickups': frozenset({'pickup-resolve'}),
+    'battle': _BATTLE_ALLOWED_ACTIONS,
+}
+
+
+def _batch(table, sid, doc, payload, handlers):
+    """Apply `payload['actions']` in order. While the batch runs, the caller's
+    saves are staged (see _put_player) rather than written; a step that fails
+    is rolled back to the doc as it stood before it, exactly as a failed single
+    action saves nothing. Stops at the first error, at an open decision the
+    next step doesn't answer, or after a step that wrote any row besides the
+    caller's doc (an event, a listing, world damage), then writes the doc once.
+    So the doc save follows such a write as closely as in a single action, and
+    a save that loses its race never strands an earlier step's writes behind a
+    409. Returns each step's result (its body minus `you`) plus the final
+    `you`; a batch whose first step fails returns that step's error as-is."""
+    steps = payload.get('actions')
+    if not isinstance(steps, list) or not steps:
+        return _err('actions must be a non-empty list')
+    if len(steps) > MAX_BATCH_STEPS:
+        return _err(f'At most {MAX_BATCH_STEPS} actions per batch.')
+    uow = _uow_for(table)
+    staged = uow['batch'] = {'key': (doc['pk'], doc['sk']), 'doc': None, 'shared': False}
+    results, stopped, dirty = [], None, False
+    try:
+        for i, step in enumerate(steps):
+            step = step if isinstance(step, dict) else {}
+            atype = step.get('type')
+            before = copy.deepcopy(doc)
+            staged['doc'] = None
+            if atype == 'batch':
+                status, body = _err('Batches do not nest.')
+            else:
+                status, body = _dispatch(handlers, table, sid, doc, atype,
+                                         step.get('payload') or {})
+            if status == 200 and staged['doc'] is not None:
+                doc, dirty = staged['doc'], True
+            else:
+                doc = before
+            if status != 200 and not results:
+                return status, body
+            results.append({'type': atype, 'status': status,
+                            **{k: v for k, v in body.items() if k != 'you'}})
+            if status != 200:
+                stopped = 'error'
+                break
+            nxt = steps[i + 1] if i + 1 < len(steps) else None
+            nxt = nxt.get('type') if isinstance(nxt, dict) else None
+            if nxt and staged['shared']:
+                stopped = 'shared'
+                break
+            if nxt and any(doc.get(k) and nxt not in answers
+                           for k, answers in _BATCH_DECISIONS.items()):
+                stopped = 'decision'
+                break
+    finally:
+        uow.pop('batch', None)
+    if dirty:
+        conflict = _save_or_conflict(table, doc)
+        if conflict:
+            return conflict
+    return _ok(doc, steps=results, stopped=stopped)
+
+
 # Max length of a player's status-bubble text (mirror: STATUS_MAX in
 # src/app/undercity/tabs/*.component.ts). Trim + collapse whitespace, then cap.
 STATUS_MAX_LEN = 24
@@ -2978,7 +3789,7 @@ def _roll_meta(doc):
 
 
 def _ok(doc, **extra):
-    you = {k: v for k, v in doc.items() if k not in ('pk', 'sk')}
+    you = {k: v for k, v in doc.items() if k not in ('pk', 'sk', 'battleVer')}
     you.update(_roll_meta(doc))
     you['perks'] = sorted(engine.attribute_perks(doc))
     # Report the EFFECTIVE max HP (base + gear + perks), not the raw base. hp is
@@ -3042,7 +3853,7 @@ def _bank_reward(table, sid, user_id, is_winner, game_name=None):
         rec.setdefault('items', []).append(data.roll_consumable(_rng))
     if game_name:
         rec['game'] = game_name   # names the most recent game if several bank
-    table.put_item(Item=rec)
+    _put(table, Item=rec)
 
 
 def grant_board_game_rewards(table, sid, participant_ids, winner_ids, game_name=None):
@@ -3073,7 +3884,7 @@ def apply_banked_rewards(table, sid, user_id, doc):
     items = rec.get('items') or []
     for item in items:
         _acquire(doc, 'consumable', item, 'reward')   # parks if the bag is full
-    table.delete_item(Key={'pk': _reward_pk(sid), 'sk': _reward_sk(user_id)})
+    _delete(table, Key={'pk': _reward_pk(sid), 'sk': _reward_sk(user_id)})
     _push_away_event(doc, {'kind': 'reward', 'game': rec.get('game'),
                            'rolls': rolls, 'items': len(items), 'at': _now()})
     extra = f", {len(items)} item(s)" if items else ''
@@ -3125,7 +3936,7 @@ def _season_start(table, payload):
     # Promote a waiting "lobby" season into the live night in place: keep the
     # same id and its pre-generated maps, just flip status and stamp startedAt.
     if config_old and config_old.get('status') == 'lobby':
-        table.put_item(Item=dict(config_old, status='active', startedAt=started_at))
+        _put(table, Item=dict(config_old, status='active', startedAt=started_at))
         _event(table, sid_old, 'season',
                'A new night falls on the Undercity. The swarm stirs…')
         return 200, {'ok': True, 'seasonId': sid_old}
@@ -3135,14 +3946,14 @@ def _season_start(table, payload):
         _archive_season(table, sid_old, config_old)
 
     sid = datetime.utcnow().strftime('%Y%m%d-%H%M%S')
-    table.put_item(Item={'pk': _season_pk(sid), 'sk': 'CONFIG',
-                         'status': 'active', 'hostKey': host_key,
-                         'startedAt': started_at, 'bossPhase': False})
-    table.put_item(Item={'pk': META_PK, 'sk': 'CURRENT', 'seasonId': sid})
+    _put(table, Item={'pk': _season_pk(sid), 'sk': 'CONFIG',
+                      'status': 'active', 'hostKey': host_key,
+                      'startedAt': started_at, 'bossPhase': False})
+    _put(table, Item={'pk': META_PK, 'sk': 'CURRENT', 'seasonId': sid})
     if data.PROCEDURAL_DUNGEONS:
         # Fresh mazes for the night; _season_map reads this record all night.
-        table.put_item(Item={'pk': _season_pk(sid), 'sk': 'MAP',
-                             'depths': mapgen.generate_all_depths(sid)})
+        _put(table, Item={'pk': _season_pk(sid), 'sk': 'MAP',
+                          'depths': mapgen.generate_all_depths(sid)})
     _event(table, sid, 'season',
            'A new night falls on the Undercity. The swarm stirs…')
     return 200, {'ok': True, 'seasonId': sid}
@@ -3180,12 +3991,12 @@ def _season_lobby(table, payload):
     else:
         sid = datetime.utcnow().strftime('%Y%m%d-%H%M%S')
         if data.PROCEDURAL_DUNGEONS:
-            table.put_item(Item={'pk': _season_pk(sid), 'sk': 'MAP',
-                                 'depths': mapgen.generate_all_depths(sid)})
-    table.put_item(Item={'pk': _season_pk(sid), 'sk': 'CONFIG',
-                         'status': 'lobby', 'hostKey': host_key,
-                         'launchAt': launch_at, 'bossPhase': False})
-    table.put_item(Item={'pk': META_PK, 'sk': 'CURRENT', 'seasonId': sid})
+            _put(table, Item={'pk': _season_pk(sid), 'sk': 'MAP',
+                              'depths': mapgen.generate_all_depths(sid)})
+    _put(table, Item={'pk': _season_pk(sid), 'sk': 'CONFIG',
+                      'status': 'lobby', 'hostKey': host_key,
+                      'launchAt': launch_at, 'bossPhase': False})
+    _put(table, Item={'pk': META_PK, 'sk': 'CURRENT', 'seasonId': sid})
     _event(table, sid, 'season', 'The gates are sealed. The night begins soon…')
     return 200, {'ok': True, 'seasonId': sid, 'launchAt': launch_at}
 
@@ -3212,7 +4023,7 @@ def _boss_awaken(table, sid, config, payload):
         return _err('Wrong host passphrase.', 403)
     if config.get('bossPhase'):
         return _err('The Queen is already awake.', 409)
-    table.put_item(Item=dict(config, bossPhase=True))
+    _put(table, Item=dict(config, bossPhase=True))
     _event(table, sid, 'boss',
            'THE ROT-WARDS FALL! Savra, Queen of the Golgari, stirs atop the '
            'floating island — every creature may now storm her lair.')
@@ -3395,7 +4206,7 @@ def _admin_dev_night(table, sid, payload):
     patch = {'devMode': on}
     if on:
         patch['devEverOn'] = True
-    table.put_item(Item=dict(config, **patch))
+    _put(table, Item=dict(config, **patch))
     _set_dev_night({'devMode': on})
     text = ('Dev Night engaged — roll costs are off. Go wild.' if on
             else 'Dev Night over — the roll bank is live again.')
@@ -3409,7 +4220,7 @@ def _admin_bot_step(table, sid, payload):
     rules, respecting sealed barriers) with NO landing effects. Bots are
     non-combat puppets, so we can't run roll→move (a wild landing would trap the
     bot in a battle nothing drives); this just shifts them off their gate."""
-    nodes = _season_map(table, sid)
+    board = _season_board(table, sid)
     doc, err = _admin_target(table, sid, payload)
     if err:
         return err
@@ -3417,10 +4228,10 @@ def _admin_bot_step(table, sid, payload):
         return _err('bot-step moves bots only.')
     closed = _stop_nodes(table, sid, doc)
     blocked = _blocked_nodes(doc)
+    by_face = engine.destinations_by_face(board, doc['position'], closed, blocked)
     dests = set()
     for steps in range(random.randint(1, 4), 0, -1):
-        dests = engine.legal_destinations(nodes, doc['position'], steps,
-                                          closed, blocked)
+        dests = by_face[steps]
         if dests:
             break
     if not dests:
@@ -3440,7 +4251,8 @@ def _admin_kick(table, sid, payload):
     doc = _get_player(table, sid, target)
     if not doc:
         return _err('No such player this season.')
-    table.delete_item(Key={'pk': _season_pk(sid), 'sk': f'PLAYER#{target}'})
+    _delete(table, Key={'pk': _season_pk(sid), 'sk': f'PLAYER#{target}'})
+    _unindex_position(table, sid, target)
     _event(table, sid, 'host',
            f"{doc.get('username', 'A creature')} left the Undercity.")
     return 200, {'ok': True, 'removed': target}
@@ -3469,7 +4281,7 @@ def _admin_reset_all(table, sid, payload):
         FilterExpression='sk = :meta AND begins_with(pk, :u)',
         ExpressionAttributeValues={':meta': 'META', ':u': 'UNDERCITYUSER#'})['Items']
     for it in perms:
-        table.delete_item(Key={'pk': it['pk'], 'sk': it['sk']})
+        _delete(table, Key={'pk': it['pk'], 'sk': it['sk']})
     _event(table, new_sid, 'host',
            f'Host reset all progression and opened a fresh night — '
            f'{len(perms)} profiles wiped to a blank slate.')
@@ -3479,26 +4291,14 @@ def _admin_reset_all(table, sid, payload):
 def _admin_export(table, sid, payload):
     """Read-only full session dump for offline balance analysis: every player doc
     (end-state stats + per-player `metrics` counters), the complete append-only
-    event log, and the first-conqueror records. Single-page queries mirror the
-    no-pagination convention here (the table is tiny)."""
+    event log, and the first-conqueror records."""
     pk = _season_pk(sid)
 
     def _all(prefix):
-        """Every row under `prefix`, following pagination. DynamoDB caps a query
-        page at 1MB; a busy night's EVENT# log passes that, and an unpaginated
-        read drops the tail SILENTLY — which makes the export lie about exactly
-        the long sessions we most want to analyse."""
-        out, start = [], None
-        while True:
-            kw = {'KeyConditionExpression': 'pk = :pk AND begins_with(sk, :sk)',
-                  'ExpressionAttributeValues': {':pk': pk, ':sk': prefix}}
-            if start:
-                kw['ExclusiveStartKey'] = start
-            page = table.query(**kw)
-            out.extend(_clean(i) for i in page['Items'])
-            start = page.get('LastEvaluatedKey')
-            if not start:
-                return out
+        """Every row under `prefix`, every page of it: a busy night's EVENT# log
+        passes DynamoDB's 1MB page, and a dropped tail would make the export lie
+        about exactly the long sessions we most want to analyse."""
+        return list(_iter_query(table, pk, prefix))
 
     def _one(key):
         return _clean(_get(table, pk, key) or {}) or None
@@ -3556,12 +4356,8 @@ def _archive_season(table, sid, config, discard=False):
     is handed back."""
     discard = bool(discard or _must_discard(config))
     pk = _season_pk(sid)
-    resp = table.query(
-        KeyConditionExpression='pk = :pk AND begins_with(sk, :sk)',
-        ExpressionAttributeValues={':pk': pk, ':sk': 'PLAYER#'})
     standings = []
-    for raw in resp['Items']:
-        p = _clean(raw)
+    for p in _roster(table, sid, _STANDING_FIELDS):
         standings.append({
             'userId': p['userId'], 'username': p.get('username', '?'),
             'renown': data.compute_renown(p), 'level': p.get('level', 1),
@@ -3582,7 +4378,7 @@ def _archive_season(table, sid, config, discard=False):
             perm['apexReached'] = perm.get('apexReached', 0) + 1
         # Bank this night's earned Renown for the pre-spawn shop.
         perm['renown'] = perm.get('renown', 0) + data.compute_renown(p)
-        table.put_item(Item=perm)
+        _put(table, Item=perm)
     standings.sort(key=lambda s: -s['renown'])
     if discard:
         # Mid-night payouts (raid boss, world event) bank straight to the wallet,
@@ -3592,18 +4388,18 @@ def _archive_season(table, sid, config, discard=False):
     result = {'standings': standings, 'endedAt': _now(),
               'champion': standings[0] if standings else None,
               'discarded': discard}
-    table.put_item(Item={'pk': pk, 'sk': 'RESULT', **result})
-    table.put_item(Item={'pk': pk, 'sk': 'CONFIG', **config,
-                         'status': 'ended', 'endedAt': _now(),
-                         'discarded': discard})
+    _put(table, Item={'pk': pk, 'sk': 'RESULT', **result})
+    _put(table, Item={'pk': pk, 'sk': 'CONFIG', **config,
+                      'status': 'ended', 'endedAt': _now(),
+                      'discarded': discard})
     if discard:
         _event(table, sid, 'season',
                'The night ends — results discarded. Nothing was banked.')
     elif standings:
-        table.put_item(Item={'pk': HOF_PK, 'sk': f'NIGHT#{sid}',
-                             'seasonId': sid, 'endedAt': _now(),
-                             'champion': standings[0],
-                             'podium': standings[:3]})
+        _put(table, Item={'pk': HOF_PK, 'sk': f'NIGHT#{sid}',
+                          'seasonId': sid, 'endedAt': _now(),
+                          'champion': standings[0],
+                          'podium': standings[:3]})
         _event(table, sid, 'season',
                f"The night ends. {standings[0]['username']} is champion of the Undercity "
                f"with {standings[0]['renown']} Renown!")
@@ -3827,7 +4623,7 @@ def _join(table, sid, user_id, username, payload):
     err = _apply_shop_purchases(perm, doc, payload)
     if err:
         return err
-    table.put_item(Item=perm)
+    _put(table, Item=perm)
 
     # Deliver any board-game rewards banked while this player hadn't hatched yet
     # (mutates doc's rolls/bag, deletes the bank record, posts an event).
@@ -3885,7 +4681,7 @@ def _claim(table, sid, doc, payload):
 # ── Roll & move ──────────────────────────────────────────────────────────────
 
 def _roll(table, sid, doc, payload):
-    nodes = _season_map(table, sid)
+    board = _season_board(table, sid)
     # Fleetfoot (SPD-5 perk): the player MAY reroll a die that came up 1. A reroll
     # discards the pending 1 and rolls fresh WITHOUT spending another banked roll,
     # and is offered only once (the fresh face stands).
@@ -3953,10 +4749,12 @@ def _roll(table, sid, doc, payload):
                 remaining.append(b)
         doc['buffs'] = remaining
 
+    # Every face from one walk, cached on the board: the Pathfinder second die
+    # and a Fleetfoot reroll from the same spot are lookups.
     def _legal(v):
-        return engine.legal_destinations(nodes, doc['position'], v,
-                                         _stop_nodes(table, sid, doc),
-                                         _blocked_nodes(doc))
+        return engine.destinations_by_face(board, doc['position'],
+                                           _stop_nodes(table, sid, doc),
+                                           _blocked_nodes(doc), v)[v]
 
     # Pathfinder (SPD-10 perk): roll a second die and keep either — destinations
     # are the union of both faces. Only on an ordinary random roll (a chosen
@@ -4033,7 +4831,8 @@ def _move(table, sid, doc, payload):
         closed = _stop_nodes(table, sid, doc)
         blocked = _blocked_nodes(doc)
         if (not path or path[0] != prev or path[-1] != to
-                or not engine.validate_walk(nodes, path, allowed, closed, blocked)):
+                or not engine.validate_walk(_season_board(table, sid), path,
+                                            allowed, closed, blocked)):
             return _err('That route is not a legal walk.', 409)
         passed_gate = any(nodes[n]['type'] == 'gate' for n in path[1:-1])
         if passed_gate and nodes[to]['type'] != 'gate':
@@ -4063,7 +4862,7 @@ def _move(table, sid, doc, payload):
             doc['pendingMove'] = {
                 'value': remaining,
                 'dests': sorted(engine.legal_destinations(
-                    nodes, to, remaining,
+                    _season_board(table, sid), to, remaining,
                     _stop_nodes(table, sid, doc), _blocked_nodes(doc))),
             }
 
@@ -4081,7 +4880,7 @@ def _move(table, sid, doc, payload):
             doc['pendingMove'] = {
                 'value': remaining,
                 'dests': sorted(engine.legal_destinations(
-                    nodes, doc['position'], remaining,
+                    _season_board(table, sid), doc['position'], remaining,
                     _stop_nodes(table, sid, doc), _blocked_nodes(doc))),
             }
 
@@ -4144,7 +4943,7 @@ def _freemove(table, sid, doc, payload):
         return _err('That route is not a legal walk.', 409)
     closed = _stop_nodes(table, sid, doc)
     blocked = _blocked_nodes(doc)
-    if not engine.validate_free_walk(nodes, path, closed, blocked):
+    if not engine.validate_free_walk(_season_board(table, sid), path, closed, blocked):
         return _err('That route is not a legal walk.', 409)
 
     prev = doc['position']
@@ -4194,7 +4993,7 @@ def _ladder_cross(table, sid, doc, payload):
         doc['pendingMove'] = {
             'value': remaining,
             'dests': sorted(engine.legal_destinations(
-                nodes, target, remaining,
+                _season_board(table, sid), target, remaining,
                 _stop_nodes(table, sid, doc), _blocked_nodes(doc))),
         }
     else:
@@ -4227,15 +5026,12 @@ def _respawn(table, sid, doc, payload):
 
 
 def _occupants(table, sid, node, except_user):
-    resp = table.query(
-        KeyConditionExpression='pk = :pk AND begins_with(sk, :sk)',
-        ExpressionAttributeValues={':pk': _season_pk(sid), ':sk': 'PLAYER#'})
+    """The other creatures on `node`, off the occupancy index."""
     out = []
-    for raw in resp['Items']:
-        p = _clean(raw)
-        if p['userId'] == except_user or p.get('position') != node:
+    for uid, p in sorted(_positions(table, sid).items()):
+        if uid == except_user or p.get('position') != node:
             continue
-        out.append({'userId': p['userId'], 'username': p.get('username'),
+        out.append({'userId': uid, 'username': p.get('username'),
                     'formName': _form_name(p),
                     'creatureName': p.get('creatureName') or _form_name(p),
                     'level': p.get('level', 1),
@@ -4420,10 +5216,10 @@ def _ashen_fog(table, sid, doc, node, region, nodes, prev):
         revealed = engine.roll_fog(_rng)
         try:
             # Race-safe: exactly one concurrent lander locks the reveal.
-            table.put_item(
-                Item={'pk': pk, 'sk': f'FOG#{node}', 'revealed': revealed,
-                      'by': doc['username'], 'uid': doc['userId'], 'at': _now()},
-                ConditionExpression='attribute_not_exists(pk)')
+            _put(table, Item={'pk': pk, 'sk': f'FOG#{node}', 'revealed': revealed,
+                              'by': doc['username'], 'uid': doc['userId'],
+                              'at': _now()},
+                 ConditionExpression='attribute_not_exists(pk)')
             first = True
         except ClientError as e:
             if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
@@ -5013,7 +5809,7 @@ def _set_barrier_state(table, sid, node, hp, buffs=None):
     item = {'pk': _season_pk(sid), 'sk': f'BARRIER#{node}', 'hp': int(hp)}
     if buffs:
         item['buffs'] = buffs
-    table.put_item(Item=item)
+    _put(table, Item=item)
 
 
 def _guardian_pools(table, sid):
@@ -5053,7 +5849,7 @@ def _set_lair_state(table, sid, node, hp, slain, buffs=None):
     item = {'pk': _season_pk(sid), 'sk': f'LAIR#{node}', 'hp': int(hp), 'slain': bool(slain)}
     if buffs:
         item['buffs'] = buffs
-    table.put_item(Item=item)
+    _put(table, Item=item)
 
 
 # ── World Event ("The Great Beast") shared state ─────────────────────────────
@@ -5067,7 +5863,7 @@ def _set_world_event(table, sid, rec):
     item = dict(rec)
     item['pk'] = _season_pk(sid)
     item['sk'] = 'WORLDEVENT'
-    table.put_item(Item=item)
+    _put(table, Item=item)
 
 
 def _world_event_public(table, sid):
@@ -5095,7 +5891,7 @@ def _set_enraged_state(table, sid, rec):
     item = dict(rec)
     item['pk'] = _season_pk(sid)
     item['sk'] = 'ENRAGED'
-    table.put_item(Item=item)
+    _put(table, Item=item)
 
 
 def _enraged_state(table, sid):
@@ -5293,12 +6089,9 @@ def _scale_for_sigils(npc, doc, stats=None):
 
 
 def _all_players(table, sid):
-    """Every player doc in the season. The codebase queries `PLAYER#` inline in
-    a few places; this is the shared reader for callers that just want the list."""
-    resp = table.query(
-        KeyConditionExpression='pk = :pk AND begins_with(sk, :sk)',
-        ExpressionAttributeValues={':pk': _season_pk(sid), ':sk': 'PLAYER#'})
-    return [_clean(i) for i in resp.get('Items', [])]
+    """Every player doc in the season — the shared reader for callers that just
+    want the list."""
+    return _query_rows(table, _season_pk(sid), 'PLAYER#')
 
 
 def _awakened(table, sid):
@@ -5328,7 +6121,7 @@ def _set_swarm(table, sid, nodes, split_at=None):
     """Persist the brood's footprint and its next split time."""
     rec = {'pk': _season_pk(sid), 'sk': 'SWARM', 'nodes': sorted(set(nodes))}
     rec['splitAt'] = split_at or _iso_in_minutes(data.SWARM_SPLIT_MINUTES)
-    table.put_item(Item=rec)
+    _put(table, Item=rec)
 
 
 def _swarmable_nodes(table, sid):
@@ -5343,17 +6136,16 @@ def _swarmable_nodes(table, sid):
 def _seed_swarm(table, sid):
     """Release the brood: one swarm within SWARM_SEED_RADIUS of every living
     player, so nobody is too far behind to join the finale."""
-    nodes = _season_map(table, sid)
+    board = _season_board(table, sid)
     allowed = set(_swarmable_nodes(table, sid))
     placed = []
-    for p in _all_players(table, sid):
+    for p in _positions(table, sid).values():
         here = p.get('position')
         if not here:
             continue
-        near = [n for n in allowed
-                if n not in placed
-                and engine.board_distance(nodes, here, n,
-                                          data.SWARM_SEED_RADIUS, set()) is not None]
+        reach = board.hops().from_node(here)
+        near = [n for n in allowed if n not in placed
+                and reach.get(n, engine.UNREACHABLE) <= data.SWARM_SEED_RADIUS]
         for n in sorted(near)[:data.SWARM_SEED_PER_PLAYER]:
             placed.append(n)
     _set_swarm(table, sid, placed)
@@ -5387,7 +6179,7 @@ def _maybe_awaken(table, sid, doc):
     if _sigil_count(doc) < data.SIGILS_REQUIRED:
         return False
     config = _get(table, _season_pk(sid), 'CONFIG') or {}
-    table.put_item(Item=dict(config, bossPhase=True))
+    _put(table, Item=dict(config, bossPhase=True))
     _seed_swarm(table, sid)
     _event(table, sid, 'boss',
            f"{doc['username']} raises the third Guild Sigil — THE ROT-WARDS FALL! "
@@ -5475,7 +6267,7 @@ def _claim_crown(table, sid, doc):
     rec.update({'pk': _season_pk(sid), 'sk': 'BOSS',
                 'slayer': doc['userId'], 'slayerName': doc.get('username', '?'),
                 'slayerAt': _now()})
-    table.put_item(Item=rec)
+    _put(table, Item=rec)
     return True
 
 
@@ -5489,7 +6281,7 @@ def _set_boss_buffs(table, sid, buffs):
     rec = dict(_get(table, _season_pk(sid), 'BOSS') or {})
     rec.update({'pk': _season_pk(sid), 'sk': 'BOSS', 'buffs': list(buffs)})
     rec.pop('hp', None)
-    table.put_item(Item=rec)
+    _put(table, Item=rec)
 
 
 # ── Interactive combat state machine (Plan 2) ────────────────────────────────
@@ -6340,12 +7132,13 @@ def _world_event_payout(table, sid, actor_doc=None, timed_out=False):
         return []
     top_uid = max(dmg, key=lambda u: (dmg[u], u))  # deterministic tiebreak
 
-    # Pass 1: resolve each contributor's bracket + fetch their doc once, then
+    # Pass 1: resolve each contributor's bracket off the one roster read, then
     # build the shared roster (ranked by damage) for every notification.
+    players = {p['userId']: p for p in _season_players(table, sid)}
     entries = []
     for uid, dealt in dmg.items():
         bracket, reward = data.world_event_reward(dealt, uid == top_uid)
-        pdoc = actor_doc if uid == killer_uid else _get_player(table, sid, uid)
+        pdoc = actor_doc if uid == killer_uid else players.get(uid)
         if not pdoc:
             continue
         entries.append({'uid': uid, 'dealt': dealt, 'bracket': bracket,
@@ -6354,15 +7147,16 @@ def _world_event_payout(table, sid, actor_doc=None, timed_out=False):
     roster = [{'name': e['name'], 'bracket': e['bracket']}
               for e in sorted(entries, key=lambda e: (-e['dealt'], e['uid']))]
 
-    # Pass 2: grant + persist.
+    # Pass 2: grant + persist — the killer in place, everyone else fanned out.
+    paid = _pay_world_rewards(table, sid, [e for e in entries if not e['is_killer']],
+                              roster)
     results = []
     for e in entries:
         uid, reward, bracket = e['uid'], e['reward'], e['bracket']
         if e['is_killer']:
             gear, leveled_to = _pay_world_reward(table, sid, e['doc'], reward)
         else:
-            gear, leveled_to = _pay_world_reward_retry(
-                table, sid, uid, reward, bracket, roster)
+            gear, leveled_to = paid[uid]
         _bank_perm_renown(table, sid, uid, reward['renown'])
         results.append({'userId': uid, 'bracket': bracket,
                         'spores': reward['spores'], 'renown': reward['renown'],
@@ -6374,7 +7168,8 @@ def _world_event_payout(table, sid, actor_doc=None, timed_out=False):
     # News only for players who didn't bleed it (contributors got a world_kill).
     _broadcast_away(table, sid, {'kind': 'world_fallen',
                                  'name': data.WORLD_EVENT['name'], 'at': _now()},
-                    killer_uid, skip_user_ids=set(dmg))
+                    killer_uid, skip_user_ids=set(dmg),
+                    players=[p for uid, p in players.items() if uid not in dmg])
     _push_broadcast(table, sid, tally, exclude_user_id=killer_uid)
     return results
 
@@ -6388,24 +7183,29 @@ def _pay_world_reward(table, sid, doc, reward):
     return _gear_award_summary(drop), (doc['level'] if levels else None)
 
 
-def _pay_world_reward_retry(table, sid, uid, reward, bracket, roster):
-    """Non-killer path: re-fetch + re-apply the grant on each optimistic-lock
-    attempt so a lost race never silently drops the loot. Pushes the rich
-    `world_kill` awayEvent. Returns (gear_summary, leveled_to)."""
-    for _ in range(4):
-        p = _get_player(table, sid, uid)
-        if not p:
-            return None, None
+def _pay_world_rewards(table, sid, entries, roster):
+    """Non-killer path: fan the grants out over the contributors' already-loaded
+    docs, re-fetching + re-applying on each lost optimistic-lock race so a lost
+    race never silently drops the loot. Pushes the rich `world_kill` awayEvent.
+    Returns {uid: (gear_summary, leveled_to)}; (None, None) for a recipient
+    every attempt failed for."""
+    by_uid = {e['uid']: e for e in entries}
+
+    def _grant(p):
+        e = by_uid[p['userId']]
+        reward = e['reward']
         gear, leveled_to = _pay_world_reward(table, sid, p, reward)
         _push_away_event(p, {
             'kind': 'world_kill', 'name': data.WORLD_EVENT['name'],
-            'bracket': bracket, 'spores': reward['spores'], 'xp': reward['xp'],
+            'bracket': e['bracket'], 'spores': reward['spores'], 'xp': reward['xp'],
             'renown': reward['renown'], 'gear': gear, 'leveledTo': leveled_to,
             'roster': roster, 'at': _now()})
-        if _put_player(table, p):
-            return gear, leveled_to
-    return None, None
-    return results
+        return gear, leveled_to
+
+    report = _fan_out(table, sid, {e['uid']: e['doc'] for e in entries}, _grant,
+                      attempts=4)
+    return {uid: result if saved else (None, None)
+            for uid, (saved, result) in report.items()}
 
 
 def _award_boss_kill(table, sid, doc, node, out):
@@ -6422,7 +7222,7 @@ def _award_boss_kill(table, sid, doc, node, out):
         out['queenslayer'] = True
         perm = _get_perm(table, doc['userId'])
         perm['renown'] = perm.get('renown', 0) + data.QUEENSLAYER_RENOWN
-        table.put_item(Item=perm)
+        _put(table, Item=perm)
         _event(table, sid, 'boss',
                f"{doc['username']} is the QUEENSLAYER — first to fell Savra, "
                'Queen of the Golgari!', actor=doc['userId'])
@@ -6849,10 +7649,30 @@ def _push_away_event(target, entry):
 
 def _season_players(table, sid):
     """Every creature doc in the running season."""
-    resp = table.query(
-        KeyConditionExpression='pk = :pk AND begins_with(sk, :sk)',
-        ExpressionAttributeValues={':pk': _season_pk(sid), ':sk': 'PLAYER#'})
-    return [_clean(i) for i in resp['Items']]
+    return _query_rows(table, _season_pk(sid), 'PLAYER#')
+
+
+# Roster-wide scans that only look at a few fields read just those: a full
+# creature doc drags its pets, eggs, gear, bag, metrics and awayEvents along,
+# so projecting moves a fraction of the bytes and _clean never walks them.
+_ROLL_NUDGE_FIELDS = ('ver', 'rolls', 'rested', 'rollRegenAt', 'rollNudged',
+                      'lastActionAt')
+_STANDING_FIELDS = ('username', 'level', 'form', 'creatureName', 'species', 'tier',
+                    'pvpWins', 'pvpRenownWins', 'wildWins', 'winRenown', 'poiClaims',
+                    'bossDamage', 'spores', 'paint', 'hat', 'effect', 'spriteVariant')
+
+
+def _roster(table, sid, fields=()):
+    """Every creature in the running season, as {userId, *fields} — never a doc
+    to save back. Served from the unit of work when this request already holds
+    the PLAYER# rows, else one projected read."""
+    pk, attrs = _season_pk(sid), ('userId', *fields)
+    uow = _uow_for(table)
+    if uow is not None and (_covers(uow, pk, 'PLAYER#', None)
+                            or (pk, 'PLAYER#', None, False, None, None) in uow['queries']):
+        return [{k: p[k] for k in attrs if k in p}
+                for p in _query_rows(table, pk, 'PLAYER#')]
+    return list(_iter_query(table, pk, 'PLAYER#', fields=attrs))
 
 
 _UNDERCITY_TITLE = 'The Undercity'
@@ -6867,7 +7687,7 @@ def _push_user(table, user_id, body):
 def _push_broadcast(table, sid, body, exclude_user_id=None):
     """Browser push to every creature in the season, optionally excluding one
     (usually the actor who already knows). Mirrors _broadcast_away's targeting."""
-    ids = [p['userId'] for p in _season_players(table, sid)
+    ids = [p['userId'] for p in _roster(table, sid)
            if p.get('userId') and p['userId'] != exclude_user_id]
     push_db.broadcast(table, ids, _UNDERCITY_TITLE, body, _UNDERCITY_URL)
 
@@ -6892,7 +7712,7 @@ def sweep_roll_refills(table):
     if not sid or not config or config.get('status') != 'active':
         return
     now = _now()
-    for doc in _season_players(table, sid):
+    for doc in _roster(table, sid, _ROLL_NUDGE_FIELDS):
         engine.regen_rolls(doc, now)
         rolls = doc.get('rolls', 0)
         nudged = doc.get('rollNudged', False)
@@ -6900,31 +7720,178 @@ def sweep_roll_refills(table):
                 and not _acted_within(doc, data.ROLL_NUDGE_IDLE_MIN)):
             _push_user(table, doc['userId'],
                        f"You've got {rolls} rolls waiting — come take a turn!")
-            doc['rollNudged'] = True
-            _put_player(table, doc)  # best-effort; a lost race means they're active
+            _set_roll_nudged(table, sid, doc, True)
         elif rolls < data.ROLL_NUDGE_THRESHOLD and nudged:
-            doc['rollNudged'] = False
-            _put_player(table, doc)
+            _set_roll_nudged(table, sid, doc, False)
         # else: no state change — discard the in-memory regen (recomputed on read)
 
 
-def _broadcast_away(table, sid, entry, exclude_user_id=None, skip_user_ids=None):
+def _set_roll_nudged(table, sid, doc, nudged):
+    """Flip rollNudged on a projected roster row: that one field and the ver
+    bump, under the ver guard (the row is far too thin to save whole).
+    Best-effort; a lost race means they're active."""
+    key = {'pk': _season_pk(sid), 'sk': f'PLAYER#{doc["userId"]}'}
+    try:
+        table.update_item(Key=key, UpdateExpression='SET rollNudged = :n, ver = :nv',
+                          ConditionExpression='ver = :v',
+                          ExpressionAttributeValues={':n': nudged, ':v': doc['ver'],
+                                                     ':nv': doc['ver'] + 1})
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+    _forget(table, (key['pk'], key['sk']))
+
+
+def _broadcast_away(table, sid, entry, exclude_user_id=None, skip_user_ids=None,
+                    players=None):
     """Fan a news away-event out to every season player except the actor (and any
     in `skip_user_ids`), so a returning player learns what fell while they were
-    gone. Best-effort: a lost optimistic-lock race just drops that one player's
-    line."""
+    gone. `players` reuses docs the caller already holds instead of re-reading
+    the roster. Best-effort: a player whose every retry loses the optimistic-lock
+    race just misses the line. Returns the _fan_out report."""
     skip = set(skip_user_ids or ())
-    for p in _season_players(table, sid):
-        uid = p.get('userId')
-        if not uid or uid == exclude_user_id or uid in skip:
-            continue
-        for _ in range(3):
-            _push_away_event(p, dict(entry))
-            if _put_player(table, p):
-                break
-            p = _get_player(table, sid, uid)
-            if not p:
-                break
+    docs = {p['userId']: p
+            for p in (_season_players(table, sid) if players is None else players)
+            if p.get('userId') and p['userId'] != exclude_user_id
+            and p['userId'] not in skip}
+    return _fan_out(table, sid, docs, lambda p: _push_away_event(p, dict(entry)))
+
+
+# ── Fan-out writer ───────────────────────────────────────────────────────────
+# A raid kill or a host announcement writes to every creature in the season.
+# _fan_out reuses the docs the caller already holds (usually straight off the
+# roster query) and registers each as its row's baseline in the unit of work,
+# so every save goes out as a small delta UpdateItem and an untouched position
+# leaves the occupancy index alone. Every grant is applied and every write
+# planned in order on this thread (so the shared _rng draws stay deterministic);
+# only the raw ver-guarded writes go out FANOUT_WORKERS at a time, each worker
+# through its own Table resource, since boto3 resources are not thread-safe.
+# The unit of work, the occupancy index and the request log are only ever
+# touched back on this thread, from the workers' results. A recipient whose
+# save also moves a live battle record (or the batch's staged actor) is saved
+# here by _put_player. Only the losers of an optimistic-lock race are re-read
+# and re-applied.
+FANOUT_WORKERS = 8
+_fanout_pool = None
+_worker = threading.local()   # per worker thread: table name -> its own Table
+
+
+def _pool():
+    global _fanout_pool
+    if _fanout_pool is None:
+        _fanout_pool = ThreadPoolExecutor(max_workers=FANOUT_WORKERS,
+                                          thread_name_prefix='fan-out')
+    return _fanout_pool
+
+
+def _worker_table(table):
+    """This worker thread's own resource for `table`, built once per thread. A
+    table that isn't a boto3 resource (the tests' and the sim's in-memory ones)
+    is shared as-is."""
+    client = getattr(getattr(table, 'meta', None), 'client', None)
+    if client is None:
+        return table
+    tables = _worker.__dict__.setdefault('tables', {})
+    if table.name not in tables:
+        import boto3   # only a live fan-out needs it; keeps it off the cold start
+        tables[table.name] = boto3.session.Session().resource(
+            'dynamodb', region_name=client.meta.region_name).Table(table.name)
+    return tables[table.name]
+
+
+def _raw_write(table, call, kw):
+    """One planned write, on a worker. False when it lost the ver race."""
+    try:
+        getattr(_worker_table(table), call)(**kw)
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return False
+        raise
+    return True
+
+def _seed_baseline(table, doc):
+    """Make `doc` (a row this request read outside _get) the baseline that
+    _put_player diffs against, unless the request already holds one."""
+    uow = _uow_for(table)
+    if uow is not None:
+        uow['rows'].setdefault((doc['pk'], doc['sk']), copy.deepcopy(doc))
+
+
+def _fan_out(table, sid, docs, apply, attempts=3):
+    """Apply `apply(doc)` (mutates in place, returns that recipient's result) to
+    each doc in `docs` (uid -> an already-loaded doc, or None to load it) and
+    save them all. A recipient that loses the race is re-read and re-applied,
+    up to `attempts` tries in all; one that has left the season is dropped.
+    Returns {uid: (saved, result)} for every uid in `docs`."""
+    report = {uid: (False, None) for uid in docs}
+    pending = dict(docs)
+    for _ in range(attempts):
+        retry, planned = {}, {}
+        for uid, doc in pending.items():
+            doc = doc or _get_player(table, sid, uid)
+            if not doc:
+                continue
+            _seed_baseline(table, doc)
+            result = apply(doc)
+            write = _fan_out_write(table, doc)
+            if write is not None:
+                planned[uid] = (doc, result, write)
+            elif _put_player(table, doc):
+                report[uid] = (True, result)
+            else:
+                retry[uid] = None
+        for uid, saved in _save_planned(table, planned).items():
+            if saved:
+                report[uid] = (True, planned[uid][1])
+            else:
+                retry[uid] = None
+        pending = retry
+        if not pending:
+            break
+    return report
+
+
+def _fan_out_write(table, doc):
+    """The doc write that saves a recipient on a worker (see _doc_write), or
+    None when it must go through _put_player here: a live battle record rides
+    along, or the batch has staged this player."""
+    uow = _uow_for(table)
+    staged = uow.get('batch') if uow is not None else None
+    if (isinstance(doc.get('battle'), dict) or doc.get('battleVer') is not None
+            or (staged is not None and staged['key'] == (doc['pk'], doc['sk']))):
+        return None
+    return _doc_write(table, doc, doc.get('ver', 0))
+
+
+def _save_planned(table, planned):
+    """Run each planned write (uid -> (doc, result, (call, kwargs, row))) on the
+    pool, then record every outcome on this thread. Returns {uid: saved}; a
+    write that failed for any reason but the ver race is re-raised once the rest
+    are recorded."""
+    uow = _uow_for(table)
+    before = {uid: uow['rows'].get((doc['pk'], doc['sk'])) if uow is not None else None
+              for uid, (doc, _, _) in planned.items()}
+    futures = {uid: _pool().submit(_raw_write, table, call, kw)
+               for uid, (_, _, (call, kw, _)) in planned.items()}
+    request_log.count_calls(len(futures))
+    saved, failure = {}, None
+    for uid, future in futures.items():
+        doc, _, (_, _, row) = planned[uid]
+        key = (doc['pk'], doc['sk'])
+        try:
+            saved[uid] = future.result()
+        except Exception as e:   # the row's state is unknown: forget it below
+            failure = failure or e
+            saved[uid] = False
+        if saved[uid]:
+            _stamp_world(table, key, row)
+            _remember(table, key, row)
+            _index_position(table, doc, before[uid])
+        else:
+            _forget(table, key)
+    if failure is not None:
+        raise failure
+    return saved
 
 
 def _resolve_spell_effect(table, sid, doc, spell_id, spell, payload):
@@ -7057,7 +8024,7 @@ def _cast_at_guardian(table, sid, doc, spell, target_id):
     persistent pool (floored at 1 — no remote kill/open) or persists a curse
     read at its next battle. No dodge, no bounty. An error tuple leaves the
     caster's cooldown unstarted."""
-    nodes = _season_map(table, sid)
+    board = _season_board(table, sid)
     if target_id == 'boss':
         node = data.BOSS_NODE
         name = data.ROT_SOVEREIGN['name']
@@ -7088,7 +8055,7 @@ def _cast_at_guardian(table, sid, doc, spell, target_id):
         def save(new_hp, new_buffs):
             _set_lair_state(table, sid, target_id, new_hp, slain, new_buffs)
 
-    dist = engine.board_distance(nodes, doc['position'], node,
+    dist = engine.board_distance(board, doc['position'], node,
                                  spell['range'], _closed_barriers(table, sid))
     if dist is None:
         return _spell_err(f"It is beyond the spell's reach ({spell['range']} spaces).",
@@ -7126,10 +8093,10 @@ def _cast_at_enraged(table, sid, doc, spell, rec):
     floors its shared pool at 1 (the killing blow needs melee or a lethal strike);
     a curse persists to bite in its next fight. An error tuple leaves the caster's
     cooldown unstarted."""
-    nodes = _season_map(table, sid)
+    board = _season_board(table, sid)
     spec = data.ENRAGED_MONSTERS[rec['monsterId']]
     name = spec['name']
-    dist = engine.board_distance(nodes, doc['position'], rec['node'],
+    dist = engine.board_distance(board, doc['position'], rec['node'],
                                  spell['range'], _closed_barriers(table, sid))
     if dist is None:
         return _spell_err(f"It is beyond the spell's reach ({spell['range']} spaces).",
@@ -7169,7 +8136,7 @@ def _cast_at_enraged(table, sid, doc, spell, rec):
 def _cast_at_player(table, sid, doc, spell_id, spell, target_id):
     """Field damage/curse at a rival. Returns a cast-result dict, or an error
     tuple (in which case the caster's cooldown never starts)."""
-    nodes = _season_map(table, sid)
+    board = _season_board(table, sid)
     if not target_id or target_id == doc['userId']:
         return _spell_err('Pick a target.', 'invalid_target', 400)
     target = _get_player(table, sid, target_id)
@@ -7177,7 +8144,7 @@ def _cast_at_player(table, sid, doc, spell_id, spell, target_id):
         return _spell_err('Target not found.', 'invalid_target', 404)
     if _shielded(target):
         return _spell_err('They are protected by a Compost Shield.', 'target_shielded')
-    dist = engine.board_distance(nodes, doc['position'],
+    dist = engine.board_distance(board, doc['position'],
                                  target['position'], spell['range'],
                                  _closed_barriers(table, sid))
     if dist is None:
@@ -7243,7 +8210,7 @@ def _cast_teleport(table, sid, doc, spell, to):
     if to in blocked:
         return _spell_err('Evolved units cannot squeeze into a tunnel.',
                           'invalid_target')
-    dist = engine.board_distance(nodes, doc['position'], to,
+    dist = engine.board_distance(_season_board(table, sid), doc['position'], to,
                                  spell['range'], _closed_barriers(table, sid),
                                  blocked)
     if dist is None:
@@ -7548,12 +8515,12 @@ def _reclaim(table, sid, doc, payload):
         if release not in held:
             return _err('You already hold three claims — release one first.',
                         409, claims=held)
-        table.delete_item(Key={'pk': _season_pk(sid), 'sk': f'RECLAIM#{release}'})
+        _delete(table, Key={'pk': _season_pk(sid), 'sk': f'RECLAIM#{release}'})
         held = [n for n in held if n != release]
         doc['claims'] = held
 
     doc['mulch'] = doc.get('mulch', 0) - price
-    table.put_item(Item={
+    _put(table, Item={
         'pk': _season_pk(sid), 'sk': f'RECLAIM#{node}', 'node': node,
         'type': target, 'price': price,
         'origType': standing['origType'] if standing else current,
@@ -7700,10 +8667,10 @@ def _umori_bid(table, sid, doc, payload):
     if conflict:
         return conflict
     # Then the per-user sealed-bid record (own sk → no cross-bidder clobber).
-    table.put_item(Item={'pk': _season_pk(sid),
-                         'sk': f'POST#UMORI#{win}#BID#{doc["userId"]}',
-                         'amount': amount, 'username': doc.get('username', 'someone'),
-                         'ts': _now_ms()})
+    _put(table, Item={'pk': _season_pk(sid),
+                      'sk': f'POST#UMORI#{win}#BID#{doc["userId"]}',
+                      'amount': amount, 'username': doc.get('username', 'someone'),
+                      'ts': _now_ms()})
     _event(table, sid, 'umori-bid',
            f"{doc['username']} sealed a bid at Umori's auction.", actor=doc['userId'])
     return _ok(doc, text=f'Sealed bid: {amount} Spores.',
@@ -7814,7 +8781,7 @@ def _apply_purchase(table, sid, doc, node, payload, tier_cap=None, ok_extra=None
         return conflict
     if deplete is not None:                    # then the shared stock (last-writer-wins)
         deplete['qty'] -= 1
-        table.put_item(Item={
+        _put(table, Item={
             'pk': _season_pk(sid), 'sk': f'SHOP#{node}',
             'window': stock['window'], 'gear': stock['gear'],
             'consumables': stock['consumables'], 'grimoires': stock['grimoires'],
@@ -7837,7 +8804,7 @@ def _trading_post_stock(table, sid, node):
 
 
 def _save_trading_post(table, sid, node, stock):
-    table.put_item(Item={'pk': _season_pk(sid), 'sk': f'POST#{node}', 'stock': stock})
+    _put(table, Item={'pk': _season_pk(sid), 'sk': f'POST#{node}', 'stock': stock})
 
 
 def _item_kind(item_id):
@@ -7929,7 +8896,7 @@ def _dig_site(table, sid, node):
 
 
 def _save_dig_site(table, sid, node, site):
-    table.put_item(Item={'pk': _season_pk(sid), 'sk': f'SITE#{node}', **site})
+    _put(table, Item={'pk': _season_pk(sid), 'sk': f'SITE#{node}', **site})
 
 
 def _dig_view(rec):
@@ -8143,8 +9110,8 @@ def _vein_rec(table, sid, region):
 
 
 def _save_vein(table, sid, region, depth):
-    table.put_item(Item={'pk': _season_pk(sid), 'sk': f'VEIN#{region}',
-                         'depth': depth})
+    _put(table, Item={'pk': _season_pk(sid), 'sk': f'VEIN#{region}',
+                      'depth': depth})
 
 
 def _vein_item(level):
@@ -8248,9 +9215,9 @@ def _vault_lock_rec(table, sid, region):
 
 
 def _save_vault(table, sid, region, rec):
-    table.put_item(Item={'pk': _season_pk(sid), 'sk': f'VAULT#{region}',
-                         'combo': rec['combo'], 'pot': rec['pot'],
-                         'history': rec['history']})
+    _put(table, Item={'pk': _season_pk(sid), 'sk': f'VAULT#{region}',
+                      'combo': rec['combo'], 'pot': rec['pot'],
+                      'history': rec['history']})
 
 
 def _vault_view(rec):
@@ -8559,7 +9526,7 @@ def _high_five(table, sid, doc, payload):
         closed = _stop_nodes(table, sid, doc)
         blocked = _blocked_nodes(doc)
         if at_node not in nodes or engine.board_distance(
-                nodes, here, at_node, reach, closed, blocked) is None:
+                _season_board(table, sid), here, at_node, reach, closed, blocked) is None:
             return _err('You can only high-five someone on your space.')
     elif target.get('position') != here:
         return _err('You can only high-five someone on your space.')
@@ -8644,6 +9611,6 @@ def _chat(table, sid, doc, payload):
     username = doc.get('username', '?')
     msg = {'id': f'{ts}#{rand}', 'userId': doc['userId'],
            'username': username, 'text': text, 'ts': ts}
-    table.put_item(Item={'pk': _season_pk(sid), 'sk': f'CHAT#{ts}#{rand}', **msg})
+    _put(table, Item={'pk': _season_pk(sid), 'sk': f'CHAT#{ts}#{rand}', **msg})
     _event(table, sid, 'chat', f'{username}: {text}', actor=doc['userId'])
     return _ok(doc, chat=msg)
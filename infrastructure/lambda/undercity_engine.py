@@ -6,6 +6,8 @@ No boto3, no clocks, no global randomness — every function takes its inputs
 is deterministic under test. The DynamoDB layer (undercity_db) translates
 player documents to/from these functions.
 """
+from array import array
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 
@@ -596,7 +598,155 @@ def pvp_spore_steal(loser_spores: int, loser_stance: str, winner_passives: froze
 
 # ── Movement ─────────────────────────────────────────────────────────────────
 
-def legal_destinations(nodes: dict, start: str, steps: int,
+class Board:
+    """A node graph compiled for movement — built once per season map (see
+    undercity_db._season_board) and accepted, like the plain node dict, by
+    every movement function below.
+
+    Node ids are interned to ints 0..n-1 in map order. Adjacency is CSR: the
+    neighbours of node i are targets[offsets[i]:offsets[i + 1]], also unpacked
+    into per-node `neighbors` tuples (what the walks iterate) and `adjacent`
+    frozensets (what path validation probes). `types` and `regions` are
+    per-node arrays. `intern` turns a closed/blocked id set into a frozenset
+    of ints, memoized per distinct set. `nodes` keeps the source dict for
+    everything that isn't movement. `hops` hands out the all-pairs hop
+    distances (HopMatrix), one per closed/blocked overlay; `_dests` is the
+    destinations_by_face LRU.
+
+    Neighbour ids missing from the dict are interned after the real nodes with
+    no edges of their own, so a malformed map behaves as the dict walk did:
+    such a node can be landed on but never walked through."""
+    __slots__ = ('nodes', 'ids', 'index', 'offsets', 'targets', 'neighbors',
+                 'adjacent', 'types', 'regions', '_interned', '_hops', '_dests')
+
+    def __init__(self, nodes: dict):
+        self.nodes = nodes
+        ids = list(nodes)
+        index = {nid: i for i, nid in enumerate(ids)}
+        offsets, targets = array('I', [0]), array('I')
+        for nid in list(ids):
+            for nb in nodes[nid].get('neighbors', ()):
+                if nb not in index:
+                    index[nb] = len(ids)
+                    ids.append(nb)
+                targets.append(index[nb])
+            offsets.append(len(targets))
+        offsets.extend([len(targets)] * (len(ids) - len(nodes)))
+        self.ids, self.index = tuple(ids), index
+        self.offsets, self.targets = offsets, targets
+        self.neighbors = tuple(tuple(targets[offsets[i]:offsets[i + 1]])
+                               for i in range(len(ids)))
+        self.adjacent = tuple(frozenset(nbs) for nbs in self.neighbors)
+        self.types = tuple((nodes.get(n) or {}).get('type') for n in ids)
+        self.regions = tuple((nodes.get(n) or {}).get('region') for n in ids)
+        self._interned = {}
+        self._hops = {}
+        self._dests = OrderedDict()
+
+    def __contains__(self, nid) -> bool:
+        return nid in self.nodes
+
+    def intern(self, node_ids) -> frozenset:
+        """The ints of the ids in `node_ids` that are on the board (an id that
+        isn't can never be stepped onto anyway)."""
+        key = node_ids if isinstance(node_ids, frozenset) else frozenset(node_ids)
+        out = self._interned.get(key)
+        if out is None:
+            if len(self._interned) >= 64:
+                self._interned.clear()
+            index = self.index
+            out = self._interned[key] = frozenset(index[n] for n in key if n in index)
+        return out
+
+    def hops(self, closed=frozenset(), blocked=frozenset()) -> 'HopMatrix':
+        """The hop-distance matrix for this closed/blocked overlay. Barrier
+        states change a handful of times a night, so a few overlays are kept
+        (oldest dropped first) rather than one per call."""
+        key = (self.intern(closed), self.intern(blocked))
+        matrix = self._hops.get(key)
+        if matrix is None:
+            if len(self._hops) >= HOP_OVERLAYS:
+                del self._hops[next(iter(self._hops))]
+            matrix = self._hops[key] = HopMatrix(self, *key)
+        return matrix
+
+
+HOP_OVERLAYS = 8        # closed/blocked overlays kept per Board
+UNREACHABLE = 255       # HopMatrix cell: no walk (or one longer than 254 hops)
+
+
+class HopMatrix:
+    """All-pairs hop distances over a Board under one closed/blocked overlay,
+    as a flat uint8 matrix (`cells[src * n + dst]`, UNREACHABLE when there is
+    no walk). Same rules as board_distance: a `closed` node may be reached but
+    never walked through (the source excepted), a `blocked` node is never
+    entered. A row is BFS'd the first time its source is asked about and kept,
+    so range checks and nearest-target scans are lookups from then on — a
+    ~300-node board is ~90KB filled."""
+    __slots__ = ('board', 'closed', 'blocked', 'cells', 'filled')
+
+    def __init__(self, board: Board, closed: frozenset, blocked: frozenset):
+        n = len(board.ids)
+        self.board, self.closed, self.blocked = board, closed, blocked
+        self.cells = bytearray(b'\xff') * (n * n)
+        self.filled = bytearray(n)
+
+    def row(self, src: int) -> memoryview:
+        """Hop distances from interned node `src` to every node."""
+        n = len(self.filled)
+        if not self.filled[src]:
+            self._fill(src, n)
+        return memoryview(self.cells)[src * n:(src + 1) * n]
+
+    def distance(self, start: str, goal: str):
+        """Hops from start to goal, or None when unreachable (or either is
+        not on the board)."""
+        if start == goal:
+            return 0
+        index = self.board.index
+        if start not in index or goal not in index:
+            return None
+        d = self.row(index[start])[index[goal]]
+        return None if d == UNREACHABLE else d
+
+    def from_node(self, start: str) -> dict:
+        """{node id: hops} for every map node reachable from `start`."""
+        board = self.board
+        ids, real = board.ids, len(board.nodes)
+        row = self.row(board.index[start])
+        return {ids[i]: d for i, d in enumerate(row[:real]) if d != UNREACHABLE}
+
+    def _fill(self, src: int, n: int):
+        nbrs, closed, blocked = self.board.neighbors, self.closed, self.blocked
+        row = bytearray(b'\xff') * n
+        row[src] = 0
+        frontier, d = [src], 0
+        while frontier and d < UNREACHABLE - 1:
+            d += 1
+            nxt = []
+            for node in frontier:
+                if node != src and node in closed:
+                    continue  # sealed: never a corridor
+                for nb in nbrs[node]:
+                    if row[nb] == UNREACHABLE and nb not in blocked:
+                        row[nb] = d
+                        nxt.append(nb)
+            frontier = nxt
+        self.cells[src * n:(src + 1) * n] = row
+        self.filled[src] = 1
+
+
+def as_board(nodes) -> Board:
+    """A Board as-is; a plain node dict compiled on the spot (ad-hoc callers —
+    hot paths hold a compiled Board)."""
+    return nodes if isinstance(nodes, Board) else Board(nodes)
+
+
+DIE_FACES = 6           # destinations_by_face walks at least this far
+DEST_CACHE_SIZE = 256   # (start, closed, blocked) entries kept per Board
+
+
+def legal_destinations(nodes, start: str, steps: int,
                        closed: frozenset = frozenset(),
                        blocked: frozenset = frozenset()) -> set:
     """
@@ -609,40 +759,78 @@ def legal_destinations(nodes: dict, start: str, steps: int,
     `blocked` holds nodes you may never step ONTO (e.g. tunnels for evolved
     units) — never a destination, never a corridor. The start node is never
     treated as blocked, so you can always walk off one you already stand on.
+    `nodes` is a Board or a node dict.
+
+    Note: we do NOT discard `start`. The no-backtrack rule already forbids a
+    trivial there-and-back, so any walk that returns to `start` with the roll
+    fully spent is a genuine loop (girth >= 3) — a legal exact-count landing.
+    Circling a loop back onto your own space is allowed.
+
+    Given a Board, answered from its destinations_by_face cache.
     """
-    results = set()
-    stack = [(start, None, steps)]
-    seen = set()
-    while stack:
-        node, prev, remaining = stack.pop()
-        if remaining == 0:
-            results.add(node)
-            continue
-        if node in closed and node != start:
-            # Bonk: you march up to the sealed wall and STOP there, spending
-            # the rest of the roll — so a barrier is always reachable when you
-            # walk toward it, not only on an exact-count landing. Never a
-            # corridor: we still don't expand through it.
-            results.add(node)
-            continue
-        key = (node, prev, remaining)
-        if key in seen:
-            continue
-        seen.add(key)
-        for nb in nodes[node]['neighbors']:
-            if nb == prev:
-                continue
-            if nb in blocked:
+    return set(destinations_by_face(nodes, start, closed, blocked, steps)[steps])
+
+
+def destinations_by_face(nodes, start: str,
+                         closed: frozenset = frozenset(),
+                         blocked: frozenset = frozenset(),
+                         faces: int = DIE_FACES) -> tuple:
+    """legal_destinations for every step count from 0 to at least `faces`, from
+    one traversal: `by_face[steps]` is a frozenset of node ids.
+
+    The answer depends only on the board, start, closed and blocked sets, so a
+    Board keeps the last DEST_CACHE_SIZE of them (least recently used dropped)
+    and walks every die face at once — a reroll, a Pathfinder second die or a
+    bot retrying a shorter step is a cache hit. A plain node dict is compiled
+    and walked for just the faces asked."""
+    if not isinstance(nodes, Board):
+        board = Board(nodes)
+        return _walk_faces(board, board.index[start], board.intern(closed),
+                           board.intern(blocked), faces)
+    board = nodes
+    closed_i, blocked_i = board.intern(closed), board.intern(blocked)
+    s = board.index[start]
+    key = (s, closed_i, blocked_i)
+    cache = board._dests
+    by_face = cache.get(key)
+    if by_face is None or len(by_face) <= faces:
+        by_face = cache[key] = _walk_faces(board, s, closed_i, blocked_i,
+                                           max(faces, DIE_FACES))
+        if len(cache) > DEST_CACHE_SIZE:
+            cache.popitem(last=False)
+    else:
+        cache.move_to_end(key)
+    return by_face
+
+
+def _walk_faces(board, s, closed_i, blocked_i, faces):
+    """Walked a hop at a time over (node, previous node) states, so walks that
+    converge on the same state are only expanded once. A walk that reaches a
+    sealed node (not the start) bonks there: it lands on every later face too."""
+    nbrs, ids = board.neighbors, board.ids
+    by_face = [frozenset((ids[s],))]
+    bonked = set()
+    frontier = {(s, -1)}
+    for _ in range(faces):
+        nxt = set()
+        for node, prev in frontier:
+            if node in closed_i and node != s:
+                # Bonk: you march up to the sealed wall and STOP there, spending
+                # the rest of the roll — so a barrier is always reachable when you
+                # walk toward it, not only on an exact-count landing. Never a
+                # corridor: we still don't expand through it.
+                bonked.add(node)
                 continue
-            stack.append((nb, node, remaining - 1))
-    # Note: we do NOT discard `start`. The no-backtrack rule above already
-    # forbids a trivial there-and-back, so any walk that returns to `start`
-    # with the roll fully spent is a genuine loop (girth >= 3) — a legal
-    # exact-count landing. Circling a loop back onto your own space is allowed.
-    return results
+            for nb in nbrs[node]:
+                if nb != prev and nb not in blocked_i:
+                    nxt.add((nb, node))
+        frontier = nxt
+        landed = bonked.union(node for node, _ in frontier)
+        by_face.append(frozenset(ids[i] for i in landed))
+    return tuple(by_face)
 
 
-def validate_walk(nodes: dict, path, steps,
+def validate_walk(nodes, path, steps,
                   closed: frozenset = frozenset(),
                   blocked: frozenset = frozenset()) -> bool:
     """
@@ -659,7 +847,8 @@ def validate_walk(nodes: dict, path, steps,
     steps = set(steps)
     if not steps or not path or len(path) < 2:
         return False
-    if any(n not in nodes for n in path):
+    board = as_board(nodes)
+    if any(n not in board.nodes for n in path):
         return False
     hops = len(path) - 1
     if path[-1] in closed:
@@ -667,20 +856,11 @@ def validate_walk(nodes: dict, path, steps,
             return False
     elif hops not in steps:
         return False
-    for i in range(1, len(path)):
-        cur, prev = path[i], path[i - 1]
-        if cur not in nodes[prev]['neighbors']:
-            return False                    # not adjacent
-        if i >= 2 and cur == path[i - 2]:
-            return False                    # immediate backtrack
-        if cur in blocked:
-            return False                    # never step onto a blocked node
-        if cur in closed and i != len(path) - 1:
-            return False                    # never a corridor through a seal
-    return True
+    return _valid_steps(board, [board.index[n] for n in path], closed, blocked,
+                        backtrack=False)
 
 
-def validate_free_walk(nodes: dict, path,
+def validate_free_walk(nodes, path,
                        closed: frozenset = frozenset(),
                        blocked: frozenset = frozenset()) -> bool:
     """True if `path` is a legal admin free walk: edge-adjacent steps of any
@@ -692,20 +872,33 @@ def validate_free_walk(nodes: dict, path,
     validate_walk (you can always walk off a node you already stand on)."""
     if not path or len(path) < 2:
         return False
-    if any(n not in nodes for n in path):
+    board = as_board(nodes)
+    if any(n not in board.nodes for n in path):
         return False
+    return _valid_steps(board, [board.index[n] for n in path], closed, blocked,
+                        backtrack=True)
+
+
+def _valid_steps(board, path, closed, blocked, backtrack):
+    """The per-hop checks validate_walk and validate_free_walk share, over
+    interned ids."""
+    adjacent = board.adjacent
+    closed_i, blocked_i = board.intern(closed), board.intern(blocked)
+    last = len(path) - 1
     for i in range(1, len(path)):
         cur, prev = path[i], path[i - 1]
-        if cur not in nodes[prev]['neighbors']:
+        if cur not in adjacent[prev]:
             return False                    # not adjacent
-        if cur in blocked:
+        if not backtrack and i >= 2 and cur == path[i - 2]:
+            return False                    # immediate backtrack
+        if cur in blocked_i:
             return False                    # never step onto a blocked node
-        if cur in closed and i != len(path) - 1:
+        if cur in closed_i and i != last:
             return False                    # never a corridor through a seal
     return True
 
 
-def board_distance(nodes: dict, start: str, goal: str, max_steps: int,
+def board_distance(nodes, start: str, goal: str, max_steps: int,
                    closed: frozenset = frozenset(),
                    blocked: frozenset = frozenset()) -> int | None:
     """
@@ -713,9 +906,13 @@ def board_distance(nodes: dict, start: str, goal: str, max_steps: int,
     unlike movement there is no exact-count or no-backtrack rule. `closed`
     (sealed barriers) blocks passage but may be the goal itself. `blocked`
     holds nodes you may never step onto (never a corridor, never a goal).
+    Given a Board this is a HopMatrix lookup; a plain node dict is searched.
     """
     if start == goal:
         return 0
+    if isinstance(nodes, Board):
+        dist = nodes.hops(closed, blocked).distance(start, goal)
+        return dist if dist is not None and dist <= max_steps else None
     frontier = {start}
     seen = {start}
     for dist in range(1, max_steps + 1):
@@ -792,7 +989,73 @@ def spend_stat(player: dict, stat: str) -> bool:
 
 # ── Effective stats (gear + buffs) ──────────────────────────────────────────
 
+# What each buff kind does to the stat line, applied in buff order (a curse's
+# floor makes order matter). A boon adds `delta * mult` — beneficial self-buffs
+# may carry a `mult` (Squirrel Warrior doubles self-cast buffs). A curse
+# subtracts and floors the stat at 1; curses are never self-cast, so they
+# ignore mult.
+BUFF_BOONS = {
+    'rot_surge':      (('atk', 3),),
+    'acorn_fury':     (('atk', 2),),
+    'glowveil':       (('spd', 2),),
+    'harden_shell':   (('def', 2),),
+    'savage_roar':    (('atk', 5),),
+    'iron_hide':      (('def', 4),),
+    'fleetfoot':      (('spd', 3),),
+    # Sovereign's Draught grants its OWN kinds rather than reusing the tonic
+    # buffs, so drinking it on top of a Whetstone/Wax/Tonic stacks instead of
+    # silently overlapping — the pre-boss ritual is meant to be layered.
+    'sovereign_might': (('atk', data.SOVEREIGN_ATK),),
+    'sovereign_ward':  (('def', data.SOVEREIGN_DEF),),
+    'sovereign_haste': (('spd', data.SOVEREIGN_SPD),),
+    'warding_dance':  (('def', 3), ('spd', 3)),
+    'high_five':      (('atk', 1), ('def', 1), ('spd', 1)),
+}
+BUFF_CURSES = {
+    'cursed_idol':    (('atk', 1),),
+    'bone_chill':     (('atk', 2),),
+    # Marrow Pits signature hazard — grave-cold numbs the whole body.
+    'grave_chill':    (('atk', 3), ('def', 2)),
+    'weaken_hex':     (('atk', 3),),
+    'sap_vigor':      (('spd', 3),),
+    'rust_curse':     (('def', 4),),
+}
+# Variable +N to a chosen stat for one battle — the amount + stat ride on the
+# buff entry itself. Soul Trophy (Deathrite Shaman), Mimicry (Wood Lurker), and
+# Improvise (Vexing Pest) share this shape.
+BUFF_CHOSEN_STAT = frozenset({'trophy', 'mimic', 'improvise'})
+
+STATS_CACHE_SIZE = 512
+_stats_cache = {}   # _stats_key(player) -> effective stat line
+
+
+def _stats_key(player: dict) -> tuple:
+    """Everything effective_stats reads: the base line, equipped gear and the
+    stat-bearing part of each buff (turn counters and the like are left out,
+    so a buff ticking down doesn't miss the cache)."""
+    gear = player.get('gear')
+    buffs = player.get('buffs')
+    return (player.get('atk', 0), player.get('def', 0),
+            player.get('spd', 0), player.get('maxHp', 0),
+            tuple(gear.values()) if gear else (),
+            tuple((b.get('kind'), b.get('mult', 1), b.get('stat'), b.get('amount', 0))
+                  for b in buffs) if buffs else ())
+
+
 def effective_stats(player: dict) -> dict:
+    """The stat line combat and state use: base + gear + buffs, plus the DEF
+    track's Max HP perks. Cached on _stats_key, so the same player polled again
+    (or a doc re-derived mid-request) is a lookup; the caller gets its own copy."""
+    key = _stats_key(player)
+    eff = _stats_cache.get(key)
+    if eff is None:
+        if len(_stats_cache) >= STATS_CACHE_SIZE:
+            _stats_cache.clear()
+        eff = _stats_cache[key] = _compute_stats(player)
+    return dict(eff)
+
+
+def _compute_stats(player: dict) -> dict:
     eff = {'atk': player.get('atk', 0), 'def': player.get('def', 0),
            'spd': player.get('spd', 0), 'maxHp': player.get('maxHp', 0)}
     for gear_id in (player.get('gear') or {}).values():
@@ -804,59 +1067,22 @@ def effective_stats(player: dict) -> dict:
     # Daemogoth "Arsenal" is the 4th equipment slot itself (gated in _equip_gear).
     # The wildcard piece sits in gear['wild'] and is summed once by the loop above,
     # like any other slot — the passive grants the slot, it does not double it.
+    # Base + gear is exactly what perk thresholds count (perk_stat), so read the
+    # perks off this line rather than walking the gear again.
+    perks = _unlocked_perks(lambda stat: eff[stat] if stat in eff else perk_stat(player, stat))
     for buff in (player.get('buffs') or []):
         kind = buff.get('kind')
-        # Beneficial self-buffs may carry a `mult` (Squirrel Warrior doubles
-        # self-cast buffs). Curses are never self-cast, so they ignore mult.
-        mult = buff.get('mult', 1)
-        if kind == 'rot_surge':
-            eff['atk'] += 3 * mult
-        elif kind == 'acorn_fury':
-            eff['atk'] += 2 * mult
-        elif kind == 'cursed_idol':
-            eff['atk'] = max(1, eff['atk'] - 1)
-        elif kind == 'bone_chill':
-            eff['atk'] = max(1, eff['atk'] - 2)
-        elif kind == 'grave_chill':
-            # Marrow Pits signature hazard — grave-cold numbs the whole body.
-            eff['atk'] = max(1, eff['atk'] - 3)
-            eff['def'] = max(1, eff['def'] - 2)
-        elif kind == 'glowveil':
-            eff['spd'] += 2 * mult
-        elif kind == 'harden_shell':
-            eff['def'] += 2 * mult
-        elif kind == 'weaken_hex':
-            eff['atk'] = max(1, eff['atk'] - 3)
-        elif kind == 'savage_roar':
-            eff['atk'] += 5 * mult
-        elif kind == 'iron_hide':
-            eff['def'] += 4 * mult
-        elif kind == 'fleetfoot':
-            eff['spd'] += 3 * mult
-        # Sovereign's Draught grants its OWN kinds rather than reusing the tonic
-        # buffs, so drinking it on top of a Whetstone/Wax/Tonic stacks instead of
-        # silently overlapping — the pre-boss ritual is meant to be layered.
-        elif kind == 'sovereign_might':
-            eff['atk'] += data.SOVEREIGN_ATK * mult
-        elif kind == 'sovereign_ward':
-            eff['def'] += data.SOVEREIGN_DEF * mult
-        elif kind == 'sovereign_haste':
-            eff['spd'] += data.SOVEREIGN_SPD * mult
-        elif kind == 'warding_dance':
-            eff['def'] += 3 * mult
-            eff['spd'] += 3 * mult
-        elif kind == 'sap_vigor':
-            eff['spd'] = max(1, eff['spd'] - 3)
-        elif kind == 'rust_curse':
-            eff['def'] = max(1, eff['def'] - 4)
-        elif kind == 'high_five':
-            eff['atk'] += 1 * mult
-            eff['def'] += 1 * mult
-            eff['spd'] += 1 * mult
-        elif kind in ('trophy', 'mimic', 'improvise'):
-            # Variable +N to a chosen stat for one battle — the amount + stat ride
-            # on the buff entry itself. Soul Trophy (Deathrite Shaman), Mimicry
-            # (Wood Lurker), and Improvise (Vexing Pest) share this shape.
+        boon = BUFF_BOONS.get(kind)
+        if boon:
+            mult = buff.get('mult', 1)
+            for stat, delta in boon:
+                eff[stat] += delta * mult
+            continue
+        curse = BUFF_CURSES.get(kind)
+        if curse:
+            for stat, delta in curse:
+                eff[stat] = max(1, eff[stat] - delta)
+        elif kind in BUFF_CHOSEN_STAT:
             stat = buff.get('stat')
             if stat in ('atk', 'def', 'spd'):
                 eff[stat] += int(buff.get('amount', 0))
@@ -864,7 +1090,6 @@ def effective_stats(player: dict) -> dict:
     # here (not persisted) so it appears in state and combat and vanishes cleanly
     # if a perk ever stops applying — same layer as gear maxHp. Cumulative:
     # DEF 6 -> +5, DEF 12 -> +15, DEF 18 -> +30.
-    perks = attribute_perks(player)
     if 'thick_hide' in perks:
         eff['maxHp'] += data.THICK_HIDE_MAXHP
     if 'carapace_grind' in perks:
@@ -894,9 +1119,13 @@ def attribute_perks(player: dict) -> frozenset:
     """Perks unlocked by base attributes + equipped gear (see perk_stat). Gear
     can now bridge a creature up to a threshold, so equipping/swapping gear may
     light or dim a perk; temporary buffs still never do. Derived, not persisted."""
+    return _unlocked_perks(lambda stat: perk_stat(player, stat))
+
+
+def _unlocked_perks(stat_value) -> frozenset:
     out = set()
     for stat, tiers in data.PERK_TRACKS.items():
-        val = perk_stat(player, stat)
+        val = stat_value(stat)
         for threshold, pid in tiers:
             if val >= threshold:
                 out.add(pid)
@@ -939,23 +1168,30 @@ def _parse_iso(ts: str) -> datetime:
 
 
 def regen_hp(player: dict, now_iso: str) -> None:
-    """Apply 10% max HP per full 10 minutes since hpUpdatedAt, lazily."""
+    """Apply 10% max HP per full 10 minutes since hpUpdatedAt, lazily. Stats are
+    only derived once a full interval has passed."""
     last = player.get('hpUpdatedAt')
     if not last:
         player['hpUpdatedAt'] = now_iso
         return
-    max_hp = effective_stats(player)['maxHp']
-    minutes = (_parse_iso(now_iso) - _parse_iso(last)).total_seconds() / 60
+    last_at = _parse_iso(last)
+    minutes = (_parse_iso(now_iso) - last_at).total_seconds() / 60
     intervals = int(minutes // data.HP_REGEN_INTERVAL_MIN)
     if intervals <= 0:
         return
+    max_hp = effective_stats(player)['maxHp']
     if player['hp'] < max_hp:
         heal = intervals * round(max_hp * data.HP_REGEN_PCT)
         player['hp'] = min(max_hp, player['hp'] + heal)
-    advanced = _parse_iso(last) + timedelta(minutes=intervals * data.HP_REGEN_INTERVAL_MIN)
+    advanced = last_at + timedelta(minutes=intervals * data.HP_REGEN_INTERVAL_MIN)
     player['hpUpdatedAt'] = advanced.strftime(_ISO)
 
 
+def _ceil_div(a, b):
+    """ceil(a / b) for a > 0, b > 0 (ints or integral Decimals alike)."""
+    return (a + b - 1) // b
+
+
 def regen_rolls(player: dict, now_iso: str, bank_rested: bool = True) -> None:
     """Bank ROLLS_PER_REGEN rolls per full ROLL_REGEN_MINUTES since rollRegenAt,
     lazily, capped at ROLL_CAP. Overflow past the cap banks into `rested` (up to
@@ -967,39 +1203,53 @@ def regen_rolls(player: dict, now_iso: str, bank_rested: bool = True) -> None:
 
     bank_rested=False restores the legacy cap-and-discard behaviour — used when
     seeding a first-time joiner's bank from the night start, so latecomers get a
-    full bank but no rested stockpile."""
+    full bank but no rested stockpile.
+
+    Closed form, O(1) however long the player was away. Tick by tick the bank
+    fills in two phases:
+      filling  while rolls < cap, a tick adds `per` plus a bonus of up to `per`
+               drawn from rested, so after t ticks it has gained
+               t*per + min(rested, t*per). The tick that reaches the cap pushes
+               any overshoot back into rested (clamped to RESTED_CAP; discarded
+               in legacy mode).
+      full     at the cap each tick only banks `per` into rested, up to
+               RESTED_CAP (legacy mode: nothing).
+    tests/test_undercity_rested.py checks it against the tick-by-tick loop."""
     last = player.get('rollRegenAt')
     if not last:
         player['rollRegenAt'] = now_iso
         return
-    minutes = (_parse_iso(now_iso) - _parse_iso(last)).total_seconds() / 60
+    last_at = _parse_iso(last)
+    minutes = (_parse_iso(now_iso) - last_at).total_seconds() / 60
     intervals = int(minutes // data.ROLL_REGEN_MINUTES)
     if intervals <= 0:
         return
     rolls = player.get('rolls', 0)
     rested = player.get('rested', 0)
     per, cap, rcap = data.ROLLS_PER_REGEN, data.ROLL_CAP, data.RESTED_CAP
-    for _ in range(intervals):
-        if rolls >= cap:
-            if not bank_rested or rested >= rcap:
-                break            # maxed (or legacy mode) — remaining ticks are no-ops
-            rested = min(rcap, rested + per)
-        else:
-            gain = per
-            if bank_rested and rested > 0:
-                bonus = min(rested, per)   # the "double": up to 2x this tick
-                gain += bonus
-                rested -= bonus
-            new_rolls = rolls + gain
-            if new_rolls > cap:
-                if bank_rested:
-                    rested = min(rcap, rested + (new_rolls - cap))
-                rolls = cap        # legacy mode discards the overshoot
-            else:
-                rolls = new_rolls
+    drawable = rested if bank_rested else 0
+    full_ticks = intervals
+    if rolls < cap:
+        need = cap - rolls
+        # First tick whose cumulative gain min(2t*per, t*per + drawable) reaches
+        # the cap: both terms must.
+        to_cap = _ceil_div(need, 2 * per)
+        if need > drawable:
+            to_cap = max(to_cap, _ceil_div(need - drawable, per))
+        ticks = min(intervals, to_cap)
+        bonus = min(drawable, ticks * per)
+        rested -= bonus
+        rolls += ticks * per + bonus
+        if rolls > cap:
+            if bank_rested:
+                rested = min(rcap, rested + (rolls - cap))
+            rolls = cap        # legacy mode discards the overshoot
+        full_ticks = intervals - ticks
+    if full_ticks > 0 and bank_rested and rested < rcap:
+        rested = min(rcap, rested + full_ticks * per)
     player['rolls'] = rolls
     player['rested'] = rested
-    advanced = _parse_iso(last) + timedelta(minutes=intervals * data.ROLL_REGEN_MINUTES)
+    advanced = last_at + timedelta(minutes=intervals * data.ROLL_REGEN_MINUTES)
     player['rollRegenAt'] = advanced.strftime(_ISO)
 
 
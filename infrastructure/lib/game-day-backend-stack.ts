@@ -49,6 +49,22 @@ export class GameDayBackendStack extends cdk.Stack {
       // No need to specify billing mode - inherits from table (PAY_PER_REQUEST = free tier friendly)
     });
 
+    // GSI for the bulk /all-comments, /all-ratings, /all-likes reads: one
+    // partition per row type, newest first, instead of scanning the whole table
+    // (every Undercity night lives in it too). Sparse — only rows carrying both
+    // `type` and `timestamp` are projected.
+    gameDayTable.addGlobalSecondaryIndex({
+      indexName: 'type-index',
+      partitionKey: {
+        name: 'type',
+        type: dynamodb.AttributeType.STRING,
+      },
+      sortKey: {
+        name: 'timestamp',
+        type: dynamodb.AttributeType.STRING,
+      },
+    });
+
     // 🚀 LAMBDA FUNCTION - Single function handles everything (PYTHON)
     const gameDayApi = new lambda.Function(this, 'GameDayApi', {
       functionName: 'game-day-api',
@@ -63,7 +79,11 @@ export class GameDayBackendStack extends cdk.Stack {
           image: lambda.Runtime.PYTHON_3_11.bundlingImage,
           command: [
             'bash', '-c',
-            'pip install -r requirements.txt -t /asset-output && cp -r . /asset-output',
+            'pip install -r requirements.txt -t /asset-output && cp -r . /asset-output'
+            // /var/task is read-only, so without shipped bytecode every cold
+            // start recompiles the Undercity modules from source. checked-hash
+            // pycs stay valid whatever mtimes the copy leaves behind.
+            + ' && python -m compileall -q --invalidation-mode checked-hash /asset-output',
           ],
         },
       }),
@@ -77,6 +97,10 @@ export class GameDayBackendStack extends cdk.Stack {
       environment: {
         TABLE_NAME: gameDayTable.tableName,
         USER_INDEX_NAME: 'user-index',
+        TYPE_INDEX_NAME: 'type-index',
+        // Structured request logs (see request_log.py). LOG_LEVEL=debug adds the
+        // redacted event; LOG_SAMPLE=route=rate,... overrides the poll sampling.
+        LOG_LEVEL: process.env.LOG_LEVEL ?? 'info',
         // Generated once via infrastructure/lambda/scripts/generate_vapid_keys.py;
         // set VAPID_PRIVATE_KEY in your shell before `cdk deploy` — never commit it.
         VAPID_PRIVATE_KEY: process.env.VAPID_PRIVATE_KEY ?? '',
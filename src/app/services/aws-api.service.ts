@@ -29,7 +29,7 @@ export interface Like {
 export interface RatingsResponse {
   averageRating: number | null;
   totalRatings: number;
-  ratings: Rating[];
+  ratings?: Rating[];   // only with ?details=true
 }
 
 export interface CommentsResponse {
@@ -51,7 +51,7 @@ export interface AllRatingsResponse {
 export interface LikesResponse {
   totalLikes: number;
   isLikedByCurrentUser: boolean;
-  likes: Like[];
+  likes?: Like[];       // only with ?details=true
 }
 
 export interface AllLikesResponse {
@@ -60,6 +60,23 @@ export interface AllLikesResponse {
   lastUpdated: string;
 }
 
+export interface CatalogGame {
+  gameId: string;
+  averageRating: number | null;
+  totalRatings: number;
+  ratingHistogram: Record<string, number>;
+  totalLikes: number;
+  isLikedByCurrentUser: boolean;
+  totalComments: number;
+  comments: Comment[]; // the newest few, not every comment
+}
+
+export interface CatalogSummaryResponse {
+  games: CatalogGame[];
+  totalGames: number;
+  lastUpdated: string;
+}
+
 @Injectable({
   providedIn: 'root'
 })
@@ -298,6 +315,39 @@ export class AwsApiService {
   }
 
   // 📊 BULK DATA OPERATIONS
+  async getCatalogSummary(): Promise<CatalogSummaryResponse> {
+    this.log('🔍 Fetching catalog summary...');
+
+    try {
+      const userId = this.userService.userId() ?? '';
+      const response = await fetch(`${this.API_BASE_URL}/catalog-summary?userId=${encodeURIComponent(userId)}`, {
+        method: 'GET',
+        mode: 'cors',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+      });
+
+      this.log(`📡 Catalog summary response status: ${response.status} ${response.statusText}`);
+
+      if (!response.ok) {
+        const errorText = await response.text();
+        console.error(`❌ Catalog summary error:`, errorText);
+        throw new Error(`Failed to get catalog summary: ${response.status} ${response.statusText} - ${errorText}`);
+      }
+
+      const data = await response.json();
+      console.log(`✅ Loaded the catalog summary for ${data.totalGames} games`);
+      return data;
+    } catch (error) {
+      console.error(`💥 Fetch error for catalog summary:`, error);
+      if (error instanceof TypeError && error.message.includes('fetch')) {
+        throw new Error(`Network error: Cannot reach AWS API. Check your internet connection and API URL.`);
+      }
+      throw error;
+    }
+  }
+
   async getAllComments(): Promise<AllCommentsResponse> {
     this.log('🔍 Fetching all comments from database...');
     
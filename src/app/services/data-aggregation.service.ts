@@ -1,7 +1,7 @@
 import { Injectable } from '@angular/core';
 import { BehaviorSubject, Observable, combineLatest } from 'rxjs';
 import { map } from 'rxjs/operators';
-import { AwsApiService, Comment, Rating, Like } from './aws-api.service';
+import { AwsApiService, CatalogGame, Comment, Rating, Like } from './aws-api.service';
 
 export interface GameStats {
   gameId: string;
@@ -44,10 +44,33 @@ export class DataAggregationService {
   private allRatingsSubject = new BehaviorSubject<Rating[]>([]);
   private allLikesSubject = new BehaviorSubject<Like[]>([]);
   private isLoadedSubject = new BehaviorSubject<boolean>(false);
+  private catalogSubject = new BehaviorSubject<CatalogGame[]>([]);
+  private allDataLoad: Promise<void> | null = null;
 
   constructor(private awsApi: AwsApiService) {}
 
-  // Load all data from AWS on startup
+  // Load the games page's per-game stats from AWS on startup (one call)
+  async loadCatalog(): Promise<void> {
+    const summary = await this.awsApi.getCatalogSummary();
+    this.catalogSubject.next(summary.games);
+  }
+
+  // Reload the summary after a write, so counts and averages come from the server
+  private reloadCatalog(): void {
+    this.loadCatalog().catch(error => console.error('❌ Failed to reload catalog summary:', error));
+  }
+
+  // Every comment, rating and like, loaded once on first use by the views that
+  // need the rows themselves (game details, statistics) rather than the summary
+  private ensureAllData(): void {
+    if (!this.allDataLoad) {
+      this.allDataLoad = this.loadAllData().catch(() => {
+        this.allDataLoad = null; // Reset on error so it can retry
+      });
+    }
+  }
+
+  // Load all data from AWS
   async loadAllData(): Promise<void> {
     console.log('🚀 Loading all data from AWS...');
     
@@ -91,6 +114,7 @@ export class DataAggregationService {
 
   // Get stats for a specific game
   getGameStats(gameId: string): Observable<GameStats> {
+    this.ensureAllData();
     return combineLatest([this.allComments$, this.allRatings$, this.allLikes$]).pipe(
       map(([comments, ratings, likes]) => {
         const gameComments = comments.filter(c => c.gameId === gameId);
@@ -120,48 +144,27 @@ export class DataAggregationService {
     );
   }
 
-  // Get all games stats
+  // Get all games stats, off the catalog summary. It carries counts and the
+  // newest few comments per game; ratings and likes stay empty here.
   getAllGamesStats(): Observable<GameStats[]> {
-    return combineLatest([this.allComments$, this.allRatings$, this.allLikes$]).pipe(
-      map(([comments, ratings, likes]) => {
-        // Get unique game IDs
-        const gameIds = new Set([
-          ...comments.map(c => c.gameId),
-          ...ratings.map(r => r.gameId),
-          ...likes.map(l => l.gameId)
-        ]);
-
-        const currentUserId = this.getCurrentUserId();
-
-        return Array.from(gameIds).map(gameId => {
-          const gameComments = comments.filter(c => c.gameId === gameId);
-          const gameRatings = ratings.filter(r => r.gameId === gameId);
-          const gameLikes = likes.filter(l => l.gameId === gameId);
-          
-          const averageRating = gameRatings.length > 0
-            ? gameRatings.reduce((sum, r) => sum + r.rating, 0) / gameRatings.length
-            : null;
-
-          const isLikedByCurrentUser = gameLikes.some(like => like.userId === currentUserId);
-
-          return {
-            gameId,
-            totalComments: gameComments.length,
-            averageRating: averageRating ? Math.round(averageRating * 10) / 10 : null,
-            totalRatings: gameRatings.length,
-            totalLikes: gameLikes.length,
-            isLikedByCurrentUser,
-            comments: gameComments,
-            ratings: gameRatings,
-            likes: gameLikes
-          };
-        });
-      })
+    return this.catalogSubject.asObservable().pipe(
+      map(games => games.map(game => ({
+        gameId: game.gameId,
+        totalComments: game.totalComments,
+        averageRating: game.averageRating,
+        totalRatings: game.totalRatings,
+        totalLikes: game.totalLikes,
+        isLikedByCurrentUser: game.isLikedByCurrentUser,
+        comments: game.comments,
+        ratings: [],
+        likes: []
+      })))
     );
   }
 
   // Get user statistics
   getUserStats(): Observable<UserStats[]> {
+    this.ensureAllData();
     return combineLatest([this.allComments$, this.allRatings$]).pipe(
       map(([comments, ratings]) => {
         // Get unique user IDs
@@ -240,6 +243,7 @@ export class DataAggregationService {
   addComment(comment: Comment): void {
     const currentComments = this.allCommentsSubject.value;
     this.allCommentsSubject.next([comment, ...currentComments]);
+    this.reloadCatalog();
   }
 
   // Add new rating (update local cache)
@@ -250,12 +254,14 @@ export class DataAggregationService {
       r => !(r.userId === rating.userId && r.gameId === rating.gameId)
     );
     this.allRatingsSubject.next([rating, ...filteredRatings]);
+    this.reloadCatalog();
   }
 
   // Add new like (update local cache)
   addLike(like: Like): void {
     const currentLikes = this.allLikesSubject.value;
     this.allLikesSubject.next([like, ...currentLikes]);
+    this.reloadCatalog();
   }
 
   // Remove like (update local cache)
@@ -265,6 +271,7 @@ export class DataAggregationService {
       l => !(l.gameId === gameId && l.userId === userId)
     );
     this.allLikesSubject.next(filteredLikes);
+    this.reloadCatalog();
   }
 
   // Get current user ID (utility method)
@@ -277,6 +284,9 @@ export class DataAggregationService {
 
   // Refresh data from AWS
   async refreshData(): Promise<void> {
-    await this.loadAllData();
+    await this.loadCatalog();
+    if (this.allDataLoad) {
+      await this.loadAllData();
+    }
   }
 }
\ No newline at end of file
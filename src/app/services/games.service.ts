@@ -68,8 +68,8 @@ export class GamesService {
     
     try {
       this.awsDataLoaded = true;
-      console.log('🚀 Loading all AWS data on app startup...');
-      await this.dataAggregation.loadAllData();
+      console.log('🚀 Loading the catalog summary on app startup...');
+      await this.dataAggregation.loadCatalog();
       console.log('✅ AWS data loaded successfully');
     } catch (error) {
       console.error('❌ Failed to load AWS data on startup:', error);
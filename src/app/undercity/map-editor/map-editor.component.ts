@@ -57,6 +57,8 @@ const MODE_HINTS: Record<Mode, string> = {
 
 const SNAP = 25;
 const DRAFT_KEY = 'undercity-map-editor-draft';
+/** Generator previews fetched per batch call (server caps it at 12). */
+const SAMPLE_BATCH = 6;
 // Sticky Add-tool defaults — the last space type + region the editor used, so
 // new spaces inherit them instead of always loot / the layer's dominant guess.
 const ADD_TYPE_KEY = 'undercity-map-editor-add-type';
@@ -138,6 +140,11 @@ export class MapEditorComponent implements AfterViewInit, OnDestroy {
   private readonly api = inject(UndercityApiService);
   private savedDoc: BoardMap | null = null;
   private previewCounter = 0;
+  /** Surface of the first previewed board; later previews reuse it. */
+  private sampleSurface: BoardMap | null = null;
+  /** Prefetched previews (one batch call), consumed a click at a time. */
+  private sampleQueue: { seed: string; depths: BoardNode[] }[] = [];
+  private samplePrefetch: Promise<void> | null = null;
   protected readonly showIds = signal(false);
   protected readonly snap = signal(false);
   protected readonly autoLink = signal(true);
@@ -1446,11 +1453,13 @@ export class MapEditorComponent implements AfterViewInit, OnDestroy {
     await this.loadSample();
   }
 
-  /** Fetch a fresh generated sample and show its first pocket read-only. */
+  /** Fetch a fresh generated sample and show its first pocket read-only. The
+   *  first one is a whole board; after that the next few seeds' pockets are
+   *  prefetched in one batch call and laid over that board's surface, so
+   *  browsing is a local swap rather than a round trip per click. */
   protected async loadSample(): Promise<void> {
-    const seed = `preview-${++this.previewCounter}`;
     try {
-      const board = await this.api.getMap(seed);
+      const { seed, board } = await this.nextSample();
       board.regions ??= {};
       board.decals ??= [];
       board.labels ??= [];
@@ -1469,6 +1478,34 @@ export class MapEditorComponent implements AfterViewInit, OnDestroy {
     }
   }
 
+  private async nextSample(): Promise<{ seed: string; board: BoardMap }> {
+    if (!this.sampleSurface) {
+      const seed = `preview-${++this.previewCounter}`;
+      const board = await this.api.getMap(seed);
+      this.sampleSurface = { ...board, nodes: board.nodes.filter((n) => n.region !== 'depths') };
+      void this.prefetchSamples();
+      return { seed, board };
+    }
+    if (!this.sampleQueue.length) await this.prefetchSamples();
+    const next = this.sampleQueue.shift();
+    if (!next) throw new Error('No samples came back');
+    if (this.sampleQueue.length < 2) void this.prefetchSamples();
+    const surface = this.sampleSurface;
+    return { seed: next.seed, board: { ...surface, nodes: [...surface.nodes, ...next.depths] } };
+  }
+
+  private prefetchSamples(): Promise<void> {
+    if (!this.samplePrefetch) {
+      const seeds = Array.from({ length: SAMPLE_BATCH }, () => `preview-${++this.previewCounter}`);
+      this.samplePrefetch = this.api
+        .getMapSamples(seeds)
+        .then((samples) => void this.sampleQueue.push(...samples))
+        .catch(() => undefined)
+        .finally(() => (this.samplePrefetch = null));
+    }
+    return this.samplePrefetch;
+  }
+
   protected async save(): Promise<void> {
     if (this.repoRoot) await this.saveToRepo();
     else this.download();
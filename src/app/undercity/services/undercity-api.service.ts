@@ -1,7 +1,7 @@
 import { Injectable, inject } from '@angular/core';
 import { UserService } from '../../services/user.service';
 import { ActionResponse, GameState } from './undercity-models';
-import type { BoardMap } from '../engine/board-canvas';
+import type { BoardMap, BoardNode } from '../engine/board-canvas';
 
 /** Raised for non-2xx action responses so callers can show the server's text.
  *  A stalled request that we abort surfaces as status 0. */
@@ -84,6 +84,24 @@ export class UndercityApiService {
     });
   }
 
+  /** Batch generator preview: each seed's depths pockets only (no surface —
+   *  pair them with the surface of one `getMap(sample)` board). */
+  async getMapSamples(seeds: string[]): Promise<{ seed: string; depths: BoardNode[] }[]> {
+    const qs = `?samples=${seeds.map(encodeURIComponent).join(',')}`;
+    return this.withTimeout(async (signal) => {
+      const response = await fetch(`${this.API_BASE_URL}/game/map${qs}`, {
+        method: 'GET',
+        mode: 'cors',
+        headers: { 'Content-Type': 'application/json' },
+        signal,
+      });
+      if (!response.ok) {
+        throw new UndercityApiError(`Failed to load map samples (${response.status})`, response.status);
+      }
+      return (await response.json()).samples;
+    });
+  }
+
   async action(type: string, payload: Record<string, unknown> = {}): Promise<ActionResponse> {
     return this.withTimeout(async (signal) => {
       const response = await fetch(`${this.API_BASE_URL}/game/action`, {
@@ -108,4 +126,12 @@ export class UndercityApiService {
       return body;
     });
   }
+
+  /** Several actions in one call, applied in order to one load of your
+   *  creature and saved once. The server stops at the first failing step, at
+   *  a choice the next step doesn't answer, or after a step that wrote shared
+   *  rows; see `steps` / `stopped`. */
+  async batch(actions: { type: string; payload?: Record<string, unknown> }[]): Promise<ActionResponse> {
+    return this.action('batch', { actions });
+  }
 }
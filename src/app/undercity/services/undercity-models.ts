@@ -897,6 +897,11 @@ export interface Occupant {
   stance: string;
 }
 
+export type BatchStep = Omit<ActionResponse, 'you' | 'steps' | 'stopped'> & {
+  type: string;
+  status: number;
+};
+
 export interface ActionResponse {
   ok?: boolean;
   error?: string;
@@ -955,6 +960,13 @@ export interface ActionResponse {
   gamble?: { die: number; won: boolean; rollsLeft?: number };
   result?: SeasonResult;
   seasonId?: string;
+  /** A `batch` action: each step's result (its body minus `you`), in order. */
+  steps?: BatchStep[];
+  /** Why a batch ended early: a step failed, a step left a choice open that
+   *  the next step didn't answer, or a step wrote shared rows (an event, a
+   *  listing, world damage) and your creature was saved right behind it.
+   *  null when every step ran. */
+  stopped?: 'error' | 'decision' | 'shared' | null;
 }
 
 export function isShielded(p: { shieldUntil?: string | null }): boolean {